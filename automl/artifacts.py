@@ -0,0 +1,260 @@
+"""Model artifacts written by ``Schuduler.save_tuned_models``.
+
+An artifact is a directory holding the pickled object graph of the fitted
+pipeline, a ``.npy`` file per large numeric array of that graph (tree node
+tables, regression coefficients, the training data kept by the forecasters)
+and a ``manifest.json`` listing them. Loading unpickles the small graph and
+memory-maps the arrays copy-on-write, so they are read lazily from the page
+cache and shared by every process serving the same artifact.
+
+``{exp_id}_{model}`` is a symlink to the directory of the current version,
+saved next to it as ``.{exp_id}_{model}.<token>``. A save writes a new
+version and swaps the symlink atomically; the previous version stays on disk
+until the next save so loads already under way can read it to the end, a
+load whose version was removed meanwhile starts over on the current one.
+
+Artifacts saved as plain joblib pickles (``{exp_id}_{model}.pkl``) still load.
+"""
+
+import json
+import logging
+import os
+import pickle
+import shutil
+import sys
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+import joblib
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FORMAT_NAME = "automl-artifact"
+FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+GRAPH_FILE = "graph.pkl"
+ARRAY_DIR = "arrays"
+LEGACY_SUFFIX = ".pkl"
+MIN_ARRAY_BYTES = 4096
+
+
+class ArrayPickler(pickle.Pickler):
+    """Pickler writing every plain ndarray of at least ``min_bytes`` to its
+    own ``.npy`` file, the pickle keeping a reference by index."""
+
+    def __init__(self, file, directory: str, min_bytes: int = MIN_ARRAY_BYTES):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.directory = directory
+        self.min_bytes = min_bytes
+        self.arrays = []
+        self._saved = {}
+
+    def persistent_id(self, obj) -> Optional[Tuple[str, int]]:
+        if type(obj) not in (np.ndarray, np.memmap) or obj.dtype.hasobject:
+            return None
+        if obj.nbytes < self.min_bytes:
+            return None
+        index = self._saved.get(id(obj))
+        if index is None:
+            index = len(self.arrays)
+            file_name = os.path.join(ARRAY_DIR, f"{index}.npy")
+            np.save(os.path.join(self.directory, file_name), np.asarray(obj))
+            # the array is kept referenced so its id is not reused
+            self._saved[id(obj)] = index
+            self.arrays.append((obj, file_name))
+        return ("ndarray", index)
+
+    def get_array_entries(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "file": file_name,
+                "shape": list(array.shape),
+                "dtype": str(array.dtype),
+                "nbytes": int(array.nbytes),
+            }
+            for array, file_name in self.arrays
+        ]
+
+
+class ArrayUnpickler(pickle.Unpickler):
+    def __init__(self, file, directory: str, files: List[str], mmap_mode: str):
+        super().__init__(file)
+        self.directory = directory
+        self.files = files
+        self.mmap_mode = mmap_mode
+
+    def persistent_load(self, pid: Tuple[str, int]) -> np.ndarray:
+        kind, index = pid
+        if kind != "ndarray":
+            raise pickle.UnpicklingError(f"Unknown persistent id {pid}")
+        path = os.path.join(self.directory, self.files[index])
+        return np.load(path, mmap_mode=self.mmap_mode)
+
+
+def get_model_path(model_dir: str, exp_id: str, model_name: str) -> str:
+    return os.path.join(model_dir, f"{exp_id}_{model_name}")
+
+
+def find_model_path(model_dir: str, exp_id: str, model_name: str) -> Optional[str]:
+    """Path of the saved artifact, or of a legacy joblib pickle."""
+    path = get_model_path(model_dir, exp_id, model_name)
+    if is_artifact(path):
+        return path
+    if os.path.isfile(path + LEGACY_SUFFIX):
+        return path + LEGACY_SUFFIX
+    return None
+
+
+def is_artifact(path: str) -> bool:
+    return os.path.isfile(os.path.join(path, MANIFEST_FILE))
+
+
+def get_artifact_version(path: str) -> Optional[Tuple[int, int]]:
+    """Inode and modification time of the manifest, or of a legacy pickle,
+    changed by every save of the artifact. ``None`` if nothing is saved."""
+    if os.path.isdir(path):
+        path = os.path.join(path, MANIFEST_FILE)
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns
+
+
+def get_versions() -> Dict[str, str]:
+    versions = {"python": sys.version.split()[0]}
+    for package in ("numpy", "pandas", "sklearn", "sktime"):
+        module = sys.modules.get(package)
+        if module is not None:
+            versions[package] = getattr(module, "__version__", "")
+    return versions
+
+
+def save_model(
+    model: Any,
+    path: str,
+    metadata: Optional[Dict[str, Any]] = None,
+    min_array_bytes: int = MIN_ARRAY_BYTES,
+):
+    """Writes ``model`` as a new version of the artifact at ``path``, kept in
+    the manifest with ``metadata``. ``path`` is swapped to the new version in
+    one rename once it is complete, so it always names a complete artifact,
+    the previous one until the swap. Saves of the same ``path`` must not run
+    concurrently."""
+    directory, name = os.path.split(os.path.abspath(path))
+    version = f".{name}.{uuid.uuid4().hex}"
+    version_path = os.path.join(directory, version)
+    os.makedirs(os.path.join(version_path, ARRAY_DIR))
+    try:
+        with open(os.path.join(version_path, GRAPH_FILE), "wb") as graph:
+            pickler = ArrayPickler(graph, version_path, min_array_bytes)
+            pickler.dump(model)
+        manifest = {
+            "format": FORMAT_NAME,
+            "version": FORMAT_VERSION,
+            "type": f"{type(model).__module__}.{type(model).__qualname__}",
+            "graph": GRAPH_FILE,
+            "arrays": pickler.get_array_entries(),
+            "versions": get_versions(),
+            "metadata": metadata or {},
+        }
+        with open(os.path.join(version_path, MANIFEST_FILE), "w") as manifest_file:
+            json.dump(manifest, manifest_file, indent=1)
+        previous = swap_version(directory, name, version)
+    except BaseException:
+        shutil.rmtree(version_path, ignore_errors=True)
+        raise
+    remove_versions(directory, name, keep=[version, previous])
+    n_bytes = sum(entry["nbytes"] for entry in manifest["arrays"])
+    logger.info(f"Saved {path}: {len(manifest['arrays'])} arrays, {n_bytes} bytes")
+
+
+def swap_version(directory: str, name: str, version: str) -> Optional[str]:
+    """Points the ``name`` symlink at ``version``, returns the version it
+    pointed at before. An artifact directory saved before versioning is moved
+    aside first."""
+    path = os.path.join(directory, name)
+    previous = None
+    if os.path.islink(path):
+        previous = os.readlink(path)
+    elif os.path.isdir(path):
+        previous = f".{name}.{uuid.uuid4().hex}"
+        os.replace(path, os.path.join(directory, previous))
+    link_path = os.path.join(directory, f".{name}.link{os.getpid()}")
+    if os.path.lexists(link_path):
+        os.remove(link_path)
+    os.symlink(version, link_path)
+    os.replace(link_path, path)
+    return previous
+
+
+def remove_versions(directory: str, name: str, keep: List[Optional[str]]):
+    prefix = f".{name}."
+    for file_name in os.listdir(directory):
+        if not file_name.startswith(prefix) or file_name in keep:
+            continue
+        path = os.path.join(directory, file_name)
+        if os.path.isdir(path) and not os.path.islink(path):
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            os.remove(path)
+
+
+def read_manifest(path: str) -> Dict[str, Any]:
+    with open(os.path.join(path, MANIFEST_FILE), "r") as manifest_file:
+        manifest = json.load(manifest_file)
+    signature = (manifest.get("format"), manifest.get("version"))
+    if signature != (FORMAT_NAME, FORMAT_VERSION):
+        raise ValueError(f"{path} is not a version {FORMAT_VERSION} model artifact")
+    return manifest
+
+
+def read_metadata(path: str) -> Dict[str, Any]:
+    """Metadata saved with an artifact, empty for legacy pickles."""
+    if not is_artifact(path):
+        return {}
+    return read_manifest(path).get("metadata", {})
+
+
+def load_model(path: str, mmap_mode: Optional[str] = "c") -> Any:
+    """Loads an artifact directory, arrays memory-mapped with ``mmap_mode``
+    ("c" copy-on-write, "r" read-only, ``None`` read into memory), or a legacy
+    joblib pickle. A version removed by later saves while it is read is
+    read again from the current one."""
+    if not is_artifact(path):
+        return joblib.load(path)
+    while True:
+        version_path = os.path.realpath(path)
+        try:
+            return load_version(version_path, mmap_mode)
+        except FileNotFoundError:
+            if os.path.realpath(path) == version_path:
+                raise
+
+
+def load_version(path: str, mmap_mode: Optional[str]) -> Any:
+    manifest = read_manifest(path)
+    files = [entry["file"] for entry in manifest["arrays"]]
+    with open(os.path.join(path, manifest["graph"]), "rb") as graph:
+        return ArrayUnpickler(graph, path, files, mmap_mode).load()
+
+
+def list_models(model_dir: str) -> List[Tuple[str, str]]:
+    """``(exp_id, model_name)`` of the artifacts saved in ``model_dir``."""
+    if not os.path.isdir(model_dir):
+        return []
+    models = set()
+    for file_name in os.listdir(model_dir):
+        if file_name.startswith("."):
+            continue
+        stem, suffix = os.path.splitext(file_name)
+        path = os.path.join(model_dir, file_name)
+        if is_artifact(path):
+            stem = file_name
+        elif suffix != LEGACY_SUFFIX or not os.path.isfile(path):
+            continue
+        if "_" in stem:
+            exp_id, model_name = stem.rsplit("_", 1)
+            models.add((exp_id, model_name))
+    return sorted(models)
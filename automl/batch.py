@@ -0,0 +1,202 @@
+import logging
+import os
+import time
+import traceback
+from concurrent.futures import as_completed
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, Union
+
+import pandas as pd
+
+from automl.lifecycle.trial_db import TrialDB, get_trial_db_path
+from automl.limits import KillableExecutor
+from automl.resources import ResourceManager, set_cpu_limit
+from automl.schuduler import Schuduler
+from automl.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+SeriesPair = Tuple[pd.Series, Optional[pd.DataFrame]]
+
+
+def iter_panel(
+    y: Union[pd.Series, Dict[Any, SeriesPair]], x: Optional[pd.DataFrame] = None
+) -> Iterator[Tuple[Any, pd.Series, Optional[pd.DataFrame]]]:
+    """Yields ``(series_id, y, x)`` of a ``{series_id: (y, x)}`` mapping or of
+    a panel indexed by ``(series_id, time)``."""
+    if isinstance(y, dict):
+        for series_id, (y_series, x_series) in y.items():
+            yield series_id, y_series, x_series
+        return
+    x_groups = {} if x is None else dict(list(x.groupby(level=0, sort=False)))
+    for series_id, y_series in y.groupby(level=0, sort=False):
+        x_series = x_groups.get(series_id)
+        if x_series is not None:
+            x_series = x_series.droplevel(0)
+        yield series_id, y_series.droplevel(0), x_series
+
+
+def run_series(
+    settings: Dict[str, Any],
+    exp_id: str,
+    y: pd.Series,
+    x: Optional[pd.DataFrame],
+    fh: int,
+    frequency: str,
+    cpu_limit: Optional[int] = None,
+    trial_db_path: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Full ``Schuduler`` lifecycle of one series; failures are reported in the
+    returned record instead of raised so one bad series never stops a batch.
+    Trials go to the series' own database next to ``trial_db_path``."""
+    start = time.perf_counter()
+    set_cpu_limit(cpu_limit)
+    record = {"exp_id": exp_id, "status": "done", "best_model": None, "score": None}
+    try:
+        app = (
+            Schuduler(settings)
+            .set_trial_db(get_series_trial_db(trial_db_path, exp_id))
+            .set_exp_id(exp_id)
+            .set_y(y)
+            .set_x(x)
+            .set_fh(fh)
+            .set_frequency(frequency)
+            .extract_statistics()
+            .compare_models()
+            .tune_hyperparameters()
+            .save_tuned_models()
+        )
+        best_model, _, score = app.get_tuned_models()[0]
+        record.update(best_model=best_model, score=score)
+    except Exception as exc:
+        logger.error(f"Series {exp_id} failed: {exc!r}")
+        record.update(status="failed", error=traceback.format_exc())
+    record["elapsed"] = time.perf_counter() - start
+    return record
+
+
+class BatchRunner:
+    """Runs the ``Schuduler`` lifecycle over many series in parallel processes.
+
+    Each series is an independent experiment ``{exp_id}_{series_id}`` whose
+    tuned models are saved under ``Settings.model_dir`` as the usual artifact
+    directories ``{exp_id}_{series_id}_{model}/`` (``graph.pkl``, ``arrays/``
+    and ``manifest.json``, see ``automl.artifacts``). At most ``max_workers``
+    series run at once; the CPU budget is split between them, every series
+    process being limited to ``available_cpus() // max_workers`` CPUs for its
+    model grid and estimator threads.
+
+    Every series runs in its own forked process, so a series killed by the
+    OOM killer or crashing in a native extension fails alone and the others
+    still run. Each series process records its trials in its own database
+    under ``model_dir/.trials/``, created when the series starts and warm
+    starting from the shared ``model_dir/trials.sqlite`` too; the parent
+    merges it into the shared database once the series is done, the only
+    writer of that file.
+    """
+
+    def __init__(self, settings: Dict[str, Any], max_workers: Optional[int] = None):
+        self.settings = settings
+        self.resources = ResourceManager()
+        self.max_workers = max_workers or self.resources.n_cpus
+        self._exp_id = "batch"
+        self._fh, self._frequency = None, None
+        self._callback = None
+
+    def set_exp_id(self, exp_id: str):
+        self._exp_id = exp_id
+        return self
+
+    def set_fh(self, fh: int):
+        self._fh = fh
+        return self
+
+    def set_frequency(self, frequency: str):
+        self._frequency = frequency
+        return self
+
+    def set_progress_callback(self, callback: Callable[[Dict[str, Any]], None]):
+        self._callback = callback
+        return self
+
+    def get_series_cpus(self) -> int:
+        return self.resources.split(self.max_workers)
+
+    def get_series_settings(self) -> Dict[str, Any]:
+        return {**self.settings, "n_jobs": self.get_series_cpus()}
+
+    def get_trial_db(self) -> Optional[TrialDB]:
+        settings = Settings(**self.settings)
+        if not settings.trial_db:
+            return None
+        return TrialDB(get_trial_db_path(settings.model_dir))
+
+    def merge_trials(self, trial_db: Optional[TrialDB], exp_id: str):
+        if trial_db is None:
+            return
+        path = get_series_trial_db_path(trial_db.path, exp_id)
+        n_trials = trial_db.merge(path)
+        remove_db(path)
+        logger.info(f"Merged {n_trials} trials of {path}")
+
+    def run(
+        self,
+        y: Union[pd.Series, Dict[Any, SeriesPair]],
+        x: Optional[pd.DataFrame] = None,
+    ) -> pd.DataFrame:
+        settings = self.get_series_settings()
+        series_cpus = self.get_series_cpus()
+        trial_db = self.get_trial_db()
+        trial_db_path = None if trial_db is None else trial_db.path
+        records = []
+        with KillableExecutor(max_workers=self.max_workers) as executor:
+            futures = {}
+            for series_id, y_series, x_series in iter_panel(y, x):
+                exp_id = f"{self._exp_id}_{series_id}"
+                future = executor.submit(
+                    run_series,
+                    settings,
+                    exp_id,
+                    y_series,
+                    x_series,
+                    self._fh,
+                    self._frequency,
+                    series_cpus,
+                    trial_db_path,
+                )
+                futures[future] = (series_id, exp_id)
+            for future in as_completed(futures):
+                series_id, exp_id = futures[future]
+                try:
+                    record = future.result()
+                except Exception as exc:
+                    record = {"exp_id": exp_id, "status": "failed", "error": repr(exc)}
+                self.merge_trials(trial_db, exp_id)
+                record = {"series_id": series_id, **record}
+                records.append(record)
+                logger.info(
+                    f"[{len(records)}/{len(futures)}] series {series_id} "
+                    f"{record['status']}"
+                )
+                if self._callback is not None:
+                    self._callback(record)
+        return pd.DataFrame.from_records(records)
+
+
+def get_series_trial_db_path(trial_db_path: str, exp_id: str) -> str:
+    directory = os.path.join(os.path.dirname(trial_db_path), ".trials")
+    return os.path.join(directory, f"{exp_id}.sqlite")
+
+
+def get_series_trial_db(trial_db_path: Optional[str], exp_id: str) -> Optional[TrialDB]:
+    """Fresh trial database of one series, reading the shared one too."""
+    if trial_db_path is None:
+        return None
+    path = get_series_trial_db_path(trial_db_path, exp_id)
+    remove_db(path)
+    return TrialDB(path, read_paths=[trial_db_path])
+
+
+def remove_db(path: str):
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
@@ -0,0 +1,124 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from typing import Any, Optional
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from automl.settings import SchudulerState
+
+logger = logging.getLogger(__name__)
+
+
+def fingerprint(*items: Any) -> str:
+    """Content hash of the series, frames and plain values of an experiment."""
+    digest = hashlib.blake2b(digest_size=16)
+    for item in items:
+        if isinstance(item, (pd.Series, pd.DataFrame)):
+            hashed = pd.util.hash_pandas_object(item, index=True)
+            digest.update(np.ascontiguousarray(hashed.to_numpy()).tobytes())
+        else:
+            digest.update(repr(item).encode())
+    return digest.hexdigest()
+
+
+class Checkpoint:
+    """Stage outputs of one experiment under ``model_dir/<exp_id>/``.
+
+    ``state.json`` holds the last completed ``SchudulerState`` and the
+    fingerprint of the inputs it was computed from; every stage output is a
+    joblib file written atomically, so a run killed mid-write never leaves a
+    truncated checkpoint behind. Opening a checkpoint whose fingerprint does
+    not match the current inputs discards it.
+    """
+
+    STATE_FILE: str = "state.json"
+
+    def __init__(self, directory: str, key: str):
+        self.directory = directory
+        self.key = key
+        os.makedirs(directory, exist_ok=True)
+        state = self._read_state()
+        if state is not None and state.get("key") != key:
+            logger.warning(f"Inputs changed, discarding checkpoint {directory}")
+            self.clear()
+            state = None
+        if state is None:
+            self.set_state(SchudulerState.SetUP)
+
+    @classmethod
+    def open(cls, directory: str) -> Optional["Checkpoint"]:
+        """The checkpoint saved in ``directory`` whatever inputs it was computed
+        from, ``None`` when there is none."""
+        try:
+            with open(os.path.join(directory, cls.STATE_FILE), "r") as state_file:
+                key = json.load(state_file)["key"]
+        except (OSError, ValueError, KeyError):
+            return None
+        return cls(directory, key)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _read_state(self) -> Optional[dict]:
+        try:
+            with open(self._path(self.STATE_FILE), "r") as state_file:
+                return json.load(state_file)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, name: str, writer):
+        handle, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        os.close(handle)
+        writer(tmp_path)
+        os.replace(tmp_path, self._path(name))
+
+    def clear(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+        os.makedirs(self.directory, exist_ok=True)
+
+    def get_state(self) -> SchudulerState:
+        state = self._read_state()
+        return SchudulerState(state["state"]) if state else SchudulerState.Init
+
+    def _write_state(self, state: SchudulerState):
+        def writer(path):
+            with open(path, "w") as state_file:
+                json.dump({"key": self.key, "state": int(state)}, state_file)
+
+        self._write(self.STATE_FILE, writer)
+        logger.info(f"Checkpoint {self.directory} at {state.name}")
+
+    def set_state(self, state: SchudulerState):
+        if state < self.get_state():
+            return self
+        self._write_state(state)
+        return self
+
+    def invalidate(self, state: SchudulerState, *prefixes: str):
+        """Rolls the checkpoint back to the stage before ``state`` and deletes
+        the outputs whose name starts with one of ``prefixes``."""
+        if self.get_state() >= state:
+            self._write_state(SchudulerState(state - 1))
+        for file_name in os.listdir(self.directory):
+            if file_name.endswith(".pkl") and file_name.startswith(prefixes):
+                os.remove(self._path(file_name))
+        return self
+
+    def is_done(self, state: SchudulerState) -> bool:
+        return self.get_state() >= state
+
+    def exists(self, name: str) -> bool:
+        return os.path.exists(self._path(f"{name}.pkl"))
+
+    def save(self, name: str, obj: Any):
+        self._write(f"{name}.pkl", lambda path: joblib.dump(obj, path))
+        return self
+
+    def load(self, name: str) -> Any:
+        return joblib.load(self._path(f"{name}.pkl"))
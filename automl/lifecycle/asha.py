@@ -0,0 +1,237 @@
+import logging
+import math
+from concurrent.futures import FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sktime.forecasting.base import BaseForecaster
+
+from automl.lifecycle.evaluator import evaluate_fold, get_cv_score
+from automl.lifecycle.fold_store import FoldStore
+from automl.lifecycle.search import RandomSearcher
+from automl.limits import Limits
+
+logger = logging.getLogger(__name__)
+
+FIDELITY_PARAMS = ("n_estimators",)
+
+
+def is_fidelity_param(key: str, value: Any) -> bool:
+    is_int = isinstance(value, (int, np.integer)) and not isinstance(value, bool)
+    return key.split("__")[-1] in FIDELITY_PARAMS and "estimator" in key and is_int
+
+
+def set_fidelity(forecaster: BaseForecaster, fraction: float) -> BaseForecaster:
+    """Scales the ensemble size of every estimator nested inside the forecaster."""
+    if fraction >= 1:
+        return forecaster
+    params = {
+        key: max(1, int(round(value * fraction)))
+        for key, value in forecaster.get_params(deep=True).items()
+        if is_fidelity_param(key, value)
+    }
+    if params:
+        forecaster.set_params(**params)
+    return forecaster
+
+
+def evaluate_trial(
+    forecaster: BaseForecaster,
+    store: FoldStore,
+    split: str,
+    fh: np.ndarray,
+    scoring: List[str],
+    n_threads: int,
+    fraction: float = 1.0,
+    min_window: int = 1,
+) -> pd.DataFrame:
+    """All folds of a split at a reduced fidelity: ``fraction`` of the ensemble
+    size and of the training window of every fold, the window never shorter
+    than ``min_window``."""
+    forecaster = set_fidelity(forecaster.clone(), fraction)
+    results = []
+    for fold_idx in range(store.get_n_splits(split)):
+        window = None
+        if fraction < 1:
+            train_size = len(store.splits[split][fold_idx][0])
+            window = max(min_window, math.ceil(fraction * train_size))
+        result = evaluate_fold(
+            forecaster, store, split, fold_idx, fh, scoring, n_threads, window
+        )
+        results.append({"fold": fold_idx, **result})
+    return pd.DataFrame(results)
+
+
+class SuccessiveHalving:
+    """Rung bookkeeping of asynchronous successive halving (ASHA).
+
+    Rung ``k`` of ``n_rungs + 1`` evaluates a trial at ``eta ** (k - n_rungs)``
+    of the full fidelity. A trial is promoted to the next rung as soon as it
+    ranks in the top ``1 / eta`` of the trials finished at its rung, so a free
+    worker never waits for a rung to fill up; trials that are never promoted
+    are the ones stopped early.
+    """
+
+    def __init__(self, n_rungs: int, eta: int = 3):
+        self.n_rungs = n_rungs
+        self.eta = eta
+        self.rungs: List[Dict[int, float]] = [{} for _ in range(n_rungs + 1)]
+        self.promoted: List[set] = [set() for _ in range(n_rungs + 1)]
+
+    def get_fraction(self, rung: int) -> float:
+        return float(self.eta) ** (rung - self.n_rungs)
+
+    @staticmethod
+    def _rank_key(scores: Dict[int, float]):
+        return lambda trial_id: (
+            scores[trial_id] if np.isfinite(scores[trial_id]) else np.inf
+        )
+
+    def get_promotion(self) -> Optional[Tuple[int, int]]:
+        """``(trial_id, rung)`` of the next job to promote, top rungs first."""
+        for rung in reversed(range(self.n_rungs)):
+            scores = self.rungs[rung]
+            n_top = len(scores) // self.eta
+            ranked = sorted(scores, key=self._rank_key(scores))
+            for trial_id in ranked[:n_top]:
+                if trial_id not in self.promoted[rung]:
+                    self.promoted[rung].add(trial_id)
+                    return trial_id, rung + 1
+        return None
+
+    def report(self, trial_id: int, rung: int, score: float):
+        self.rungs[rung][trial_id] = score
+        return self
+
+    def get_best(self) -> Tuple[int, int, float]:
+        """``(trial_id, rung, score)`` of the best trial of the highest rung
+        reached."""
+        for rung in reversed(range(self.n_rungs + 1)):
+            scores = self.rungs[rung]
+            if scores:
+                trial_id = min(scores, key=self._rank_key(scores))
+                return trial_id, rung, scores[trial_id]
+        raise ValueError("No trial finished")
+
+
+class ASHATuner:
+    """Multi-fidelity search of one model's hyper parameters.
+
+    Jobs run as futures on a ``KillableExecutor`` with ``n_workers`` of them
+    in flight; whenever one finishes, the freed worker gets the next
+    promotion of ``SuccessiveHalving`` or a new trial drawn from the searcher.
+    New trials are drawn until ``budget`` full fidelity evaluations are spent
+    or the ``limits`` deadline passes; jobs over their timeout or memory cap
+    are killed and score ``inf``. The returned score is a full fidelity cross
+    validation score, so it ranks against the other tuned models, unless the
+    deadline leaves no time to evaluate the best trial at full fidelity.
+    """
+
+    def __init__(
+        self,
+        scoring: List[str],
+        n_rungs: int = 2,
+        eta: int = 3,
+        n_workers: int = 1,
+        n_threads: int = 1,
+        limits: Optional[Limits] = None,
+    ):
+        self.scoring = scoring
+        self.limits = limits or Limits()
+        self.n_workers = n_workers
+        self.n_threads = n_threads
+        self.halving = SuccessiveHalving(n_rungs, eta)
+
+    def get_n_trials(self, budget: float) -> int:
+        """Largest number of trials a budget can start, all stopped at rung 0."""
+        return int(math.ceil(budget / self.halving.get_fraction(0)))
+
+    def tune(
+        self,
+        pipeline,
+        searcher: RandomSearcher,
+        store: FoldStore,
+        split: str,
+        fh: np.ndarray,
+        budget: float,
+        min_window: int = 1,
+        callback: Optional[Callable[[Dict, float, pd.DataFrame], None]] = None,
+    ) -> Tuple[Dict[str, Any], float]:
+        """Best trial and its full fidelity score; ``callback`` receives the
+        params, fidelity and fold results of every finished job."""
+        trials: List[Dict[str, Any]] = []
+        running = {}
+        spent = 0.0
+        score_name = f"test_{self.scoring[0]}"
+
+        with self.limits.get_executor(self.n_workers) as executor:
+
+            def submit(trial_id: int, rung: int):
+                fraction = self.halving.get_fraction(rung)
+                forecaster = pipeline.forecaster.set_params(**trials[trial_id])
+                future = executor.submit(
+                    evaluate_trial,
+                    forecaster,
+                    store,
+                    split,
+                    fh,
+                    self.scoring,
+                    self.n_threads,
+                    fraction,
+                    min_window,
+                )
+                running[future] = (trial_id, rung)
+                return fraction
+
+            while True:
+                while len(running) < self.n_workers and not self.limits.is_expired():
+                    job = self.halving.get_promotion()
+                    if job is None and spent < budget:
+                        candidates = searcher.ask(1)
+                        if candidates:
+                            trials.extend(candidates)
+                            job = (len(trials) - 1, 0)
+                    if job is None:
+                        break
+                    spent += submit(*job)
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    trial_id, rung = running.pop(future)
+                    try:
+                        eval_data = future.result()
+                    except Exception as exc:
+                        logger.warning(f"Trial {trial_id} failed: {exc!r}")
+                        score = np.inf
+                    else:
+                        score = get_cv_score(eval_data, score_name)
+                        if callback is not None:
+                            fraction = self.halving.get_fraction(rung)
+                            callback(trials[trial_id], fraction, eval_data)
+                    self.halving.report(trial_id, rung, score)
+                    if rung == 0:
+                        searcher.tell([trials[trial_id]], [score])
+
+            if not any(self.halving.rungs):
+                return {}, np.inf
+            trial_id, rung, score = self.halving.get_best()
+            if rung < self.halving.n_rungs:
+                final = self.halving.n_rungs
+                submit(trial_id, final)
+                future = running.pop(next(iter(running)))
+                try:
+                    eval_data = future.result()
+                except Exception as exc:
+                    logger.warning(f"Full fidelity run of trial {trial_id}: {exc!r}")
+                else:
+                    score = get_cv_score(eval_data, score_name)
+                    self.halving.report(trial_id, final, score)
+                    if callback is not None:
+                        callback(trials[trial_id], 1.0, eval_data)
+        logger.info(
+            f"ASHA ran {len(trials)} trials, "
+            f"{len(self.halving.rungs[-1])} at full fidelity"
+        )
+        return trials[trial_id], score
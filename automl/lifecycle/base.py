@@ -1,22 +1,30 @@
+from typing import List
+
 import numpy as np
 import pandas as pd
 from sktime.forecasting.model_selection import ExpandingWindowSplitter
-from sktime.performance_metrics.forecasting import (
-    MeanAbsoluteError, MeanAbsolutePercentageError, MeanAbsoluteScaledError,
-    MeanSquaredError)
 
+from automl.lifecycle.fold_store import FoldStore
+from automl.lifecycle.panel import to_panel_frame
+from automl.lifecycle.scoring import LOSS_METRICS
+from automl.limits import Limits
 from automl.stat.statistics import SeriesStat
 
 
 class Base:
-    def __init__(self, model_select_count: int, cv_split: int, metric: str):
+    def __init__(
+        self, model_select_count: int, cv_split: int, metric: str, n_jobs: int = -1
+    ):
         self.model_select_count = model_select_count
         self.cv_split = cv_split
         self.metric = metric
+        self.n_jobs = n_jobs
         self.y, self.x, self.fh, self.stat = None, None, None, None
+        self.fold_store = None
+        self.limits = Limits()
 
     def set_y(self, y: pd.Series):
-        self.y = y
+        self.y = to_panel_frame(y)
         return self
 
     def set_x(self, x: pd.DataFrame):
@@ -31,6 +39,20 @@ class Base:
         self.stat = stat
         return self
 
+    def set_fold_store(self, fold_store: FoldStore):
+        self.fold_store = fold_store
+        return self
+
+    def set_limits(self, limits: Limits):
+        self.limits = limits
+        return self
+
+    def get_fold_store(self, split: str, y_size: int) -> FoldStore:
+        if self.fold_store is None:
+            self.fold_store = FoldStore(self.y, self.x)
+        cv = self.get_crossvalidate_spliter(y_size)
+        return self.fold_store.add_split(split, cv, y_size)
+
     def get_crossvalidate_spliter(self, y_size: int):
         step_length = len(self.fh)
         fh_max_length = max(self.fh)
@@ -42,26 +64,8 @@ class Base:
         )
         return cv
 
-    def get_scoring_metric(self):
-        if self.metric == "mae":
-            return MeanAbsoluteError()
-        elif self.metric == "rmse":
-            return MeanSquaredError(square_root=True)
-        elif self.metric == "mse":
-            return MeanSquaredError(square_root=False)
-        elif self.metric == "mape":
-            return MeanAbsolutePercentageError(symmetric=False)
-        elif self.metric == "smape":
-            return MeanAbsolutePercentageError(symmetric=True)
-        elif self.metric == "mase":
-            return MeanAbsoluteScaledError()
-        else:
-            return MeanAbsoluteError()
+    def get_scoring_metric(self) -> str:
+        return self.metric if self.metric in LOSS_METRICS else "mae"
 
-    def get_all_scoring_matric(self):
-        return [
-            MeanAbsoluteError(),
-            MeanSquaredError(square_root=True),
-            MeanAbsolutePercentageError(symmetric=False),
-            MeanAbsoluteScaledError(),
-        ]
+    def get_all_scoring_matric(self) -> List[str]:
+        return list(LOSS_METRICS)
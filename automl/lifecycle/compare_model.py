@@ -1,19 +1,30 @@
 import logging
-from typing import Dict, List, Optional
+import math
+from typing import Dict, List, Optional, Tuple
 
 import pandas as pd
-from sktime.forecasting.model_evaluation import evaluate
 
 from automl.lifecycle.base import Base
-from automl.model_db import ModelQuery
-from automl.models.basemodel import ModelID
+from automl.lifecycle.evaluator import GridEvaluator, get_cv_score
+from automl.lifecycle.fold_store import FoldStore
+from automl.lifecycle.panel import n_timepoints
+from automl.model_db import ModelHandle, ModelQuery
 
 logger = logging.getLogger(__name__)
 
 
 class ModelComparator(Base):
-    def __init__(self, model_select_count: int, cv_split: int, metric: str, **kwargs):
-        super().__init__(model_select_count, cv_split, metric)
+    def __init__(
+        self,
+        model_select_count: int,
+        cv_split: int,
+        metric: str,
+        n_jobs: int = -1,
+        elimination_rate: float = 0.0,
+        **kwargs,
+    ):
+        super().__init__(model_select_count, cv_split, metric, n_jobs)
+        self.elimination_rate = elimination_rate
         self.y, self.x, self.fh, self.stat = None, None, None, None
 
     def compare(self, filter: Optional[Dict] = None) -> pd.DataFrame:
@@ -22,30 +33,28 @@ class ModelComparator(Base):
             logger.info("Skipping Model Selection ")
             return self.build_empty_result_dir(models_list)
 
-        cv_index = self.get_crossvalidate_spliter(len(self.y))
-        logger.info(cv_index)
-        results_list = []
-        for model in models_list:
-            logger.info(f"Evaluateing {type(model).identifier.name} ...")
-            eval_data = evaluate(
-                forecaster=model.forecaster,
-                y=self.y,
-                X=self.x,
-                cv=cv_index,
-                strategy="update",
-                scoring=self.get_all_scoring_matric(),
-                return_data=False,
-                backend="loky",
-                verbose=-1,
+        store = self.get_fold_store("compare", n_timepoints(self.y))
+        scoring = self.get_all_scoring_matric()
+        evaluator = GridEvaluator(scoring, n_jobs=self.n_jobs, limits=self.limits)
+        if self.elimination_rate > 0:
+            models_list, eval_list = self.race(evaluator, models_list, store)
+        else:
+            eval_list = evaluator.evaluate(
+                [model.forecaster for model in models_list], store, "compare", self.fh
             )
+        results_list = []
+        for model, eval_data in zip(models_list, eval_list):
+            logger.info(f"Evaluateing {model.identifier.name} ...")
             d_temp = {
-                "model_id": type(model).identifier,
-                "model_name": type(model).identifier.name,
-                "mae": eval_data["test_MeanAbsoluteError"].mean(),
-                "rmse": eval_data["test_MeanSquaredError"].mean(),
-                "mape": eval_data["test_MeanAbsolutePercentageError"].mean(),
-                "mase": eval_data["test_MeanAbsoluteScaledError"].mean(),
+                "model_id": model.identifier,
+                "model_name": model.identifier.name,
+                # a model with a killed fold scores NaN and ranks last
+                **{
+                    metric: eval_data[f"test_{metric}"].mean(skipna=False)
+                    for metric in scoring
+                },
                 "fit_time": eval_data["fit_time"].max(),
+                "pred_time": eval_data["pred_time"].max(),
             }
             results_list.append(d_temp)
             logger.info(f"evaluate results : {d_temp[self.metric]}")
@@ -54,17 +63,59 @@ class ModelComparator(Base):
         # model_ids = final_result["model_id"].to_list()[: self.model_select_count]
         return result_df
 
-    def build_empty_result_dir(self, model_list: List[ModelID]) -> pd.DataFrame:
+    def race(
+        self, evaluator: GridEvaluator, models_list: List, store: FoldStore
+    ) -> Tuple[List, List[pd.DataFrame]]:
+        """Successive halving over the CV folds.
+
+        Folds are raced from the shortest training window to the longest, after
+        every fold but the last the worst ``elimination_rate`` share of the
+        surviving models is dropped, never going below ``model_select_count``.
+        """
+        metric_col = f"test_{self.get_scoring_metric()}"
+        n_folds = store.get_n_splits("compare")
+        survivors = list(range(len(models_list)))
+        forecasters = [model.forecaster for model in models_list]
+        eval_list = [[] for _ in models_list]
+        for fold_idx in range(n_folds):
+            fold_evals = evaluator.evaluate(
+                [forecasters[idx] for idx in survivors],
+                store,
+                "compare",
+                self.fh,
+                fold_ids=[fold_idx],
+            )
+            for idx, fold_eval in zip(survivors, fold_evals):
+                eval_list[idx].append(fold_eval)
+            if fold_idx == n_folds - 1:
+                break
+            keep_count = max(
+                self.model_select_count,
+                math.ceil(len(survivors) * (1 - self.elimination_rate)),
+            )
+            ranked = sorted(
+                survivors,
+                key=lambda idx: get_cv_score(pd.concat(eval_list[idx]), metric_col),
+            )
+            survivors = sorted(ranked[:keep_count])
+            logger.info(
+                f"Racing fold {fold_idx}: dropped {len(ranked) - keep_count} models, "
+                f"{keep_count} left"
+            )
+        return (
+            [models_list[idx] for idx in survivors],
+            [pd.concat(eval_list[idx], ignore_index=True) for idx in survivors],
+        )
+
+    def build_empty_result_dir(self, model_list: List[ModelHandle]) -> pd.DataFrame:
         results_list = []
         for model in model_list:
             d_temp = {
-                "model_id": type(model).identifier,
-                "model_name": type(model).identifier.name,
-                "mae": -1,
-                "rmse": -1,
-                "mape": -1,
-                "mase": -1,
+                "model_id": model.identifier,
+                "model_name": model.identifier.name,
+                **{metric: -1 for metric in self.get_all_scoring_matric()},
                 "fit_time": 0,
+                "pred_time": 0,
             }
             results_list.append(d_temp)
         return pd.DataFrame.from_dict(results_list)
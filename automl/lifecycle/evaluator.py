@@ -0,0 +1,169 @@
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sktime.forecasting.base import BaseForecaster
+from sktime.forecasting.compose import ForecastingPipeline
+from threadpoolctl import threadpool_limits
+
+from automl.lifecycle.fold_store import FoldStore
+from automl.lifecycle.scoring import get_scores
+from automl.limits import Limits
+from automl.resources import ResourceManager
+
+logger = logging.getLogger(__name__)
+
+THREAD_PARAMS = ("n_jobs", "thread_count")
+
+
+def set_thread_budget(forecaster: BaseForecaster, n_threads: int) -> BaseForecaster:
+    """Caps the thread count of every estimator nested inside the forecaster."""
+    params = {
+        key: n_threads
+        for key in forecaster.get_params(deep=True).keys()
+        if key.split("__")[-1] in THREAD_PARAMS and "estimator" in key
+    }
+    if params:
+        forecaster.set_params(**params)
+    return forecaster
+
+
+def split_pipeline(forecaster: BaseForecaster) -> Tuple[BaseForecaster, bool]:
+    """Returns the inner forecaster of a ``ForecastingPipeline`` and whether its
+    exogenous scaler is skipped, the exogenous steps being served by the store."""
+    params = forecaster.get_params(deep=False)
+    if isinstance(forecaster, ForecastingPipeline) and "forecaster" in params:
+        passthrough = forecaster.get_params().get("scaler_x__passthrough", True)
+        return params["forecaster"].clone(), passthrough
+    return forecaster.clone(), True
+
+
+def evaluate_fold(
+    forecaster: BaseForecaster,
+    store: FoldStore,
+    split: str,
+    fold_idx: int,
+    fh: np.ndarray,
+    scoring: List[str],
+    n_threads: int,
+    train_window: Optional[int] = None,
+) -> Dict[str, Any]:
+    forecaster, passthrough = split_pipeline(forecaster)
+    forecaster = set_thread_budget(forecaster, n_threads)
+    y_train, y_test, x_train, x_test = store.get_fold(
+        split, fold_idx, scaled=not passthrough, window=train_window
+    )
+    with threadpool_limits(limits=n_threads):
+        start_fit = time.perf_counter()
+        forecaster.fit(y_train, X=x_train, fh=fh)
+        fit_time = time.perf_counter() - start_fit
+        start_pred = time.perf_counter()
+        y_pred = forecaster.predict(fh=fh, X=x_test)
+        pred_time = time.perf_counter() - start_pred
+    scores = get_scores(y_test, y_pred, y_train, scoring)
+    result = {f"test_{metric}": value for metric, value in scores.items()}
+    result["fit_time"] = fit_time
+    result["pred_time"] = pred_time
+    result["len_train_window"] = len(y_train)
+    return result
+
+
+def get_cv_score(eval_data: pd.DataFrame, score_name: str) -> float:
+    """Mean fold score, ``inf`` unless every fold finished, so a trial cut off
+    by a limit never ranks on the folds that survived."""
+    score = eval_data[score_name].mean(skipna=False)
+    return float(np.nan_to_num(score, nan=np.inf))
+
+
+def is_complete(eval_data: pd.DataFrame, score_name: str) -> bool:
+    return bool(np.isfinite(eval_data[score_name]).all())
+
+
+def get_failed_result(scoring: List[str]) -> Dict[str, Any]:
+    result = {f"test_{metric}": np.nan for metric in scoring}
+    result.update(fit_time=np.nan, pred_time=np.nan, len_train_window=np.nan)
+    return result
+
+
+class GridEvaluator:
+    """Runs the model-by-fold cross validation grid as one pool of tasks.
+
+    Every (model, fold) pair is an independent refit on the fold's training
+    window read from the ``FoldStore``, so the grid can be dispatched in any
+    order and still give the same scores as the serial ``n_jobs=1`` run.
+
+    These are the scores of sktime ``evaluate(strategy="refit")``. The
+    comparison used to run ``strategy="update"``, where a fold updates the
+    model of the previous fold: the CCD pipelines then only update their
+    transformers, so their scores there differ slightly from the refit ones.
+
+    With active ``limits`` every task runs in a ``KillableExecutor`` worker;
+    a task killed for its timeout, memory cap or the run deadline, or that
+    raises, scores ``NaN`` instead of stopping the grid.
+    """
+
+    def __init__(
+        self,
+        scoring: List[str],
+        n_jobs: int = -1,
+        backend: str = "loky",
+        limits: Optional[Limits] = None,
+    ):
+        self.scoring = scoring
+        self.n_jobs = n_jobs
+        self.backend = backend
+        self.limits = limits or Limits()
+
+    def get_budget(self, n_tasks: int) -> Tuple[int, int]:
+        budget = ResourceManager(self.n_jobs).get_budget(n_tasks)
+        return budget.n_workers, budget.n_threads
+
+    def evaluate(
+        self,
+        forecasters: List[BaseForecaster],
+        store: FoldStore,
+        split: str,
+        fh: np.ndarray,
+        fold_ids: Optional[List[int]] = None,
+    ) -> List[pd.DataFrame]:
+        if fold_ids is None:
+            fold_ids = list(range(store.get_n_splits(split)))
+        tasks = [
+            (model_idx, fold_idx)
+            for model_idx in range(len(forecasters))
+            for fold_idx in fold_ids
+        ]
+        n_workers, n_threads = self.get_budget(len(tasks))
+        logger.info(
+            f"Evaluating {len(forecasters)} models x {len(fold_ids)} folds "
+            f"on {n_workers} workers with {n_threads} threads each"
+        )
+        task_args = [
+            (forecasters[idx], store, split, fold_idx, fh, self.scoring, n_threads)
+            for idx, fold_idx in tasks
+        ]
+        if self.limits.is_active():
+            results = self.evaluate_killable(task_args, n_workers)
+        else:
+            results = Parallel(n_jobs=n_workers, backend=self.backend)(
+                delayed(evaluate_fold)(*args) for args in task_args
+            )
+        model_results = [[] for _ in forecasters]
+        for (model_idx, fold_idx), result in zip(tasks, results):
+            model_results[model_idx].append({"fold": fold_idx, **result})
+        return [pd.DataFrame(result) for result in model_results]
+
+    def evaluate_killable(self, task_args: List[Tuple], n_workers: int) -> List:
+        with self.limits.get_executor(n_workers) as executor:
+            futures = [executor.submit(evaluate_fold, *args) for args in task_args]
+            results = []
+            for future in futures:
+                try:
+                    results.append(future.result())
+                except Exception as exc:
+                    logger.warning(f"CV task failed: {exc!r}")
+                    results.append(get_failed_result(self.scoring))
+        return results
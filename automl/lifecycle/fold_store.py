@@ -0,0 +1,196 @@
+import logging
+import os
+import shutil
+import tempfile
+import weakref
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import MinMaxScaler
+
+logger = logging.getLogger(__name__)
+
+
+def impute(x: pd.DataFrame) -> pd.DataFrame:
+    """Same filling as ``Imputer(method="ffill")`` of the pipelines."""
+    return x.ffill().bfill()
+
+
+def scale(x_train: np.ndarray, x_test: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """``MinMaxScaler`` fit on the training block, per series for a panel, as
+    the vectorized ``TabularToSeriesAdaptor`` of the pipelines does."""
+    if x_train.ndim == 2:
+        scaler = MinMaxScaler().fit(x_train)
+        return scaler.transform(x_train), scaler.transform(x_test)
+    scaled = [scale(train, test) for train, test in zip(x_train, x_test)]
+    return (
+        np.stack([train for train, _ in scaled]),
+        np.stack([test for _, test in scaled]),
+    )
+
+
+class FoldStore:
+    """Cross validation folds computed once per experiment.
+
+    Holds the integer train/test positions of every fold together with the
+    exogenous blocks already passed through the ``ColumnsGuard -> Imputer ->
+    MinMaxScaler`` steps of the pipelines. The arrays are memory mapped from
+    ``directory`` so every worker reads the same pages instead of rebuilding
+    the fold data for each model and trial.
+
+    Expanding windows always start at the first observation, so the imputed
+    training block of a fold is a prefix of the imputed exogenous data and is
+    stored only once. Test blocks are imputed on their own, as the pipeline
+    does at predict time.
+
+    A panel indexed by ``(series_id, time)`` is stored as ``(n_series,
+    n_time)`` arrays; the series must share the same time index and the folds
+    split all of them at the same time points.
+    """
+
+    def __init__(
+        self,
+        y: pd.Series,
+        x: Optional[pd.DataFrame] = None,
+        directory: Optional[str] = None,
+    ):
+        if directory is None:
+            directory = tempfile.mkdtemp(prefix="automl_folds_")
+            self._finalizer = weakref.finalize(
+                self, shutil.rmtree, directory, ignore_errors=True
+            )
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.columns = None if x is None else x.columns
+        self.splits: Dict[str, List[Tuple[np.ndarray, np.ndarray]]] = {}
+        self._arrays: Dict[str, np.ndarray] = {}
+        self.instances, self.index_names = None, None
+        if isinstance(y.index, pd.MultiIndex):
+            self._init_panel(y, x)
+        else:
+            self.index = y.index
+            self.name = y.name
+            self._x = None if x is None else [x]
+            self._save("y", y.to_numpy(dtype=np.float64))
+            if x is not None:
+                self._save("x", impute(x).to_numpy(dtype=np.float64))
+
+    def _init_panel(self, y: pd.DataFrame, x: Optional[pd.DataFrame]):
+        y = y.iloc[:, 0] if isinstance(y, pd.DataFrame) else y
+        table = y.unstack(level=0)
+        if table.size != len(y):
+            raise ValueError("FoldStore expects the panel series to be aligned")
+        self.instances = y.index.get_level_values(0).unique()
+        self.index_names = y.index.names
+        self.index = table.index
+        self.name = y.name
+        self._save("y", table[self.instances].to_numpy(dtype=np.float64).T)
+        if x is not None:
+            self._x = [x.xs(key, level=0).reindex(self.index) for key in self.instances]
+            x_imputed = [
+                impute(x_inst).to_numpy(dtype=np.float64) for x_inst in self._x
+            ]
+            self._save("x", np.stack(x_imputed))
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop("_finalizer", None)
+        state["_x"] = None
+        state["_arrays"] = {}
+        return state
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, f"{name}.npy")
+
+    def _save(self, name: str, array: np.ndarray):
+        np.save(self._path(name), np.ascontiguousarray(array))
+
+    def _load(self, name: str) -> np.ndarray:
+        if name not in self._arrays:
+            self._arrays[name] = np.load(self._path(name), mmap_mode="r")
+        return self._arrays[name]
+
+    def add_split(self, name: str, cv, n_obs: Optional[int] = None) -> "FoldStore":
+        if name in self.splits:
+            return self
+        n_obs = len(self.index) if n_obs is None else n_obs
+        folds = [
+            (np.asarray(train), np.asarray(test))
+            for train, test in cv.split(self.index[:n_obs])
+        ]
+        for train, test in folds:
+            contiguous = np.all(np.diff(train) == 1) and np.all(np.diff(test) == 1)
+            if train[0] != 0 or not contiguous:
+                raise ValueError("FoldStore expects contiguous expanding windows")
+        if self.columns is not None:
+            x_imputed = self._load("x")
+            for fold_idx, (train, test) in enumerate(folds):
+                x_test = np.stack(
+                    [
+                        impute(x_inst.iloc[test]).to_numpy(dtype=np.float64)
+                        for x_inst in self._x
+                    ]
+                )
+                if self.instances is None:
+                    x_test = x_test[0]
+                x_train_scaled, x_test_scaled = scale(x_imputed[..., train, :], x_test)
+                self._save(f"{name}_{fold_idx}_x_test", x_test)
+                self._save(f"{name}_{fold_idx}_x_train_scaled", x_train_scaled)
+                self._save(f"{name}_{fold_idx}_x_test_scaled", x_test_scaled)
+        self.splits[name] = folds
+        logger.info(f"Stored {len(folds)} folds for split '{name}' in {self.directory}")
+        return self
+
+    def get_n_splits(self, name: str) -> int:
+        return len(self.splits[name])
+
+    def get_fold(
+        self,
+        name: str,
+        fold_idx: int,
+        scaled: bool = False,
+        window: Optional[int] = None,
+    ) -> Tuple[pd.Series, pd.Series, Optional[pd.DataFrame], Optional[pd.DataFrame]]:
+        """Train/test blocks of a fold, the training block cut to its last
+        ``window`` observations when given."""
+        train, test = self.splits[name][fold_idx]
+        train_size = len(train)
+        if window is not None:
+            train_size = min(window, train_size)
+        train = slice(train[-1] + 1 - train_size, train[-1] + 1)
+        test = slice(test[0], test[-1] + 1)
+        y = self._load("y")
+        y_train = self._to_pandas(y[..., train], self.index[train])
+        y_test = self._to_pandas(y[..., test], self.index[test])
+        if self.columns is None:
+            return y_train, y_test, None, None
+        if scaled:
+            x_train = self._load(f"{name}_{fold_idx}_x_train_scaled")
+            start = x_train.shape[-2] - train_size
+            x_train = x_train[..., start:, :]
+            x_test = self._load(f"{name}_{fold_idx}_x_test_scaled")
+        else:
+            x_train = self._load("x")[..., train, :]
+            x_test = self._load(f"{name}_{fold_idx}_x_test")
+        x_train = self._to_pandas(x_train, self.index[train], self.columns)
+        x_test = self._to_pandas(x_test, self.index[test], self.columns)
+        return y_train, y_test, x_train, x_test
+
+    def _to_pandas(
+        self, values: np.ndarray, index: pd.Index, columns: Optional[pd.Index] = None
+    ):
+        """Series/DataFrame of a single series block, pd-multiindex frame of a
+        panel block."""
+        if self.instances is None:
+            if columns is None:
+                return pd.Series(values, index=index, name=self.name)
+            return pd.DataFrame(values, index=index, columns=columns)
+        index = pd.MultiIndex.from_product(
+            [self.instances, index], names=self.index_names
+        )
+        if columns is None:
+            return pd.DataFrame(values.reshape(-1), index=index, columns=[self.name])
+        return pd.DataFrame(
+            values.reshape(-1, len(columns)), index=index, columns=columns
+        )
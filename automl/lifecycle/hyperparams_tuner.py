@@ -1,13 +1,17 @@
 import logging
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
-from sktime.forecasting.model_selection import ForecastingRandomizedSearchCV
-from sktime.performance_metrics.forecasting import (
-    MeanAbsoluteError, MeanAbsolutePercentageError, MeanAbsoluteScaledError,
-    MeanSquaredError)
 
+from automl.checkpoint import Checkpoint, fingerprint
+from automl.lifecycle.asha import ASHATuner
 from automl.lifecycle.base import Base
+from automl.lifecycle.evaluator import GridEvaluator, get_cv_score, is_complete
+from automl.lifecycle.panel import n_timepoints, split_last, to_series
+from automl.lifecycle.scoring import METRICS, score_forecasts
+from automl.lifecycle.search import get_searcher
+from automl.lifecycle.trial_db import TrialDB
 from automl.model_db import ModelQuery
 
 logger = logging.getLogger(__name__)
@@ -20,78 +24,212 @@ class HyperParamsTuner(Base):
         cv_split: int,
         metric: str,
         random_search_iter: int,
+        n_jobs: int = -1,
+        search_algorithm: str = "random",
+        asha_rungs: int = 0,
+        asha_eta: int = 3,
+        warm_start: int = 3,
         **kawrgs,
     ):
-        super().__init__(model_select_count, cv_split, metric)
+        super().__init__(model_select_count, cv_split, metric, n_jobs)
         self.random_search_iter = random_search_iter
+        self.search_algorithm = search_algorithm
+        self.asha_rungs = asha_rungs
+        self.asha_eta = asha_eta
+        self.warm_start = warm_start
         self.tuned_models = []
+        self.checkpoint = None
+        self.trial_db, self.series_key = None, None
+
+    def set_checkpoint(self, checkpoint: Optional[Checkpoint]):
+        self.checkpoint = checkpoint
+        return self
+
+    def set_trial_db(self, trial_db: Optional[TrialDB]):
+        self.trial_db = trial_db
+        return self
 
     def get_training_test_data(self):
         test_size = len(self.fh)
-        train_x = self.x.iloc[:-test_size, :]
-        train_y = self.y.iloc[:-test_size]
-        test_x = self.x.iloc[-test_size:, :]
-        test_y = self.y.iloc[-test_size:]
+        train_x, test_x = split_last(self.x, test_size)
+        train_y, test_y = split_last(self.y, test_size)
         return (train_x, train_y), (test_x, test_y)
 
     def tune_model(self, result_df: pd.DataFrame) -> List[Tuple]:
         (train_x, train_y), _ = self.get_training_test_data()
+        store = self.get_fold_store("tune", n_timepoints(train_y))
+        scoring = self.get_scoring_metric()
+        evaluator = GridEvaluator([scoring], n_jobs=self.n_jobs, limits=self.limits)
+        if self.trial_db is not None:
+            self.series_key = fingerprint(self.y, self.x)
         for idx, row in result_df.iterrows():
             logger.info(f"{idx}, Tunning Model {row['model_name']}")
+            checkpoint_name = f"tuned_{row['model_name']}"
+            if self.checkpoint and self.checkpoint.exists(checkpoint_name):
+                logger.info(f"{row['model_name']} restored from checkpoint")
+                self.tuned_models.append(self.checkpoint.load(checkpoint_name))
+                continue
+            if self.limits.is_expired() and self.tuned_models:
+                logger.warning(f"Time budget spent, {row['model_name']} not tuned")
+                continue
             pipeline = ModelQuery.get_model_object_by_ID(self.stat, row["model_name"])
             if pipeline is None:
                 continue
-            grid_search = ForecastingRandomizedSearchCV(
-                pipeline.forecaster,
-                strategy="refit",
-                scoring=self.get_scoring_metric(),
-                cv=self.get_crossvalidate_spliter(len(train_y)),
-                param_distributions=pipeline.hyper_parameters,
-                verbose=10,
-                n_jobs=-1,
-                refit=True,
-                error_score="raise",
-                n_iter=self.random_search_iter,
-            )
-            grid_search.fit(train_y, X=train_x, fh=self.fh)
-            # logger.info(f"Best Params {grid_search.best_params_}")
-            logger.info(f"Best scores {grid_search.best_score_}")
-            self.tuned_models.append(
-                (
-                    str(type(pipeline).identifier.name),
-                    grid_search.best_forecaster_,
-                    grid_search.best_score_,
+            if self.limits.is_expired():
+                best_params, best_score = {}, np.inf
+            elif self.asha_rungs > 0:
+                best_params, best_score = self.search_asha(
+                    pipeline, row["model_name"], store, evaluator, scoring
+                )
+            else:
+                best_params, best_score = self.search(
+                    pipeline, row["model_name"], store, evaluator, scoring
+                )
+            if not np.isfinite(best_score):
+                # the run must return a model, the best compared one is kept
+                logger.warning(
+                    f"No {row['model_name']} trial finished within the time "
+                    "budget, refitting its compare stage configuration untuned"
                 )
+            best_forecaster = pipeline.forecaster.set_params(**best_params)
+            best_forecaster.fit(train_y, X=train_x, fh=self.fh)
+            # logger.info(f"Best Params {best_params}")
+            logger.info(f"Best scores {best_score}")
+            tuned_model = (
+                str(type(pipeline).identifier.name),
+                best_forecaster,
+                best_score,
             )
-        self.tuned_models.sort(key=lambda x: x[2])
+            if self.checkpoint:
+                self.checkpoint.save(checkpoint_name, tuned_model)
+            self.tuned_models.append(tuned_model)
+        self.tuned_models.sort(key=lambda x: np.nan_to_num(x[2], nan=np.inf))
 
         return self
 
+    def build_searcher(self, pipeline, model_name: str, n_iter: int):
+        """Searcher of the model's space, seeded with the best configurations
+        of similar series recorded in the trial database."""
+        searcher = get_searcher(
+            self.search_algorithm, pipeline.hyper_parameters, n_iter, random_state=80
+        )
+        if self.trial_db is not None and self.warm_start > 0:
+            configs = self.trial_db.get_warm_start(
+                self.series_key, model_name, self.metric, self.stat, self.warm_start
+            )
+            searcher.warm_start(configs)
+        return searcher
+
+    def record_trials(
+        self,
+        model_name: str,
+        candidates: List[dict],
+        eval_list: List[pd.DataFrame],
+        score_name: str,
+        fidelity: float = 1.0,
+    ):
+        """Records the trials that finished every fold, a partial trial's
+        score says nothing about its configuration."""
+        if self.trial_db is None:
+            return
+        trials = [
+            {
+                "params": params,
+                "fold_scores": eval_data[score_name].tolist(),
+                "fit_time": eval_data["fit_time"].sum(),
+                "fidelity": fidelity,
+            }
+            for params, eval_data in zip(candidates, eval_list)
+            if is_complete(eval_data, score_name)
+        ]
+        if len(trials) < len(candidates):
+            logger.info(
+                f"{len(candidates) - len(trials)} partial {model_name} trials "
+                "not recorded"
+            )
+        if not trials:
+            return
+        self.trial_db.record(
+            self.series_key, model_name, self.metric, self.stat, trials
+        )
+
+    def search(
+        self, pipeline, model_name: str, store, evaluator, scoring
+    ) -> Tuple[dict, float]:
+        searcher = self.build_searcher(pipeline, model_name, self.random_search_iter)
+        n_workers, _ = evaluator.get_budget(self.random_search_iter)
+        while not searcher.is_done() and not self.limits.is_expired():
+            candidates = searcher.ask(searcher.get_batch_size(n_workers))
+            forecasters = [
+                pipeline.forecaster.set_params(**params) for params in candidates
+            ]
+            eval_list = evaluator.evaluate(forecasters, store, "tune", self.fh)
+            score_name = f"test_{scoring}"
+            scores = [get_cv_score(eval_data, score_name) for eval_data in eval_list]
+            searcher.tell(candidates, scores)
+            self.record_trials(model_name, candidates, eval_list, score_name)
+        return searcher.get_best()
+
+    def search_asha(
+        self, pipeline, model_name: str, store, evaluator, scoring
+    ) -> Tuple[dict, float]:
+        """Successive halving over the ensemble size and the training window,
+        spending the budget of ``random_search_iter`` full trials."""
+        n_workers, n_threads = evaluator.get_budget(self.random_search_iter)
+        tuner = ASHATuner(
+            [scoring],
+            self.asha_rungs,
+            self.asha_eta,
+            n_workers,
+            n_threads,
+            limits=self.limits,
+        )
+        searcher = self.build_searcher(
+            pipeline, model_name, tuner.get_n_trials(self.random_search_iter)
+        )
+
+        def on_result(params: dict, fraction: float, eval_data: pd.DataFrame):
+            self.record_trials(
+                model_name, [params], [eval_data], f"test_{scoring}", fraction
+            )
+
+        return tuner.tune(
+            pipeline,
+            searcher,
+            store,
+            "tune",
+            self.fh,
+            self.random_search_iter,
+            min_window=self.get_min_train_window(),
+            callback=on_result,
+        )
+
+    def get_min_train_window(self) -> int:
+        """Shortest reduced training window: four seasonal periods, room for
+        lag windows of up to ``2 * sp``, and two horizons."""
+        sp = max(1, self.stat.primary_seasonality) if self.stat else 1
+        return 4 * sp + 2 * int(max(self.fh))
+
     def get_predictions(self):
-        _, (test_x, test_y) = self.get_training_test_data()
-        test_y.rename("Real", inplace=True)
+        (_, train_y), (test_x, test_y) = self.get_training_test_data()
+        test_y = to_series(test_y).rename("Real")
         y_predcitions = [test_y]
         best_model_id = self.tuned_models[0][0]
         final_model = self.tuned_models[0][1]
         for model_name, model, _ in self.tuned_models:
             logger.info(f"Predicting {model_name} .... ")
             y_pred_t = model.predict(fh=self.fh, X=test_x)
-            y_pred_t.columns = [model_name]
+            if isinstance(y_pred_t, pd.DataFrame):
+                y_pred_t = y_pred_t.iloc[:, 0]
+            y_pred_t = y_pred_t.rename(model_name)
             y_predcitions.append(y_pred_t)
         return_df = pd.concat(y_predcitions, axis=1)
         return_df["Best_model"] = return_df[best_model_id].copy()
         print(return_df)
+        scores = score_forecasts(test_y, y_predcitions, train_y, METRICS)
         scoring_metrics = []
-        for y_pred in y_predcitions:
-            temp = {}
-            mae = MeanAbsoluteError()
-            temp["mae"] = mae(test_y, y_pred)
-            rmse = MeanSquaredError(square_root=True)
-            temp["rmse"] = rmse(test_y, y_pred)
-            mape = MeanAbsolutePercentageError()
-            temp["mape"] = mape(test_y, y_pred)
-            # mase = MeanAbsoluteScaledError()
-            # temp["mase"] = mase(test_y, y_pred)
+        for idx, y_pred in enumerate(y_predcitions):
+            temp = {metric: float(values[idx]) for metric, values in scores.items()}
             if y_pred.name == best_model_id:
                 scoring_metrics.append({"Best_model": temp})
             scoring_metrics.append({y_pred.name: temp})
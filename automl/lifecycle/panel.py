@@ -0,0 +1,61 @@
+from typing import Optional, Tuple, Union
+
+import pandas as pd
+
+Data = Union[pd.Series, pd.DataFrame]
+
+
+def is_panel(data: Optional[Data]) -> bool:
+    """Whether ``data`` is a panel indexed by ``(series_id, time)``."""
+    return data is not None and isinstance(data.index, pd.MultiIndex)
+
+
+def to_panel_frame(y: Data) -> Data:
+    """sktime expects panel targets as single column frames (pd-multiindex)."""
+    if is_panel(y) and isinstance(y, pd.Series):
+        return y.to_frame(name=y.name or "y")
+    return y
+
+
+def to_series(y: Data) -> pd.Series:
+    return y.iloc[:, 0] if isinstance(y, pd.DataFrame) else y
+
+
+def get_time_index(data: Data) -> pd.Index:
+    if is_panel(data):
+        return data.index.get_level_values(-1).unique()
+    return data.index
+
+
+def n_timepoints(data: Data) -> int:
+    return len(get_time_index(data))
+
+
+def n_series(data: Optional[Data]) -> int:
+    if not is_panel(data):
+        return 1
+    return data.index.get_level_values(0).nunique()
+
+
+def aggregate(y: Data) -> pd.Series:
+    """Mean of all series at every time point, the series the panel statistics
+    are extracted from."""
+    if not is_panel(y):
+        return y
+    aggregated = to_series(y).groupby(level=-1, sort=True).mean()
+    freq = pd.infer_freq(aggregated.index) if len(aggregated) > 2 else None
+    if freq is not None:
+        aggregated = aggregated.asfreq(freq)
+    return aggregated
+
+
+def split_last(data: Optional[Data], n_last: int) -> Tuple[Data, Data]:
+    """Splits off the last ``n_last`` time points of a series or of every
+    series of a panel."""
+    if data is None:
+        return None, None
+    if not is_panel(data):
+        return data.iloc[:-n_last], data.iloc[-n_last:]
+    cutoff = get_time_index(data).sort_values()[-n_last]
+    is_test = data.index.get_level_values(-1) >= cutoff
+    return data[~is_test], data[is_test]
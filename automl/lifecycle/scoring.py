@@ -0,0 +1,65 @@
+"""Forecast accuracy metrics of pandas forecasts, computed in one pass by
+the NumPy kernels of ``forecast_metrics``.
+
+Predictions of several models for the same target are stacked into a
+``(n_models, n_series, n_steps)`` array and every metric is reduced from the
+same residuals. Metrics are computed per series and averaged over the series
+of a panel, with the MASE scale of every series computed once from its own
+training data. sktime 0.21 pools the rows of a panel into one series
+instead: its MAE, MAPE and sMAPE agree on series of equal horizons, its
+RMSE, R2 and MASE (scaled by the naive error of the stacked training data)
+do not.
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from automl.lifecycle.panel import Data, is_panel, to_series
+from forecast_metrics import METRICS, naive_scale, score
+
+LOSS_METRICS = ("mae", "rmse", "mape", "smape", "mase", "mse")
+
+
+def to_matrix(y: Data) -> np.ndarray:
+    """``(n_series, n_steps)`` values of a series or of a panel."""
+    y = to_series(y)
+    if not is_panel(y):
+        return np.asarray(y, dtype=np.float64)[np.newaxis]
+    return y.unstack(level=0).to_numpy(dtype=np.float64).T
+
+
+def get_mase_scale(y_train: Data, sp: int = 1) -> np.ndarray:
+    """MASE denominator of every series of a series or of a panel."""
+    y_train = to_series(y_train)
+    if is_panel(y_train):
+        groups = [group for _, group in y_train.groupby(level=0, sort=True)]
+    else:
+        groups = [y_train]
+    return naive_scale((group.to_numpy() for group in groups), sp)
+
+
+def score_forecasts(
+    y_true: Data,
+    y_preds: List[Data],
+    y_train: Optional[Data] = None,
+    metrics: Sequence[str] = METRICS,
+    sp: int = 1,
+) -> Dict[str, np.ndarray]:
+    """Scores of every forecast of ``y_preds``, indexed like ``y_true``."""
+    y_pred = np.stack([to_matrix(y_pred) for y_pred in y_preds])
+    scale = None
+    if y_train is not None and "mase" in metrics:
+        scale = get_mase_scale(y_train, sp)
+    return score(to_matrix(y_true), y_pred, scale, metrics)
+
+
+def get_scores(
+    y_true: Data,
+    y_pred: Data,
+    y_train: Optional[Data] = None,
+    metrics: Sequence[str] = METRICS,
+) -> Dict[str, float]:
+    """Scores of a single forecast."""
+    scores = score_forecasts(y_true, [y_pred], y_train, metrics)
+    return {name: float(values[0]) for name, values in scores.items()}
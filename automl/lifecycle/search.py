@@ -0,0 +1,247 @@
+import logging
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from sklearn.model_selection import ParameterSampler
+
+logger = logging.getLogger(__name__)
+
+SEARCH_ALGORITHMS = ("random", "tpe")
+
+
+class Dimension:
+    """One entry of a model's ``hyper_parameters``.
+
+    Lists are categorical. Frozen scipy ``randint``/``uniform``/``loguniform``
+    distributions are numeric ranges, mapped to ``[0, 1]`` (on the log scale
+    for ``loguniform``) for the Parzen estimators. Any other distribution is
+    only sampled from.
+    """
+
+    def __init__(self, name: str, space: Any):
+        self.name = name
+        self.space = space
+        self.kind = "opaque"
+        if isinstance(space, (list, tuple)):
+            self.kind = "categorical"
+            self.choices = list(space)
+        elif hasattr(space, "dist") and space.dist.name in (
+            "randint",
+            "uniform",
+            "loguniform",
+            "reciprocal",
+        ):
+            low, high = space.support()
+            self.is_int = space.dist.name == "randint"
+            self.is_log = space.dist.name in ("loguniform", "reciprocal")
+            if self.is_log:
+                low, high = math.log(low), math.log(high)
+            if np.isfinite(low) and np.isfinite(high) and high >= low:
+                self.kind = "numeric"
+                self.low, self.high = low, high
+
+    def to_unit(self, value) -> float:
+        value = math.log(value) if self.is_log else float(value)
+        if self.high == self.low:
+            return 0.5
+        return (value - self.low) / (self.high - self.low)
+
+    def from_unit(self, unit: float):
+        value = self.low + float(np.clip(unit, 0.0, 1.0)) * (self.high - self.low)
+        if self.is_log:
+            value = math.exp(value)
+        if self.is_int:
+            return int(np.clip(round(value), self.low, self.high))
+        return value
+
+    def contains(self, value) -> bool:
+        if self.kind == "categorical":
+            return any(choice == value for choice in self.choices)
+        if self.kind == "numeric":
+            if self.is_int and float(value) != int(value):
+                return False
+            if self.is_log and value <= 0:
+                return False
+            return 0.0 <= self.to_unit(value) <= 1.0
+        return True
+
+    def choice_index(self, value) -> int:
+        for idx, choice in enumerate(self.choices):
+            if choice == value:
+                return idx
+        return 0
+
+
+class RandomSearcher:
+    """``ParameterSampler`` draws, the original search of the tuner."""
+
+    def __init__(
+        self, hyper_parameters: Dict[str, Any], n_iter: int, random_state: int = 80
+    ):
+        self.candidates = list(
+            ParameterSampler(hyper_parameters, n_iter=n_iter, random_state=random_state)
+        )
+        self.n_iter = len(self.candidates)
+        self.n_asked = 0
+        self.trials: List[Tuple[Dict[str, Any], float]] = []
+        self.dimensions = [
+            Dimension(name, space) for name, space in hyper_parameters.items()
+        ]
+
+    def is_valid(self, params: Dict[str, Any]) -> bool:
+        """Whether ``params`` sets exactly the searched parameters, each to a
+        value of its space."""
+        if set(params) != {dim.name for dim in self.dimensions}:
+            return False
+        return all(dim.contains(params[dim.name]) for dim in self.dimensions)
+
+    def warm_start(self, configs: List[Dict[str, Any]]):
+        """Evaluates ``configs`` first, in place of the first random draws;
+        configurations outside the current search space are ignored."""
+        seeds = [params for params in configs if self.is_valid(params)]
+        seeds = seeds[: self.n_iter - self.n_asked]
+        if seeds:
+            start = self.n_asked
+            rest = [params for params in self.candidates[start:] if params not in seeds]
+            self.candidates = self.candidates[:start] + seeds + rest
+            self.candidates = self.candidates[: self.n_iter]
+        return self
+
+    def is_done(self) -> bool:
+        return len(self.trials) >= self.n_iter
+
+    def get_batch_size(self, n_workers: int) -> int:
+        return self.n_iter
+
+    def ask(self, n_candidates: int) -> List[Dict[str, Any]]:
+        """Next candidates; asking again before ``tell`` never repeats one."""
+        start = self.n_asked
+        end = min(start + n_candidates, self.n_iter)
+        self.n_asked = max(start, end)
+        return self.candidates[start:end]
+
+    def tell(self, candidates: List[Dict[str, Any]], scores: List[float]):
+        self.trials.extend(zip(candidates, scores))
+        return self
+
+    def get_best(self) -> Tuple[Dict[str, Any], float]:
+        """Best finished trial, the default params scored ``inf`` when no
+        trial finished."""
+        scores = np.array([score for _, score in self.trials], dtype=float)
+        if not np.isfinite(scores).any():
+            return {}, np.inf
+        return self.trials[int(np.nanargmin(scores))]
+
+
+class TPESearcher(RandomSearcher):
+    """Tree-structured Parzen estimator search.
+
+    The first ``n_startup`` trials are the random search draws. Every later
+    candidate is drawn from Parzen estimators of the best ``gamma`` share of
+    the trials, scoring ``n_ei_candidates`` draws by the ratio of their
+    density under the good and the remaining trials. Dimensions are modelled
+    independently: truncated Gaussian kernels on the unit scale for numeric
+    ranges, smoothed frequencies for categorical lists.
+    """
+
+    def __init__(
+        self,
+        hyper_parameters: Dict[str, Any],
+        n_iter: int,
+        random_state: int = 80,
+        n_startup: Optional[int] = None,
+        gamma: float = 0.25,
+        n_ei_candidates: int = 24,
+    ):
+        super().__init__(hyper_parameters, n_iter, random_state)
+        self.n_startup = n_startup or min(self.n_iter, max(3, self.n_iter // 3))
+        self.gamma = gamma
+        self.n_ei_candidates = n_ei_candidates
+        self.rng = np.random.default_rng(random_state)
+
+    def get_batch_size(self, n_workers: int) -> int:
+        if len(self.trials) < self.n_startup:
+            return self.n_startup - len(self.trials)
+        return max(1, n_workers)
+
+    def ask(self, n_candidates: int) -> List[Dict[str, Any]]:
+        n_candidates = min(n_candidates, self.n_iter - self.n_asked)
+        if self.n_asked < self.n_startup:
+            return super().ask(min(n_candidates, self.n_startup - self.n_asked))
+        trials = [trial for trial in self.trials if np.isfinite(trial[1])]
+        if not trials:
+            return super().ask(n_candidates)
+        trials.sort(key=lambda trial: trial[1])
+        n_good = max(1, int(math.ceil(self.gamma * len(trials))))
+        good = [params for params, _ in trials[:n_good]]
+        bad = [params for params, _ in trials[n_good:]] or good
+        self.n_asked += max(0, n_candidates)
+        return [self.suggest(good, bad) for _ in range(n_candidates)]
+
+    def suggest(self, good: List[Dict], bad: List[Dict]) -> Dict[str, Any]:
+        candidates = [{} for _ in range(self.n_ei_candidates)]
+        log_ratio = np.zeros(len(candidates))
+        for dim in self.dimensions:
+            if dim.kind == "opaque":
+                for params in candidates:
+                    params[dim.name] = dim.space.rvs(random_state=self.rng)
+            elif dim.kind == "numeric":
+                good_units = np.array([dim.to_unit(p[dim.name]) for p in good])
+                bad_units = np.array([dim.to_unit(p[dim.name]) for p in bad])
+                units = self.sample_numeric(good_units, len(candidates))
+                log_ratio += self.log_density(units, good_units)
+                log_ratio -= self.log_density(units, bad_units)
+                for params, unit in zip(candidates, units):
+                    params[dim.name] = dim.from_unit(unit)
+            elif dim.kind == "categorical":
+                good_prob = self.categorical_prob(dim, good)
+                bad_prob = self.categorical_prob(dim, bad)
+                choices = self.rng.choice(
+                    len(dim.choices), size=len(candidates), p=good_prob
+                )
+                log_ratio += np.log(good_prob[choices]) - np.log(bad_prob[choices])
+                for params, choice in zip(candidates, choices):
+                    params[dim.name] = dim.choices[choice]
+        return candidates[int(np.argmax(log_ratio))]
+
+    @staticmethod
+    def bandwidth(points: np.ndarray) -> float:
+        n_points = len(points)
+        spread = np.std(points) if n_points > 1 else 0.5
+        return float(np.clip(spread * n_points ** (-1 / 5), 0.05, 1.0))
+
+    def sample_numeric(self, points: np.ndarray, n_samples: int) -> np.ndarray:
+        """Draws from the mixture of the kernels around ``points`` and the
+        uniform prior, the prior weighing as one kernel."""
+        sigma = self.bandwidth(points)
+        component = self.rng.integers(0, len(points) + 1, size=n_samples)
+        from_prior = component == len(points)
+        centers = points[np.minimum(component, len(points) - 1)]
+        samples = self.rng.normal(centers, sigma)
+        samples[from_prior] = self.rng.uniform(0, 1, size=from_prior.sum())
+        return np.clip(samples, 0.0, 1.0)
+
+    def log_density(self, units: np.ndarray, points: np.ndarray) -> np.ndarray:
+        sigma = self.bandwidth(points)
+        kernels = np.exp(-0.5 * ((units[:, None] - points[None, :]) / sigma) ** 2)
+        kernels /= sigma * math.sqrt(2 * math.pi)
+        density = (kernels.sum(axis=1) + 1.0) / (len(points) + 1)
+        return np.log(density)
+
+    @staticmethod
+    def categorical_prob(dim: Dimension, trials: List[Dict]) -> np.ndarray:
+        counts = np.ones(len(dim.choices))
+        for params in trials:
+            counts[dim.choice_index(params[dim.name])] += 1
+        return counts / counts.sum()
+
+
+def get_searcher(
+    algorithm: str, hyper_parameters: Dict[str, Any], n_iter: int, random_state=80
+) -> RandomSearcher:
+    if algorithm == "random":
+        return RandomSearcher(hyper_parameters, n_iter, random_state)
+    elif algorithm == "tpe":
+        return TPESearcher(hyper_parameters, n_iter, random_state)
+    raise ValueError(f"search_algorithm must be one of {SEARCH_ALGORITHMS}")
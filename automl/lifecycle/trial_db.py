@@ -0,0 +1,191 @@
+import json
+import logging
+import math
+import os
+import sqlite3
+import time
+from collections import defaultdict
+from contextlib import closing
+from typing import Any, Dict, List, Optional, Sequence
+
+from automl.stat.cache import to_builtin
+from automl.stat.statistics import SeriesStat
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS trials (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created REAL NOT NULL,
+    series_key TEXT NOT NULL,
+    model_name TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    frequency TEXT,
+    primary_seasonality INTEGER,
+    lower_d INTEGER,
+    stat TEXT,
+    params TEXT NOT NULL,
+    fold_scores TEXT,
+    score REAL,
+    fit_time REAL,
+    fidelity REAL NOT NULL DEFAULT 1.0
+);
+CREATE INDEX IF NOT EXISTS trials_similar ON trials (
+    model_name, metric, frequency, primary_seasonality, lower_d
+);
+"""
+
+COLUMNS = (
+    "created, series_key, model_name, metric, frequency, primary_seasonality, "
+    "lower_d, stat, params, fold_scores, score, fit_time, fidelity"
+)
+INSERT_TRIAL = (
+    f"INSERT INTO trials ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+def get_trial_db_path(model_dir: str) -> str:
+    return os.path.join(model_dir, "trials.sqlite")
+
+
+def dumps(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, default=to_builtin)
+
+
+class TrialDB:
+    """Every hyper parameter trial of every experiment, in a SQLite file.
+
+    A row holds the trial's params, per-fold scores, total fit time and
+    fidelity, next to the fingerprint of the series it was scored on and that
+    series' ``SeriesStat``. Series sharing the frequency, primary seasonality
+    and differencing order are "similar"; their best configurations seed the
+    search of a new experiment.
+
+    Trials are only written to ``path``; the databases of ``read_paths`` are
+    also searched for warm start configurations. Concurrent experiments each
+    write their own file, merged into the shared one afterwards with
+    ``merge``, so they never wait on each other's write locks.
+    """
+
+    def __init__(
+        self, path: str, timeout: float = 30.0, read_paths: Sequence[str] = ()
+    ):
+        self.path = path
+        self.timeout = timeout
+        self.read_paths = list(read_paths)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self, path: Optional[str] = None) -> sqlite3.Connection:
+        conn = sqlite3.connect(path or self.path, timeout=self.timeout)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def record(
+        self,
+        series_key: str,
+        model_name: str,
+        metric: str,
+        stat: Optional[SeriesStat],
+        trials: List[Dict[str, Any]],
+    ):
+        """Appends trials, each a dict of ``params``, ``fold_scores``,
+        ``fit_time`` and optionally ``fidelity``."""
+        stat_dict = stat.to_dict() if stat is not None else {}
+        rows = [
+            (
+                time.time(),
+                series_key,
+                model_name,
+                metric,
+                stat_dict.get("frequency"),
+                stat_dict.get("primary_seasonality"),
+                stat_dict.get("lower_d"),
+                dumps(stat_dict),
+                dumps(trial["params"]),
+                dumps(trial["fold_scores"]),
+                mean_score(trial["fold_scores"]),
+                float(trial["fit_time"]),
+                float(trial.get("fidelity", 1.0)),
+            )
+            for trial in trials
+        ]
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(INSERT_TRIAL, rows)
+        return self
+
+    def merge(self, path: str) -> int:
+        """Copies every trial of the database at ``path`` into this one,
+        returns the number of trials copied."""
+        if not os.path.isfile(path):
+            return 0
+        with closing(self._connect(path)) as source:
+            rows = source.execute(f"SELECT {COLUMNS} FROM trials").fetchall()
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(INSERT_TRIAL, rows)
+        return len(rows)
+
+    def get_warm_start(
+        self,
+        series_key: str,
+        model_name: str,
+        metric: str,
+        stat: SeriesStat,
+        n_configs: int,
+    ) -> List[Dict[str, Any]]:
+        """Best full fidelity configurations of ``model_name`` on similar
+        series other than ``series_key``.
+
+        Scores of different series are on different scales, so every series
+        ranks its own trials and a configuration is ordered by its best
+        relative rank over the series it was tried on.
+        """
+        if n_configs <= 0:
+            return []
+        rows = []
+        for path in [self.path, *self.read_paths]:
+            if not os.path.isfile(path):
+                continue
+            with closing(self._connect(path)) as conn:
+                rows += conn.execute(
+                    "SELECT series_key, params, score FROM trials "
+                    "WHERE model_name = ? AND metric = ? AND frequency IS ? "
+                    "AND primary_seasonality = ? AND lower_d = ? "
+                    "AND series_key != ? AND fidelity >= 1 "
+                    "AND score IS NOT NULL",
+                    (
+                        model_name,
+                        metric,
+                        stat.frequency,
+                        int(stat.primary_seasonality),
+                        int(stat.lower_d),
+                        series_key,
+                    ),
+                ).fetchall()
+        by_series = defaultdict(list)
+        for key, params, score in rows:
+            by_series[key].append((score, params))
+        best_rank: Dict[str, float] = {}
+        for scored in by_series.values():
+            scored.sort()
+            for rank, (_, params) in enumerate(scored):
+                relative = rank / len(scored)
+                best_rank[params] = min(best_rank.get(params, 1.0), relative)
+        ranked = sorted(best_rank, key=best_rank.get)[:n_configs]
+        if ranked:
+            logger.info(
+                f"Warm starting {model_name} with {len(ranked)} configurations "
+                f"of {len(by_series)} similar series"
+            )
+        return [json.loads(params) for params in ranked]
+
+
+def mean_score(fold_scores: List[float]) -> Optional[float]:
+    """Mean CV score, ``None`` for a trial that failed on any fold."""
+    scores = [float(score) for score in fold_scores]
+    if not scores or not all(math.isfinite(score) for score in scores):
+        return None
+    return sum(scores) / len(scores)
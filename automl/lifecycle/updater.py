@@ -0,0 +1,84 @@
+import logging
+import time
+from typing import Dict, Optional
+
+import pandas as pd
+
+from automl.lifecycle.panel import Data, n_timepoints, split_last
+
+logger = logging.getLogger(__name__)
+
+
+class ModelUpdater:
+    """Moves fitted tuned pipelines forward to new observations.
+
+    Every call appends the observations with ``update(update_params=False)``:
+    the imputers, scalers, deseasonalizer and detrender transform them with
+    their fitted parameters and the reducer's lag window moves to the new
+    cutoff, no estimator is refit. Once ``refit_interval`` observations were
+    added since a model's last fit, it is refit on the last ``refit_window``
+    observations it holds. With ``refit_window=None`` the window is the number
+    of observations the model was tuned on, so the history a model keeps stays
+    under that window plus ``refit_interval`` however long it is updated.
+    """
+
+    def __init__(self, refit_interval: int = 168, refit_window: Optional[int] = None):
+        self.refit_interval = refit_interval
+        self.refit_window = refit_window
+        self.n_updates: Dict[str, int] = {}
+        self.windows: Dict[str, int] = {}
+
+    def set_n_updates(self, model_name: str, n_updates: int):
+        self.n_updates[model_name] = n_updates
+        return self
+
+    def set_window(self, model_name: str, window: int):
+        self.windows[model_name] = window
+        return self
+
+    def get_window(self, model_name: str, model) -> int:
+        """``refit_window``, or the training length of the model's first fit."""
+        if self.refit_window is not None:
+            return self.refit_window
+        if model_name not in self.windows:
+            self.windows[model_name] = n_timepoints(model._y)
+        return self.windows[model_name]
+
+    def is_refit_due(self, model_name: str) -> bool:
+        return self.n_updates.get(model_name, 0) >= max(1, self.refit_interval)
+
+    def update(
+        self,
+        model_name: str,
+        model,
+        new_y: Data,
+        new_x: Optional[pd.DataFrame] = None,
+    ) -> bool:
+        """Updates ``model`` in place, returns whether it was refit."""
+        start = time.perf_counter()
+        window = self.get_window(model_name, model)
+        model.update(new_y, X=new_x, update_params=False)
+        n_updates = self.n_updates.get(model_name, 0) + n_timepoints(new_y)
+        self.n_updates[model_name] = n_updates
+        if not self.is_refit_due(model_name):
+            logger.info(
+                f"Updated {model_name} to {model.cutoff[0]} in "
+                f"{time.perf_counter() - start:.3f}s"
+            )
+            return False
+        self.refit(model, window)
+        self.n_updates[model_name] = 0
+        logger.info(
+            f"Refit {model_name} on {n_timepoints(model._y)} observations in "
+            f"{time.perf_counter() - start:.3f}s"
+        )
+        return True
+
+    def refit(self, model, window: int):
+        """Refits on the last ``window`` observations, which also drops the
+        older history the pipeline's steps hold."""
+        y, x = model._y, model._X
+        window = min(window, n_timepoints(y))
+        _, y = split_last(y, window)
+        _, x = split_last(x, window)
+        model.fit(y, X=x, fh=model.fh.to_relative(model.cutoff))
@@ -0,0 +1,202 @@
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, Future
+from dataclasses import dataclass
+from multiprocessing.connection import wait
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+class TrialTimeout(TimeoutError):
+    """A trial killed for running past its timeout or the run's deadline."""
+
+
+class TrialMemoryError(MemoryError):
+    """A trial killed for growing past its memory cap."""
+
+
+class WorkerDied(RuntimeError):
+    """A worker process that exited without returning a result."""
+
+
+def get_rss(pid: int) -> Optional[int]:
+    """Resident set size of a process in bytes, ``None`` without ``/proc``."""
+    try:
+        with open(f"/proc/{pid}/statm", "r") as statm:
+            return int(statm.read().split()[1]) * PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def _run_child(conn, fn, args, kwargs):
+    try:
+        conn.send(("ok", fn(*args, **kwargs)))
+    except BaseException as exc:
+        try:
+            conn.send(("error", exc))
+        except Exception:
+            conn.send(("error", RuntimeError(repr(exc))))
+    finally:
+        conn.close()
+
+
+def get_context():
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("fork" if "fork" in methods else None)
+
+
+class KillableExecutor(Executor):
+    """Executor running every task in its own process so it can be killed.
+
+    At most ``max_workers`` tasks run at once. A manager thread collects the
+    results and kills a task that runs longer than ``timeout`` seconds, whose
+    resident memory grows more than ``memory_mb`` above the parent's, or that
+    is still running at the ``deadline`` (a ``time.monotonic()`` value); its
+    future then raises ``TrialTimeout`` or ``TrialMemoryError``. Tasks still
+    queued at the deadline fail with ``TrialTimeout`` without starting.
+
+    With the fork start method the arguments are inherited, not pickled, so
+    handing a large ``FoldStore`` or forecaster to every task is cheap.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 1,
+        timeout: Optional[float] = None,
+        memory_mb: Optional[float] = None,
+        deadline: Optional[float] = None,
+        poll_interval: float = 0.05,
+    ):
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.memory_mb = memory_mb
+        self.deadline = deadline
+        self.poll_interval = poll_interval
+        self._context = get_context()
+        self._queue = deque()
+        self._running = {}
+        self._shutdown = False
+        self._wakeup = threading.Condition()
+        self._thread = threading.Thread(target=self._manage, daemon=True)
+        self._thread.start()
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        future = Future()
+        with self._wakeup:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new tasks after shutdown")
+            self._queue.append((future, fn, args, kwargs))
+            self._wakeup.notify()
+        return future
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False):
+        with self._wakeup:
+            self._shutdown = True
+            if cancel_futures:
+                while self._queue:
+                    self._queue.popleft()[0].cancel()
+            self._wakeup.notify()
+        if wait:
+            self._thread.join()
+
+    def _is_past_deadline(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def _start(self, future: Future, fn, args, kwargs):
+        if not future.set_running_or_notify_cancel():
+            return
+        if self._is_past_deadline():
+            future.set_exception(TrialTimeout("run deadline reached"))
+            return
+        parent_conn, child_conn = self._context.Pipe(duplex=False)
+        process = self._context.Process(
+            target=_run_child, args=(child_conn, fn, args, kwargs), daemon=True
+        )
+        process.start()
+        child_conn.close()
+        baseline = get_rss(os.getpid()) or 0
+        self._running[parent_conn] = (future, process, time.monotonic(), baseline)
+
+    def _collect(self, conn):
+        future, process, _, _ = self._running.pop(conn)
+        try:
+            status, value = conn.recv()
+        except (EOFError, OSError):
+            status = "error"
+            value = WorkerDied(f"worker exited with code {process.exitcode}")
+        conn.close()
+        process.join()
+        if status == "ok":
+            future.set_result(value)
+        else:
+            future.set_exception(value)
+
+    def _kill(self, conn, exc: BaseException):
+        future, process, _, _ = self._running.pop(conn)
+        process.kill()
+        process.join()
+        conn.close()
+        logger.warning(f"Killed worker {process.pid}: {exc}")
+        future.set_exception(exc)
+
+    def _enforce_limits(self):
+        now = time.monotonic()
+        for conn, (_, process, started, baseline) in list(self._running.items()):
+            if self._is_past_deadline():
+                self._kill(conn, TrialTimeout("run deadline reached"))
+            elif self.timeout is not None and now - started > self.timeout:
+                self._kill(conn, TrialTimeout(f"trial exceeded {self.timeout}s"))
+            elif self.memory_mb is not None:
+                rss = get_rss(process.pid)
+                if rss is not None and rss - baseline > self.memory_mb * 2**20:
+                    exc = TrialMemoryError(f"trial exceeded {self.memory_mb}MB")
+                    self._kill(conn, exc)
+
+    def _manage(self):
+        while True:
+            with self._wakeup:
+                while self._queue and len(self._running) < self.max_workers:
+                    self._start(*self._queue.popleft())
+                if self._shutdown and not self._queue and not self._running:
+                    return
+                if not self._running:
+                    self._wakeup.wait(self.poll_interval)
+                    continue
+            for conn in wait(list(self._running), timeout=self.poll_interval):
+                self._collect(conn)
+            self._enforce_limits()
+
+
+@dataclass(frozen=True)
+class Limits:
+    """Time and memory limits of the CV tasks of a run: a per-trial timeout in
+    seconds, a per-trial memory cap in MB and the run's ``time.monotonic()``
+    deadline."""
+
+    trial_timeout: Optional[float] = None
+    trial_memory_mb: Optional[float] = None
+    deadline: Optional[float] = None
+
+    def is_active(self) -> bool:
+        return any(
+            limit is not None
+            for limit in (self.trial_timeout, self.trial_memory_mb, self.deadline)
+        )
+
+    def is_expired(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def get_executor(self, max_workers: int) -> KillableExecutor:
+        return KillableExecutor(
+            max_workers,
+            timeout=self.trial_timeout,
+            memory_mb=self.trial_memory_mb,
+            deadline=self.deadline,
+        )
@@ -1,131 +1,538 @@
-from typing import Dict, List, Optional, Union
-
-from automl.models.basemodel import BaseModel, ModelID, ModelType
-from automl.models.ml_models.ada_boost import AdaBoostCCD, AdaBoostModel
-from automl.models.ml_models.bayesian_ridge import (BayesianRidgeCCD,
-                                                    BayesianRidgeModel)
-from automl.models.ml_models.catboost_model import CatBoostCCD, CatBoostModel
-from automl.models.ml_models.decision_tree import (DecisionTreeCCD,
-                                                   DecisionTreeModel)
-from automl.models.ml_models.elasticnet import ElasticNetCCD, ElasticNetModel
-from automl.models.ml_models.extratree_model import (ExtraTreesCCD,
-                                                     ExtraTreesModel)
-from automl.models.ml_models.grediant_boosting import (GradientBoostCCD,
-                                                       GradientBoostModel)
-from automl.models.ml_models.huberregressor import (HuberRegressorCCD,
-                                                    HuberRegressorModel)
-from automl.models.ml_models.knn_regressors import (KNeighborsCCD,
-                                                    KNeighborsModel)
-from automl.models.ml_models.lasso_model import LassoCCD, LassoModel
-from automl.models.ml_models.lassolars_model import (LassoLarsCCD,
-                                                     LassoLarsModel)
-from automl.models.ml_models.lightgbm_model import LightGBMCCD, LightGBMModel
-from automl.models.ml_models.linear_model import LinearModel, LinearModelCCD
-from automl.models.ml_models.random_forest import (RandomForestCCD,
-                                                   RandomForestModel)
-from automl.models.ml_models.ridge_model import RidgeCCD, RidgeModel
-from automl.models.ml_models.xgboost_model import XGBoostCCD, XGBoostModel
+import importlib
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from enum import IntEnum
+from importlib.metadata import entry_points
+from typing import Dict, List, Optional, Type, Union
+
+from automl.models.basemodel import BaseModel, FitCost, ModelID, ModelType
 from automl.stat.statistics import SeriesStat
 
+logger = logging.getLogger(__name__)
+
+MODELS_PACKAGE = "automl.models.ml_models"
+PLUGIN_GROUP = "automl.models"
+
+
+@dataclass(frozen=True)
+class ModelSpec:
+    """Registry entry of a model class: its metadata and where to import it
+    from. ``module`` is absolute, or relative to ``automl.models.ml_models``
+    when it starts with a dot. The model module is only imported by ``load``.
+
+    ``identifier`` is a ``ModelID``, or a member of a plugin's own ``IntEnum``
+    for models registered from outside the package. Model classes may set
+    ``_fit_cost``, the spec of a class without one gets ``FitCost.MEDIUM``.
+    """
+
+    identifier: IntEnum
+    mtype: ModelType
+    module: str
+    class_name: str
+    description: str
+    fit_cost: FitCost = FitCost.MEDIUM
+
+    @property
+    def name(self) -> str:
+        return self.identifier.name
+
+    def load(self) -> Type[BaseModel]:
+        module = importlib.import_module(self.module, MODELS_PACKAGE)
+        return getattr(module, self.class_name)
+
+    @classmethod
+    def from_class(cls, model: Type[BaseModel]) -> "ModelSpec":
+        return cls(
+            model._identifier,
+            model._mtype,
+            model.__module__,
+            model.__name__,
+            model._description,
+            getattr(model, "_fit_cost", FitCost.MEDIUM),
+        )
+
+    def create(self, stat: SeriesStat) -> BaseModel:
+        return self.load()(stat)
+
+
+class ModelHandle:
+    """A model selected for a series, constructed from its spec the first time
+    its ``forecaster`` or another model attribute is needed, so selecting and
+    ranking models imports and builds nothing."""
+
+    def __init__(self, spec: ModelSpec, stat: SeriesStat):
+        self.spec = spec
+        self.stat = stat
+        self._model = None
+
+    @property
+    def identifier(self) -> IntEnum:
+        return self.spec.identifier
+
+    @property
+    def name(self) -> str:
+        return self.spec.name
+
+    @property
+    def mtype(self) -> ModelType:
+        return self.spec.mtype
+
+    @property
+    def fit_cost(self) -> FitCost:
+        return self.spec.fit_cost
+
+    def get_model(self) -> BaseModel:
+        if self._model is None:
+            self._model = self.spec.create(self.stat)
+        return self._model
+
+    @property
+    def forecaster(self):
+        return self.get_model().forecaster
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.get_model(), name)
+
+    def __repr__(self) -> str:
+        return f"ModelHandle({self.name})"
+
+
+CCD = "Conditional Deseasonalizer Detrender"
+
 
 class ModelQuery:
+    """Registry of the models a run can select.
+
+    External packages add models with ``register_model``, either as a class
+    decorator or with a ``ModelSpec`` which defers the import until the model
+    is selected, or through an ``automl.models`` entry point naming a
+    ``ModelSpec`` or a ``BaseModel`` subclass::
+
+        [project.entry-points."automl.models"]
+        FastRegressor = "fast_models.specs:FAST_REGRESSOR"
+
+    Entry points are loaded once, on the first query. Queries are answered
+    from indexes by name, ``ModelType`` and ``FitCost`` built on the first
+    query after a registration, in registration order. Filters return
+    ``ModelHandle``s: a model's module is imported and the model constructed
+    only when its forecaster is needed.
+    """
+
+    _plugins_loaded = False
+    _index = None
     _model_list = [
-        LinearModel,
-        LinearModelCCD,
-        LassoModel,
-        LassoCCD,
-        LassoLarsModel,
-        LassoLarsCCD,
-        ElasticNetModel,
-        ElasticNetCCD,
-        RidgeModel,
-        RidgeCCD,
-        BayesianRidgeModel,
-        BayesianRidgeCCD,
-        HuberRegressorModel,
-        HuberRegressorCCD,
-        KNeighborsModel,
-        KNeighborsCCD,
-        DecisionTreeModel,
-        DecisionTreeCCD,
-        RandomForestModel,
-        RandomForestCCD,
-        XGBoostModel,
-        XGBoostCCD,
-        LightGBMModel,
-        LightGBMCCD,
-        CatBoostModel,
-        CatBoostCCD,
-        ExtraTreesModel,
-        ExtraTreesCCD,
-        GradientBoostModel,
-        GradientBoostCCD,
-        AdaBoostModel,
-        AdaBoostCCD,
+        ModelSpec(
+            ModelID.Linear,
+            ModelType.LINEAR_MODEL,
+            ".linear_model",
+            "LinearModel",
+            "Liner Model",
+            FitCost.LOW,
+        ),
+        ModelSpec(
+            ModelID.LinearCCD,
+            ModelType.LINEAR_MODEL,
+            ".linear_model",
+            "LinearModelCCD",
+            f"Liner Model {CCD}",
+            FitCost.LOW,
+        ),
+        ModelSpec(
+            ModelID.Lasso,
+            ModelType.LINEAR_MODEL,
+            ".lasso_model",
+            "LassoModel",
+            "Lasso Model",
+            FitCost.LOW,
+        ),
+        ModelSpec(
+            ModelID.LassoCCD,
+            ModelType.LINEAR_MODEL,
+            ".lasso_model",
+            "LassoCCD",
+            f"Lasso Model {CCD}",
+            FitCost.LOW,
+        ),
+        ModelSpec(
+            ModelID.LassoLars,
+            ModelType.LINEAR_MODEL,
+            ".lassolars_model",
+            "LassoLarsModel",
+            "LassoLars Model",
+            FitCost.LOW,
+        ),
+        ModelSpec(
+            ModelID.LassoLarsCCD,
+            ModelType.LINEAR_MODEL,
+            ".lassolars_model",
+            "LassoLarsCCD",
+            f"LassoLars Model {CCD}",
+            FitCost.LOW,
+        ),
+        ModelSpec(
+            ModelID.Elasticnet,
+            ModelType.LINEAR_MODEL,
+            ".elasticnet",
+            "ElasticNetModel",
+            "ElasticNet ",
+            FitCost.LOW,
+        ),
+        ModelSpec(
+            ModelID.ElasticnetCCD,
+            ModelType.LINEAR_MODEL,
+            ".elasticnet",
+            "ElasticNetCCD",
+            f"ElasticNet {CCD}",
+            FitCost.LOW,
+        ),
+        ModelSpec(
+            ModelID.Ridge,
+            ModelType.LINEAR_MODEL,
+            ".ridge_model",
+            "RidgeModel",
+            "Ridge Model",
+            FitCost.LOW,
+        ),
+        ModelSpec(
+            ModelID.RidgeCCD,
+            ModelType.LINEAR_MODEL,
+            ".ridge_model",
+            "RidgeCCD",
+            f"Ridge Model {CCD}",
+            FitCost.LOW,
+        ),
+        ModelSpec(
+            ModelID.BayesianRidge,
+            ModelType.LINEAR_MODEL,
+            ".bayesian_ridge",
+            "BayesianRidgeModel",
+            "Bayesian Ridge Regression",
+            FitCost.LOW,
+        ),
+        ModelSpec(
+            ModelID.BayesianRidgeCCD,
+            ModelType.LINEAR_MODEL,
+            ".bayesian_ridge",
+            "BayesianRidgeCCD",
+            f"Bayesian Ridge Regression {CCD}",
+            FitCost.LOW,
+        ),
+        ModelSpec(
+            ModelID.HuberRegressor,
+            ModelType.LINEAR_MODEL,
+            ".huberregressor",
+            "HuberRegressorModel",
+            "Huber Regressor",
+            FitCost.MEDIUM,
+        ),
+        ModelSpec(
+            ModelID.HuberRegressorCCD,
+            ModelType.LINEAR_MODEL,
+            ".huberregressor",
+            "HuberRegressorCCD",
+            f"Huber Regressor {CCD}",
+            FitCost.MEDIUM,
+        ),
+        ModelSpec(
+            ModelID.KNeighborsRegressor,
+            ModelType.DISTANCE_BASED_MODEL,
+            ".knn_regressors",
+            "KNeighborsModel",
+            "K-Nearest Neighbors Regressor",
+            FitCost.LOW,
+        ),
+        ModelSpec(
+            ModelID.KNeighborsRegressorCCD,
+            ModelType.DISTANCE_BASED_MODEL,
+            ".knn_regressors",
+            "KNeighborsCCD",
+            f"K-Nearest Neighbors Regressor {CCD}",
+            FitCost.LOW,
+        ),
+        ModelSpec(
+            ModelID.DecisionTree,
+            ModelType.TREE_BASED_MODEL,
+            ".decision_tree",
+            "DecisionTreeModel",
+            "Decision Tree Regressor",
+            FitCost.MEDIUM,
+        ),
+        ModelSpec(
+            ModelID.DecisionTreeCCD,
+            ModelType.TREE_BASED_MODEL,
+            ".decision_tree",
+            "DecisionTreeCCD",
+            f"Decision Tree Regressor {CCD}",
+            FitCost.MEDIUM,
+        ),
+        ModelSpec(
+            ModelID.RandomForest,
+            ModelType.TREE_BASED_MODEL,
+            ".random_forest",
+            "RandomForestModel",
+            "Random Forest Regressor",
+            FitCost.HIGH,
+        ),
+        ModelSpec(
+            ModelID.RandomForestCCD,
+            ModelType.TREE_BASED_MODEL,
+            ".random_forest",
+            "RandomForestCCD",
+            f"Random Forest Regressor {CCD}",
+            FitCost.HIGH,
+        ),
+        ModelSpec(
+            ModelID.XGBoost,
+            ModelType.BOOSTING_MODEL,
+            ".xgboost_model",
+            "XGBoostModel",
+            "XGBoost Regressor",
+            FitCost.HIGH,
+        ),
+        ModelSpec(
+            ModelID.XGBoostCCD,
+            ModelType.BOOSTING_MODEL,
+            ".xgboost_model",
+            "XGBoostCCD",
+            f"XGBoost Regressor {CCD}",
+            FitCost.HIGH,
+        ),
+        ModelSpec(
+            ModelID.LightGBM,
+            ModelType.BOOSTING_MODEL,
+            ".lightgbm_model",
+            "LightGBMModel",
+            "LightGBM Regressor",
+            FitCost.HIGH,
+        ),
+        ModelSpec(
+            ModelID.LightGBMCCD,
+            ModelType.BOOSTING_MODEL,
+            ".lightgbm_model",
+            "LightGBMCCD",
+            f"LightGBM Regressor {CCD}",
+            FitCost.HIGH,
+        ),
+        ModelSpec(
+            ModelID.CatBoost,
+            ModelType.BOOSTING_MODEL,
+            ".catboost_model",
+            "CatBoostModel",
+            "CatBoost Regressor",
+            FitCost.HIGH,
+        ),
+        ModelSpec(
+            ModelID.CatBoostCCD,
+            ModelType.BOOSTING_MODEL,
+            ".catboost_model",
+            "CatBoostCCD",
+            f"CatBoost Regressor {CCD}",
+            FitCost.HIGH,
+        ),
+        ModelSpec(
+            ModelID.ExtraTrees,
+            ModelType.TREE_BASED_MODEL,
+            ".extratree_model",
+            "ExtraTreesModel",
+            "Extra Trees Regressor",
+            FitCost.HIGH,
+        ),
+        ModelSpec(
+            ModelID.ExtraTreesCCD,
+            ModelType.TREE_BASED_MODEL,
+            ".extratree_model",
+            "ExtraTreesCCD",
+            f"Extra Trees Regressor {CCD}",
+            FitCost.HIGH,
+        ),
+        ModelSpec(
+            ModelID.GradientBoost,
+            ModelType.BOOSTING_MODEL,
+            ".grediant_boosting",
+            "GradientBoostModel",
+            "Gradient Boosting Regressor",
+            FitCost.HIGH,
+        ),
+        ModelSpec(
+            ModelID.GradientBoostCCD,
+            ModelType.BOOSTING_MODEL,
+            ".grediant_boosting",
+            "GradientBoostCCD",
+            f"Gradient Boosting Regressor {CCD}",
+            FitCost.HIGH,
+        ),
+        ModelSpec(
+            ModelID.AdaBoost,
+            ModelType.BOOSTING_MODEL,
+            ".ada_boost",
+            "AdaBoostModel",
+            "AdaBoost Regressor",
+            FitCost.HIGH,
+        ),
+        ModelSpec(
+            ModelID.AdaBoostCCD,
+            ModelType.BOOSTING_MODEL,
+            ".ada_boost",
+            "AdaBoostCCD",
+            f"AdaBoost Regressor {CCD}",
+            FitCost.HIGH,
+        ),
     ]
 
+    @classmethod
+    def register(cls, model: Union[ModelSpec, Type[BaseModel]]):
+        spec = model if isinstance(model, ModelSpec) else ModelSpec.from_class(model)
+        if spec in cls._model_list:
+            return model
+        if any(registered.name == spec.name for registered in cls._model_list):
+            raise ValueError(f"Model {spec.name} is already registered")
+        cls._model_list.append(spec)
+        cls._index = None
+        return model
+
+    @classmethod
+    def load_plugins(cls):
+        if cls._plugins_loaded:
+            return
+        cls._plugins_loaded = True
+        for entry_point in entry_points(group=PLUGIN_GROUP):
+            try:
+                cls.register(entry_point.load())
+            except Exception as exc:
+                logger.warning(f"Skipping model plugin {entry_point.name}: {exc}")
+
+    @classmethod
+    def get_index(cls) -> Dict[str, Dict]:
+        cls.load_plugins()
+        if cls._index is None:
+            index = {"name": {}, "mtype": defaultdict(list), "cost": defaultdict(list)}
+            for position, spec in enumerate(cls._model_list):
+                index["name"][spec.name] = (position, spec)
+                index["mtype"][spec.mtype].append((position, spec))
+                index["cost"][spec.fit_cost].append((position, spec))
+            cls._index = index
+        return cls._index
+
+    @classmethod
+    def get_model_specs(cls) -> List[ModelSpec]:
+        """Metadata of every registered model, no model module imported."""
+        cls.load_plugins()
+        return list(cls._model_list)
+
+    @classmethod
+    def get_spec(cls, model_id: str) -> Optional[ModelSpec]:
+        entry = cls.get_index()["name"].get(model_id)
+        return None if entry is None else entry[1]
+
+    @classmethod
+    def find_specs(
+        cls,
+        model_ids: Optional[List[str]] = None,
+        model_types: Optional[List[ModelType]] = None,
+        max_fit_cost: Optional[FitCost] = None,
+    ) -> List[ModelSpec]:
+        """Specs matching every given condition, in registration order."""
+        index = cls.get_index()
+        if max_fit_cost is not None:
+            max_fit_cost = get_fit_cost(max_fit_cost)
+        if model_ids is not None:
+            entries = [
+                index["name"][name] for name in model_ids if name in index["name"]
+            ]
+            if model_types is not None:
+                entries = [entry for entry in entries if entry[1].mtype in model_types]
+        elif model_types is not None:
+            entries = [
+                entry
+                for mtype in model_types
+                for entry in index["mtype"].get(mtype, [])
+            ]
+        elif max_fit_cost is not None:
+            entries = [
+                entry
+                for fit_cost in FitCost
+                if fit_cost <= max_fit_cost
+                for entry in index["cost"].get(fit_cost, [])
+            ]
+        else:
+            entries = list(index["name"].values())
+        if max_fit_cost is not None:
+            entries = [entry for entry in entries if entry[1].fit_cost <= max_fit_cost]
+        return [spec for _, spec in sorted(set(entries), key=lambda entry: entry[0])]
+
     @classmethod
     def filter_by_model_id(
         cls, stat: SeriesStat, model_id: Optional[Union[str, List[str]]] = None
-    ) -> List[BaseModel]:
+    ) -> List[ModelHandle]:
         if model_id is None:
-            return [model(stat) for model in cls._model_list]
+            specs = cls.find_specs()
         elif isinstance(model_id, str):
-            return [
-                model(stat)
-                for model in cls._model_list
-                if model.identifier.name == model_id
-            ]
+            specs = cls.find_specs([model_id])
         elif isinstance(model_id, list):
-            return [
-                model(stat)
-                for model in cls._model_list
-                if model.identifier.name in model_id
-            ]
+            specs = cls.find_specs(model_id)
         else:
             raise ValueError("Model Id not Valid")
+        return [ModelHandle(spec, stat) for spec in specs]
 
     @classmethod
     def filter_by_model_type(
         cls,
         stat: SeriesStat,
-        model_type: Optional[Union[ModelID, List[ModelType]]] = None,
-    ) -> List[BaseModel]:
+        model_type: Optional[Union[ModelType, List[ModelType]]] = None,
+    ) -> List[ModelHandle]:
         if model_type is None:
-            return [model(stat) for model in cls._model_list]
-        elif isinstance(model_type, str):
-            return [
-                model(stat) for model in cls._model_list if model.mtype == model_type
-            ]
+            specs = cls.find_specs()
+        elif isinstance(model_type, int):
+            specs = cls.find_specs(model_types=[model_type])
         elif isinstance(model_type, list):
-            return [model for model in cls._model_list if model.mtype in model_type]
+            specs = cls.find_specs(model_types=model_type)
         else:
             raise ValueError("Model Type is not Valid")
+        return [ModelHandle(spec, stat) for spec in specs]
+
+    @classmethod
+    def filter_by_fit_cost(
+        cls, stat: SeriesStat, max_fit_cost: Union[FitCost, int, str]
+    ) -> List[ModelHandle]:
+        """Models whose fit cost is at most ``max_fit_cost``."""
+        specs = cls.find_specs(max_fit_cost=max_fit_cost)
+        return [ModelHandle(spec, stat) for spec in specs]
 
     @classmethod
     def get_model_object_by_ID(
-        cls, stat: SeriesStat, model_id: ModelID
+        cls, stat: SeriesStat, model_id: str
     ) -> Optional[BaseModel]:
-        for model in cls._model_list:
-            if model.identifier.name == model_id:
-                return model(stat)
-        return None
+        spec = cls.get_spec(model_id)
+        return None if spec is None else spec.create(stat)
 
     @classmethod
-    def select_model_object(cls, stat: SeriesStat, filter: Dict) -> List[BaseModel]:
+    def select_model_object(cls, stat: SeriesStat, filter: Dict) -> List[ModelHandle]:
+        """Models of a run's ``filter``: "ModelType" or "ModelId", either one
+        value or a list, optionally narrowed by "MaxFitCost". The models are
+        only constructed once their forecaster is needed."""
+        filter = filter or {}
+        model_ids, model_types = None, None
         if "ModelType" in filter.keys():
             model_types = (
                 filter["ModelType"]
                 if isinstance(filter["ModelType"], list)
                 else [filter["ModelType"]]
             )
-            return cls.filter_by_model_type(stat, model_types)
         elif "ModelId" in filter.keys():
             model_ids = (
                 filter["ModelId"]
                 if isinstance(filter["ModelId"], list)
                 else [filter["ModelId"]]
             )
-            return cls.filter_by_model_id(stat, model_ids)
-        else:
-            return cls.filter_by_model_id(stat)
+        specs = cls.find_specs(model_ids, model_types, filter.get("MaxFitCost"))
+        return [ModelHandle(spec, stat) for spec in specs]
+
+
+def get_fit_cost(fit_cost: Union[FitCost, int, str]) -> FitCost:
+    return FitCost[fit_cost] if isinstance(fit_cost, str) else FitCost(fit_cost)
+
+
+register_model = ModelQuery.register
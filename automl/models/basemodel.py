@@ -12,6 +12,15 @@ class ModelType(IntEnum):
     DL_MODEL = 7
 
 
+@unique
+class FitCost(IntEnum):
+    """Rough cost of fitting a model, for filtering runs to cheap models."""
+
+    LOW = 1
+    MEDIUM = 2
+    HIGH = 3
+
+
 @unique
 class ModelID(IntEnum):
     Linear = 1
@@ -1,10 +1,9 @@
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, List
 
-from sklearn.preprocessing import MinMaxScaler
+from sklearn.preprocessing import MinMaxScaler, StandardScaler
 from sktime.forecasting.compose import (ForecastingPipeline,
-                                        TransformedTargetForecaster,
-                                        make_reduction)
+                                        TransformedTargetForecaster)
 from sktime.forecasting.trend import PolynomialTrendForecaster
 from sktime.transformations.compose import OptionalPassthrough
 from sktime.transformations.series.adapt import TabularToSeriesAdaptor
@@ -14,17 +13,23 @@ from sktime.transformations.series.impute import Imputer
 
 from automl.models.ml_models.customized.dummyforecaster import DummyForecaster
 from automl.models.ml_models.customized.inputguard import ColumnsGuard
+from automl.models.ml_models.customized.reducer import LagReducer
+from automl.resources import available_cpus
 from automl.stat.statistics import SeriesStat
 
 logger = logging.getLogger(__name__)
 
 
 class MLPipleline:
+    strategy: str = "recursive"
+    reduction_strategies: List[str] = ["recursive", "direct", "multioutput"]
+
     def __init__(self, stat: SeriesStat) -> None:
         super().__init__()
         self.sp = stat.primary_seasonality
         self.strictly_positive = stat.is_strickly_positive
         self.has_exogeneous_data = stat.has_exogenous_data
+        self.is_panel = stat.n_series > 1
 
     @property
     def forecaster(self) -> ForecastingPipeline:
@@ -36,17 +41,20 @@ class MLPipleline:
             return forecaster.set_params(reducer__estimator=regressor)
 
     def find_regressor_config(self, regressor) -> Dict[str, Any]:
+        """Common constructor args; estimator threads take every CPU of the
+        process budget, the evaluator lowering them for parallel CV tasks."""
+        n_threads = available_cpus()
         regressor_args = dict()
         if hasattr(regressor, "n_jobs"):
-            regressor_args["n_jobs"] = -1
+            regressor_args["n_jobs"] = n_threads
         if hasattr(regressor, "random_state"):
             regressor_args["random_state"] = 80
         if hasattr(regressor, "seed"):
             regressor_args["seed"] = 80
         if hasattr(regressor, "verbose"):
-            regressor["verbose"] = 0
+            regressor_args["verbose"] = 0
         if hasattr(regressor, "thread_count"):
-            regressor_args["thread_count"] = 9
+            regressor_args["thread_count"] = n_threads
         if hasattr(regressor, "task_type"):
             regressor_args["task_type"] = "CPU"
         if hasattr(regressor, "border_count"):
@@ -76,14 +84,20 @@ class MLPipelineSimple(MLPipleline):
                     TransformedTargetForecaster(
                         steps=[
                             ("imputer_y", Imputer(method="ffill", random_state=80)),
+                            (
+                                "scaler_y",
+                                OptionalPassthrough(
+                                    TabularToSeriesAdaptor(StandardScaler()),
+                                    passthrough=not self.is_panel,
+                                ),
+                            ),
                             (
                                 "reducer",
-                                make_reduction(
+                                LagReducer(
                                     estimator=DummyForecaster(),
-                                    scitype="tabular-regressor",
                                     window_length=self.sp,
-                                    strategy="recursive",
-                                    pooling="global",
+                                    strategy=self.strategy,
+                                    instance_features=self.is_panel,
                                 ),
                             ),
                         ]
@@ -125,14 +139,20 @@ class MLPipelineCCD(MLPipleline):
                                     forecaster=PolynomialTrendForecaster(degree=1)
                                 ),
                             ),
+                            (
+                                "scaler_y",
+                                OptionalPassthrough(
+                                    TabularToSeriesAdaptor(StandardScaler()),
+                                    passthrough=not self.is_panel,
+                                ),
+                            ),
                             (
                                 "reducer",
-                                make_reduction(
+                                LagReducer(
                                     estimator=DummyForecaster(),
-                                    scitype="tabular-regressor",
                                     window_length=self.sp,
-                                    strategy="recursive",
-                                    pooling="global",
+                                    strategy=self.strategy,
+                                    instance_features=self.is_panel,
                                 ),
                             ),
                         ]
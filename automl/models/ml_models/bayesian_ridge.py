@@ -18,6 +18,7 @@ class BayesianRidgeModel(MLPipelineSimple, BaseModel):
         param_grid = {
             "scaler_x__passthrough": [True, False],
             "forecaster__reducer__window_length": randint(self.sp, 2 * self.sp),
+            "forecaster__reducer__strategy": self.reduction_strategies,
             "forecaster__reducer__estimator__alpha_1": uniform(0, 1),
             "forecaster__reducer__estimator__alpha_2": uniform(0, 1),
             "forecaster__reducer__estimator__lambda_1": uniform(0, 1),
@@ -51,6 +52,7 @@ class BayesianRidgeCCD(MLPipelineCCD, BaseModel):
             "forecaster__deseasonalizer__model": deseasonal_type,
             "forecaster__detrender__forecaster__degree": randint(1, 10),
             "forecaster__reducer__window_length": randint(self.sp, 2 * self.sp),
+            "forecaster__reducer__strategy": self.reduction_strategies,
             "forecaster__reducer__estimator__alpha_1": uniform(0, 1),
             "forecaster__reducer__estimator__alpha_2": uniform(0, 1),
             "forecaster__reducer__estimator__lambda_1": uniform(0, 1),
@@ -20,6 +20,7 @@ class CatBoostModel(MLPipelineSimple, BaseModel):
         param_grid = {
             "scaler_x__passthrough": [True, False],
             "forecaster__reducer__window_length": randint(self.sp, 2 * self.sp),
+            "forecaster__reducer__strategy": self.reduction_strategies,
             "forecaster__reducer__estimator__eta": uniform(0.000001, 0.5),
             "forecaster__reducer__estimator__n_estimators": randint(10, 30),
             "forecaster__reducer__estimator__depth": randint(1, 11),
@@ -53,6 +54,7 @@ class CatBoostCCD(MLPipelineCCD, BaseModel):
             "forecaster__deseasonalizer__model": deseasonal_type,
             "forecaster__detrender__forecaster__degree": randint(1, 10),
             "forecaster__reducer__window_length": randint(self.sp, 2 * self.sp),
+            "forecaster__reducer__strategy": self.reduction_strategies,
             "forecaster__reducer__estimator__eta": uniform(0.000001, 0.5),
             "forecaster__reducer__estimator__n_estimators": randint(10, 30),
             "forecaster__reducer__estimator__depth": randint(1, 11),
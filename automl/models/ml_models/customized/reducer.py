@@ -0,0 +1,385 @@
+from typing import List, Sequence
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from numpy.lib.stride_tricks import sliding_window_view
+from sklearn.base import clone
+from sklearn.multioutput import MultiOutputRegressor
+from sktime.datatypes import convert_to
+from sktime.forecasting.base import BaseForecaster, ForecastingHorizon
+
+STRATEGIES = ("recursive", "direct", "multioutput")
+
+
+def design_matrix(
+    y: np.ndarray,
+    window_length: int,
+    X: np.ndarray = None,
+    horizons: Sequence[int] = (1,),
+    max_horizon: int = None,
+    out: np.ndarray = None,
+):
+    """Lag features of every forecast origin and their targets.
+
+    Row ``t`` holds lags ``1 .. window_length`` of the origin (a strided view
+    of ``y``) followed by the exogenous columns at each target time of
+    ``horizons``. Only origins with all ``max_horizon`` targets observed are
+    kept, so every horizon is fit on the same rows. Everything is written into
+    a single pre-allocated array (``out`` when given), the only copy of the
+    data made during fit.
+    """
+    max_horizon = max(horizons) if max_horizon is None else max_horizon
+    n_origins = len(y) - window_length - max_horizon + 1
+    n_exog = 0 if X is None else X.shape[1]
+    if out is None:
+        n_features = window_length + len(horizons) * n_exog
+        out = np.empty((n_origins, n_features), dtype=np.float64)
+    out[:, :window_length] = sliding_window_view(y, window_length)[:n_origins, ::-1]
+    if X is not None:
+        for idx, horizon in enumerate(horizons):
+            start = window_length + idx * n_exog
+            end = start + n_exog
+            first = window_length - 1 + horizon
+            last = first + n_origins
+            out[:, start:end] = X[first:last]
+    targets = sliding_window_view(y[window_length:], max_horizon)[:n_origins]
+    return out, targets[:, np.asarray(horizons) - 1]
+
+
+def stack_design(instances, window_length: int, horizons, max_horizon: int):
+    """Design matrix of all pooled instances written into one array."""
+    n_rows = [len(y) - window_length - max_horizon + 1 for y, _ in instances]
+    X_first = instances[0][1]
+    n_exog = 0 if X_first is None else X_first.shape[1]
+    n_features = window_length + len(horizons) * n_exog
+    Xt = np.empty((sum(n_rows), n_features), dtype=np.float64)
+    yt = np.empty((sum(n_rows), len(horizons)), dtype=np.float64)
+    start = 0
+    for (y_values, X_values), rows in zip(instances, n_rows):
+        end = start + rows
+        _, yt[start:end] = design_matrix(
+            y_values,
+            window_length,
+            X_values,
+            horizons=horizons,
+            max_horizon=max_horizon,
+            out=Xt[start:end],
+        )
+        start = end
+    return Xt, yt
+
+
+def fit_horizon(estimator, instances, window_length: int, horizon: int, max_horizon):
+    Xt, yt = stack_design(instances, window_length, [horizon], max_horizon)
+    return estimator.fit(Xt, yt.ravel())
+
+
+def recursive_predict(
+    estimator, windows: np.ndarray, n_steps: int, X_future: np.ndarray = None
+) -> np.ndarray:
+    """Recursive multi-step prediction of several contexts at once.
+
+    ``windows`` holds the last ``window_length`` observations of every context
+    (oldest first) and ``X_future`` the exogenous rows of the predicted steps,
+    shaped ``(n_contexts, n_steps, n_exog)``. All contexts share the fitted
+    estimator and advance together, one ``predict`` call on the stacked feature
+    matrix per step. Returns an ``(n_contexts, n_steps)`` array.
+    """
+    n_contexts, window_length = windows.shape
+    n_exog = 0 if X_future is None else X_future.shape[2]
+    buffer = np.empty((n_contexts, window_length + n_steps), dtype=np.float64)
+    buffer[:, :window_length] = windows
+    rows = np.empty((n_contexts, window_length + n_exog), dtype=np.float64)
+    for step in range(n_steps):
+        end = step + window_length
+        rows[:, :window_length] = buffer[:, step:end][:, ::-1]
+        if X_future is not None:
+            rows[:, window_length:] = X_future[:, step]
+        buffer[:, end] = np.ravel(estimator.predict(rows))
+    return buffer[:, window_length:]
+
+
+def direct_predict(
+    estimators: List, windows: np.ndarray, horizons: List[int], X_future=None
+) -> np.ndarray:
+    """One independent ``predict`` per requested horizon, all contexts at once.
+    Returns an ``(n_contexts, len(horizons))`` array."""
+    n_contexts, window_length = windows.shape
+    n_exog = 0 if X_future is None else X_future.shape[2]
+    rows = np.empty((n_contexts, window_length + n_exog), dtype=np.float64)
+    rows[:, :window_length] = windows[:, ::-1]
+    y_pred = np.empty((n_contexts, len(horizons)), dtype=np.float64)
+    for idx, horizon in enumerate(horizons):
+        if X_future is not None:
+            rows[:, window_length:] = X_future[:, horizon - 1]
+        y_pred[:, idx] = np.ravel(estimators[horizon - 1].predict(rows))
+    return y_pred
+
+
+def multioutput_predict(estimator, windows: np.ndarray, X_future=None) -> np.ndarray:
+    """Single ``predict`` of every step, the exogenous rows of all steps being
+    flattened into the features. Returns an ``(n_contexts, n_steps)`` array."""
+    n_contexts = windows.shape[0]
+    rows = windows[:, ::-1]
+    if X_future is not None:
+        rows = np.concatenate([rows, X_future.reshape(n_contexts, -1)], axis=1)
+    return np.asarray(estimator.predict(rows)).reshape(n_contexts, -1)
+
+
+def supports_multioutput(estimator) -> bool:
+    if hasattr(estimator, "_get_tags"):
+        return bool(estimator._get_tags().get("multioutput", False))
+    return False
+
+
+def with_instance_features(X_values, position, n_instances: int, n_rows: int):
+    """Appends the one-hot code of the instance at ``position`` as constant
+    exogenous columns, all zeros for an instance not seen in fit."""
+    one_hot = np.zeros((n_rows, n_instances), dtype=np.float64)
+    if position is not None:
+        one_hot[:, position] = 1.0
+    return one_hot if X_values is None else np.hstack([X_values, one_hot])
+
+
+def infer_freq(index: pd.Index):
+    if isinstance(index, (pd.DatetimeIndex, pd.PeriodIndex)):
+        return index.freq or pd.infer_freq(index)
+    return None
+
+
+def split_instances(data):
+    """Splits a pd-multiindex panel into ``(instance, series)`` pairs; a plain
+    series is a single ``None`` instance."""
+    if data is None or not isinstance(data.index, pd.MultiIndex):
+        return [(None, data)]
+    return [
+        (key, group.droplevel(0)) for key, group in data.groupby(level=0, sort=False)
+    ]
+
+
+class LagReducer(BaseForecaster):
+    """Reduction of forecasting to tabular regression.
+
+    Replacement of sktime ``make_reduction(pooling="global")`` taking the
+    same ``reducer__window_length`` and ``reducer__estimator__*`` parameters.
+    Features are lags ``1 .. window_length`` of the target, most recent lag
+    first (sktime puts the oldest lag first), followed by the exogenous
+    columns at the target time. The column order only matters to estimators
+    that are not invariant to it, e.g. when reading feature importances.
+
+    ``strategy`` selects how the horizon is covered:
+
+    - ``"recursive"``: one one-step model fed back its own predictions, the
+      forecasts of sktime's recursive reducer,
+    - ``"direct"``: one model per horizon step, fit in parallel over
+      ``n_jobs`` workers on the origins whose whole horizon is observed. This
+      is the textbook direct reduction (and sktime's local one); sktime's
+      global direct reducer forecasts differently,
+    - ``"multioutput"``: one model predicting every step in a single pass.
+      Without exogenous data it forecasts as sktime's multioutput reducer;
+      with it, the exogenous rows of all steps are flattened into the
+      features, where sktime uses their lagged values over the window.
+      Estimators without native multi-output support are wrapped in
+      ``MultiOutputRegressor``.
+
+    ``direct`` and ``multioutput`` require ``fh`` in fit.
+
+    Panels (pd-multiindex) are pooled globally: one estimator is fit on the
+    stacked lag matrices of all instances and every instance is predicted by
+    the same batched pass. With ``instance_features`` the one-hot code of the
+    instance is appended to the features so the pooled model can tell the
+    series apart.
+    """
+
+    _tags = {
+        "scitype:y": "univariate",
+        "ignores-exogeneous-X": False,
+        "handles-missing-data": False,
+        "y_inner_mtype": ["pd.Series", "pd-multiindex"],
+        "X_inner_mtype": ["pd.DataFrame", "pd-multiindex"],
+        "requires-fh-in-fit": False,
+        "X-y-must-have-same-index": True,
+        "enforce-index-type": None,
+        "capability:pred_int": False,
+    }
+
+    def __init__(
+        self,
+        estimator,
+        window_length: int = 10,
+        strategy: str = "recursive",
+        n_jobs: int = 1,
+        instance_features: bool = False,
+    ):
+        self.estimator = estimator
+        self.window_length = window_length
+        self.strategy = strategy
+        self.n_jobs = n_jobs
+        self.instance_features = instance_features
+        super(LagReducer, self).__init__()
+        if strategy not in STRATEGIES:
+            raise ValueError(f"strategy must be one of {STRATEGIES}, got {strategy}")
+        self.set_tags(**{"requires-fh-in-fit": strategy != "recursive"})
+
+    def _fit(self, y, X=None, fh=None):
+        self.window_length_ = int(self.window_length)
+        self._freq = infer_freq(split_instances(y)[0][1].index)
+        self.max_horizon_ = 1
+        if self.strategy != "recursive":
+            if not fh.is_all_out_of_sample(self.cutoff):
+                raise NotImplementedError("In-sample predictions are not implemented")
+            self.max_horizon_ = int(fh.to_relative(self.cutoff)[-1])
+
+        instances = []
+        X_instances = dict(split_instances(X))
+        y_instances = split_instances(y)
+        self.instances_ = []
+        if self.instance_features and y_instances[0][0] is not None:
+            self.instances_ = [key for key, _ in y_instances]
+        for key, y_inst in y_instances:
+            X_inst = X_instances.get(key)
+            if self.window_length_ + self.max_horizon_ > len(y_inst):
+                raise ValueError(
+                    f"window_length {self.window_length_} plus horizon "
+                    f"{self.max_horizon_} exceeds the length of y {len(y_inst)}"
+                )
+            y_values = y_inst.to_numpy(dtype=np.float64).ravel()
+            X_values = None if X is None else X_inst.to_numpy(dtype=np.float64)
+            X_values = self._add_instance_features(X_values, key, len(y_values))
+            instances.append((y_values, X_values))
+
+        horizons = list(range(1, self.max_horizon_ + 1))
+        if self.strategy == "direct":
+            self.estimators_ = Parallel(n_jobs=self.n_jobs)(
+                delayed(fit_horizon)(
+                    clone(self.estimator),
+                    instances,
+                    self.window_length_,
+                    horizon,
+                    self.max_horizon_,
+                )
+                for horizon in horizons
+            )
+            return self
+        Xt, yt = stack_design(instances, self.window_length_, horizons, len(horizons))
+        self.estimator_ = clone(self.estimator)
+        if self.strategy == "recursive":
+            yt = yt.ravel()
+        elif not supports_multioutput(self.estimator_):
+            self.estimator_ = MultiOutputRegressor(self.estimator_, n_jobs=self.n_jobs)
+        self.estimator_.fit(Xt, yt)
+        return self
+
+    def _predict(self, fh, X=None):
+        steps, fh_idx = self._get_steps(fh)
+        index = steps.to_absolute_index(self.cutoff)
+        y_instances = split_instances(self._y)
+        keys = [key for key, _ in y_instances]
+        windows = np.stack([self._get_window(y_inst) for _, y_inst in y_instances])
+        X_future = self._get_future_rows(X, keys, index)
+        y_pred = self._predict_rows(fh, windows, X_future)
+
+        if keys == [None]:
+            y_pred = pd.Series(y_pred[0], index=index, name=self._y.name)
+            return y_pred.iloc[fh_idx]
+        pred_index = pd.MultiIndex.from_tuples(
+            [(key, time) for key in keys for time in index[fh_idx]],
+            names=self._y.index.names,
+        )
+        return pd.DataFrame(
+            y_pred[:, fh_idx].ravel(), index=pred_index, columns=self._y.columns
+        )
+
+    def predict_contexts(self, fh, X_list: List[pd.DataFrame]) -> List[pd.Series]:
+        """Forecasts of the fitted series under every exogenous future of
+        ``X_list``, equal to ``predict(fh, X)`` for each ``X``. All contexts
+        share the lag window and advance together in one batched pass."""
+        self.check_is_fitted()
+        if isinstance(self._y.index, pd.MultiIndex) or not X_list:
+            return [self.predict(fh=fh, X=X) for X in X_list]
+        fh = self._check_fh(fh)
+        steps, fh_idx = self._get_steps(fh)
+        index = steps.to_absolute_index(self.cutoff)
+        window = self._get_window(self._y)
+        windows = np.repeat(window[np.newaxis], len(X_list), axis=0)
+        X_rows = [
+            self._get_future_rows(self._check_X(X=X), [None], index) for X in X_list
+        ]
+        X_future = None if X_rows[0] is None else np.concatenate(X_rows)
+        y_pred = self._predict_rows(fh, windows, X_future)
+        return [
+            convert_to(
+                pd.Series(values, index=index, name=self._y.name).iloc[fh_idx],
+                self._y_mtype_last_seen,
+                store=self._converter_store_y,
+                store_behaviour="freeze",
+            )
+            for values in y_pred
+        ]
+
+    def _get_steps(self, fh):
+        """Every relative step up to the last one needed, and the positions of
+        the requested steps among them."""
+        if not fh.is_all_out_of_sample(self.cutoff):
+            raise NotImplementedError("In-sample predictions are not implemented")
+        n_steps = int(fh.to_relative(self.cutoff)[-1])
+        if self.strategy == "multioutput":
+            n_steps = self.max_horizon_
+        steps = ForecastingHorizon(
+            np.arange(1, n_steps + 1), is_relative=True, freq=fh.freq or self._freq
+        )
+        return steps, fh.to_indexer(self.cutoff)
+
+    def _get_window(self, y_inst) -> np.ndarray:
+        start = -self.window_length_
+        return y_inst.to_numpy(dtype=np.float64).ravel()[start:]
+
+    def _get_future_rows(self, X, keys, index):
+        """Exogenous rows of the predicted steps of every instance of ``keys``,
+        shaped ``(n_instances, n_steps, n_exog)``."""
+        if X is None and not self.instances_:
+            return None
+        X_instances = dict(split_instances(X))
+        X_rows = []
+        for key in keys:
+            X_values = None
+            if X is not None:
+                X_values = X_instances[key].loc[index].to_numpy(dtype=np.float64)
+            X_rows.append(self._add_instance_features(X_values, key, len(index)))
+        return np.stack(X_rows)
+
+    def _predict_rows(self, fh, windows, X_future) -> np.ndarray:
+        fh_relative = fh.to_relative(self.cutoff)
+        n_steps = int(fh_relative[-1])
+        if self.strategy == "recursive":
+            return recursive_predict(self.estimator_, windows, n_steps, X_future)
+        if self.strategy == "direct":
+            horizons = [int(step) for step in fh_relative]
+            y_pred = np.empty((len(windows), n_steps), dtype=np.float64)
+            y_pred[:, fh.to_indexer(self.cutoff)] = direct_predict(
+                self.estimators_, windows, horizons, X_future
+            )
+            return y_pred
+        return multioutput_predict(self.estimator_, windows, X_future)
+
+    def _add_instance_features(self, X_values, key, n_rows: int):
+        if not self.instances_:
+            return X_values
+        position = self.instances_.index(key) if key in self.instances_ else None
+        return with_instance_features(X_values, position, len(self.instances_), n_rows)
+
+    @classmethod
+    def get_test_params(cls, parameter_set="default"):
+        from sklearn.linear_model import LinearRegression
+
+        params = [
+            {"estimator": LinearRegression(), "window_length": 3},
+            {"estimator": LinearRegression(), "window_length": 3, "strategy": "direct"},
+            {
+                "estimator": LinearRegression(),
+                "window_length": 3,
+                "strategy": "multioutput",
+            },
+        ]
+        return params
@@ -20,6 +20,7 @@ class DecisionTreeModel(MLPipelineSimple, BaseModel):
         param_grid = {
             "scaler_x__passthrough": [True, False],
             "forecaster__reducer__window_length": randint(self.sp, 2 * self.sp),
+            "forecaster__reducer__strategy": self.reduction_strategies,
             "forecaster__reducer__estimator__criterion": [
                 "mse",
                 "friedman_mse",
@@ -59,6 +60,7 @@ class DecisionTreeCCD(MLPipelineCCD, BaseModel):
             "forecaster__deseasonalizer__model": deseasonal_type,
             "forecaster__detrender__forecaster__degree": randint(1, 10),
             "forecaster__reducer__window_length": randint(self.sp, 2 * self.sp),
+            "forecaster__reducer__strategy": self.reduction_strategies,
             "forecaster__reducer__estimator__criterion": [
                 "mse",
                 "friedman_mse",
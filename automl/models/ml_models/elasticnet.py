@@ -29,6 +29,7 @@ class ElasticNetModel(MLPipelineSimple, BaseModel, ElasticNet):
         param_grid = {
             "scaler_x__passthrough": [True, False],
             "forecaster__reducer__window_length": randint(self.sp, 2 * self.sp),
+            "forecaster__reducer__strategy": self.reduction_strategies,
             "forecaster__reducer__estimator__alpha": uniform(0, 1),
             "forecaster__reducer__estimator__l1_ratio": uniform(0.01, 0.9999999999),
             "forecaster__reducer__estimator__max_iter": [10000],
@@ -56,6 +57,7 @@ class ElasticNetCCD(MLPipelineCCD, BaseModel, ElasticNet):
             # "forecaster__deseasonalizer__sp": [self.sp, 2 * self.sp],
             "forecaster__detrender__forecaster__degree": randint(1, 10),
             "forecaster__reducer__window_length": randint(self.sp, 2 * self.sp),
+            "forecaster__reducer__strategy": self.reduction_strategies,
             "forecaster__reducer__estimator__alpha": uniform(0, 1),
             "forecaster__reducer__estimator__l1_ratio": uniform(0.01, 0.9999999999),
             "forecaster__reducer__estimator__max_iter": [10000],
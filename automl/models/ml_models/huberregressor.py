@@ -20,6 +20,7 @@ class HuberRegressorModel(MLPipelineSimple, BaseModel):
         param_grid = {
             "scaler_x__passthrough": [True, False],
             "forecaster__reducer__window_length": randint(self.sp, 2 * self.sp),
+            "forecaster__reducer__strategy": self.reduction_strategies,
             "forecaster__reducer__estimator__epsilon": uniform(1.1, 2.0),
             "forecaster__reducer__estimator__max_iter": [100],
             "forecaster__reducer__estimator__alpha": uniform(0, 1),
@@ -52,6 +53,7 @@ class HuberRegressorCCD(MLPipelineCCD, BaseModel):
             "forecaster__deseasonalizer__model": deseasonal_type,
             "forecaster__detrender__forecaster__degree": randint(1, 10),
             "forecaster__reducer__window_length": randint(self.sp, 2 * self.sp),
+            "forecaster__reducer__strategy": self.reduction_strategies,
             "forecaster__reducer__estimator__epsilon": uniform(1.1, 2.0),
             "forecaster__reducer__estimator__max_iter": [100],
             "forecaster__reducer__estimator__alpha": uniform(0, 1),
@@ -18,6 +18,7 @@ class KNeighborsModel(MLPipelineSimple, BaseModel):
         param_grid = {
             "scaler_x__passthrough": [True, False],
             "forecaster__reducer__window_length": randint(self.sp, 2 * self.sp),
+            "forecaster__reducer__strategy": self.reduction_strategies,
             "forecaster__reducer__estimator__n_neighbors": randint(1, 10),
             "forecaster__reducer__estimator__weights": ["uniform", "distance"],
             "forecaster__reducer__estimator__algorithm": [
@@ -56,6 +57,7 @@ class KNeighborsCCD(MLPipelineCCD, BaseModel):
             "forecaster__deseasonalizer__model": deseasonal_type,
             "forecaster__detrender__forecaster__degree": randint(1, 10),
             "forecaster__reducer__window_length": randint(self.sp, 2 * self.sp),
+            "forecaster__reducer__strategy": self.reduction_strategies,
             "forecaster__reducer__estimator__n_neighbors": randint(1, 10),
             "forecaster__reducer__estimator__weights": ["uniform", "distance"],
             "forecaster__reducer__estimator__algorithm": [
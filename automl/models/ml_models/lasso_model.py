@@ -29,6 +29,7 @@ class LassoModel(MLPipelineSimple, BaseModel, Lasso):
         param_grid = {
             "scaler_x__passthrough": [True, False],
             "forecaster__reducer__window_length": randint(self.sp, 2 * self.sp),
+            "forecaster__reducer__strategy": self.reduction_strategies,
             "forecaster__reducer__estimator__alpha": uniform(0.001, 10),
             "forecaster__reducer__estimator__fit_intercept": [True, False],
         }
@@ -54,6 +55,7 @@ class LassoCCD(MLPipelineCCD, BaseModel, Lasso):
             # "forecaster__deseasonalizer__sp": [self.sp, 2 * self.sp],
             "forecaster__detrender__forecaster__degree": randint(1, 10),
             "forecaster__reducer__window_length": randint(self.sp, 2 * self.sp),
+            "forecaster__reducer__strategy": self.reduction_strategies,
             "forecaster__reducer__estimator__alpha": uniform(0.001, 10),
             "forecaster__reducer__estimator__fit_intercept": [True, False],
         }
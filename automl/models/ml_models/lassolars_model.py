@@ -27,6 +27,7 @@ class LassoLarsModel(MLPipelineSimple, BaseModel, LassoLars):
         param_grid = {
             "scaler_x__passthrough": [True, False],
             "forecaster__reducer__window_length": randint(self.sp, 2 * self.sp),
+            "forecaster__reducer__strategy": self.reduction_strategies,
             "forecaster__reducer__estimator__alpha": loguniform(0.0000001, 1),
             "forecaster__reducer__estimator__eps": loguniform(0.00001, 0.1),
             "forecaster__reducer__estimator__fit_intercept": [True, False],
@@ -53,6 +54,7 @@ class LassoLarsCCD(MLPipelineCCD, BaseModel, LassoLars):
             # "forecaster__deseasonalizer__sp": [self.sp, 2 * self.sp],
             "forecaster__detrender__forecaster__degree": randint(1, 10),
             "forecaster__reducer__window_length": randint(self.sp, 2 * self.sp),
+            "forecaster__reducer__strategy": self.reduction_strategies,
             "forecaster__reducer__estimator__alpha": loguniform(0.0000001, 1),
             "forecaster__reducer__estimator__eps": loguniform(0.00001, 0.1),
             "forecaster__reducer__estimator__fit_intercept": [True, False],
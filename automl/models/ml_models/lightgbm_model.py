@@ -20,6 +20,7 @@ class LightGBMModel(MLPipelineSimple, BaseModel):
         param_grid = {
             "scaler_x__passthrough": [True, False],
             "forecaster__reducer__window_length": randint(10, self.sp, 2 * self.sp),
+            "forecaster__reducer__strategy": self.reduction_strategies,
             "forecaster__reducer__estimator__num_leaves": randint(2, 256),
             "forecaster__reducer__estimator__n_estimators": randint(10, 300),
             "forecaster__reducer__estimator__learning_rate": loguniform(0.000001, 0.5),
@@ -59,6 +60,7 @@ class LightGBMCCD(MLPipelineCCD, BaseModel):
             "forecaster__deseasonalizer__sp": [self.sp, 2 * self.sp],
             "forecaster__detrender__forecaster__degree": randint(1, 10),
             "forecaster__reducer__window_length": randint(10, self.sp, 2 * self.sp),
+            "forecaster__reducer__strategy": self.reduction_strategies,
             "forecaster__reducer__estimator__num_leaves": randint(2, 256),
             "forecaster__reducer__estimator__n_estimators": randint(10, 300),
             "forecaster__reducer__estimator__learning_rate": loguniform(0.000001, 0.5),
@@ -29,6 +29,7 @@ class LinearModel(MLPipelineSimple, BaseModel, Linear):
         param_grid = {
             "scaler_x__passthrough": [True, False],
             "forecaster__reducer__window_length": randint(self.sp, 2 * self.sp),
+            "forecaster__reducer__strategy": self.reduction_strategies,
             "forecaster__reducer__estimator__fit_intercept": [True, False],
         }
         return param_grid
@@ -53,6 +54,7 @@ class LinearModelCCD(MLPipelineCCD, BaseModel, Linear):
             # "forecaster__deseasonalizer__sp": [self.sp, 2 * self.sp],
             "forecaster__detrender__forecaster__degree": randint(1, 10),
             "forecaster__reducer__window_length": randint(self.sp, 2 * self.sp),
+            "forecaster__reducer__strategy": self.reduction_strategies,
             "forecaster__reducer__estimator__fit_intercept": [True, False],
         }
         return param_grid
@@ -20,6 +20,7 @@ class RandomForestModel(MLPipelineSimple, BaseModel):
         param_grid = {
             "scaler_x__passthrough": [True, False],
             "forecaster__reducer__window_length": randint(self.sp, 2 * self.sp),
+            "forecaster__reducer__strategy": self.reduction_strategies,
             "forecaster__reducer__estimator__n_estimators": randint(10, 300),
             "forecaster__reducer__estimator__criterion": ["mse", "mae"],
             "forecaster__reducer__estimator__max_depth": randint(1, 10),
@@ -60,6 +61,7 @@ class RandomForestCCD(MLPipelineCCD, BaseModel):
             "forecaster__deseasonalizer__model": deseasonal_type,
             "forecaster__detrender__forecaster__degree": randint(1, 10),
             "forecaster__reducer__window_length": randint(self.sp, 2 * self.sp),
+            "forecaster__reducer__strategy": self.reduction_strategies,
             "forecaster__reducer__estimator__n_estimators": randint(10, 300),
             "forecaster__reducer__estimator__criterion": ["mse", "mae"],
             "forecaster__reducer__estimator__max_depth": randint(1, 10),
@@ -0,0 +1,100 @@
+import logging
+import math
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+CGROUP_V2_CPU_MAX = "/sys/fs/cgroup/cpu.max"
+CGROUP_V1_DIRS = ("/sys/fs/cgroup/cpu", "/sys/fs/cgroup/cpu,cpuacct")
+
+_cpu_limit: Optional[int] = None
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path, "r") as file:
+            return file.read().strip()
+    except OSError:
+        return None
+
+
+def get_cgroup_cpu_quota() -> Optional[float]:
+    """CPUs granted by the CFS quota of the cgroup, ``None`` when unlimited."""
+    cpu_max = _read(CGROUP_V2_CPU_MAX)
+    if cpu_max is not None:
+        quota, _, period = cpu_max.partition(" ")
+        if quota != "max" and period:
+            return int(quota) / int(period)
+        return None
+    for directory in CGROUP_V1_DIRS:
+        quota = _read(os.path.join(directory, "cpu.cfs_quota_us"))
+        period = _read(os.path.join(directory, "cpu.cfs_period_us"))
+        if quota is not None and period is not None and int(quota) > 0:
+            return int(quota) / int(period)
+    return None
+
+
+def get_affinity_cpus() -> int:
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def set_cpu_limit(n_cpus: Optional[int]):
+    """Caps the CPUs this process may use, e.g. its share of a batch."""
+    global _cpu_limit
+    _cpu_limit = None if n_cpus is None else max(1, int(n_cpus))
+
+
+def available_cpus() -> int:
+    """CPUs this process may keep busy: the affinity mask, bounded by the
+    cgroup quota and by ``set_cpu_limit``."""
+    n_cpus = get_affinity_cpus()
+    quota = get_cgroup_cpu_quota()
+    if quota is not None:
+        n_cpus = min(n_cpus, max(1, math.floor(quota)))
+    if _cpu_limit is not None:
+        n_cpus = min(n_cpus, _cpu_limit)
+    return max(1, n_cpus)
+
+
+@dataclass(frozen=True)
+class Budget:
+    """CPUs of every nested layer: ``n_workers`` parallel tasks (trials x CV
+    folds), each fitting its estimator on ``n_threads`` threads with BLAS and
+    OpenMP pools capped at ``blas_threads``."""
+
+    n_workers: int
+    n_threads: int
+    blas_threads: int
+
+
+class ResourceManager:
+    """Splits the available CPUs between the layers of parallelism.
+
+    ``n_jobs`` follows the joblib convention and bounds the number of worker
+    processes; the CPUs left to every worker go to its estimator threads, so
+    ``n_workers * n_threads`` never exceeds the available CPUs.
+    """
+
+    def __init__(self, n_jobs: int = -1, n_cpus: Optional[int] = None):
+        self.n_jobs = n_jobs
+        self.n_cpus = n_cpus or available_cpus()
+
+    def get_max_workers(self) -> int:
+        if self.n_jobs is None or self.n_jobs == 0:
+            return 1
+        if self.n_jobs < 0:
+            return max(1, self.n_cpus + 1 + self.n_jobs)
+        return min(self.n_jobs, self.n_cpus)
+
+    def get_budget(self, n_tasks: int) -> Budget:
+        n_workers = max(1, min(self.get_max_workers(), n_tasks))
+        n_threads = max(1, self.n_cpus // n_workers)
+        return Budget(n_workers, n_threads, n_threads)
+
+    def split(self, n_groups: int) -> int:
+        """CPUs of each of ``n_groups`` processes sharing this machine."""
+        return max(1, self.n_cpus // max(1, n_groups))
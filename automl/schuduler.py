@@ -1,14 +1,26 @@
 import logging
 import os
-from typing import Any, Dict
+import time
+from dataclasses import replace
+from typing import Any, Dict, List, Optional, Tuple
 
-import joblib
+import numpy as np
 import pandas as pd
 
+from automl.artifacts import (find_model_path, get_model_path, list_models,
+                              load_model, read_metadata, save_model)
+from automl.checkpoint import Checkpoint, fingerprint
 from automl.lifecycle.compare_model import ModelComparator
+from automl.lifecycle.fold_store import FoldStore
 from automl.lifecycle.hyperparams_tuner import HyperParamsTuner
-from automl.settings import Settings
+from automl.lifecycle.panel import aggregate, is_panel, n_series, to_panel_frame
+from automl.lifecycle.trial_db import TrialDB, get_trial_db_path
+from automl.lifecycle.updater import ModelUpdater
+from automl.limits import Limits
+from automl.settings import SchudulerState, Settings
+from automl.stat.cache import StatsCache
 from automl.stat.statistics import ExtractStats
+from automl.stat.streaming import StreamingExtractStats
 
 logger = logging.getLogger(__name__)
 
@@ -19,60 +31,168 @@ class Schuduler:
         self._exp_id = None
         self._y, self._x = None, None
         self._fh, self._frequency = None, None
+        self._fold_store = None
+        self._checkpoint = None
+        self._deadline = None
+        self._tuned_models = []
+        self._updater = None
+        self._trial_db = None
 
     def set_exp_id(self, exp_id: str):
         self._exp_id = exp_id
+        self._checkpoint = None
         return self
 
     def set_y(self, y: pd.Series):
-        self._y = y
+        self._y = to_panel_frame(y)
+        self._fold_store, self._checkpoint = None, None
         return self
 
     def set_x(self, x: pd.DataFrame):
         self._x = x
+        self._fold_store, self._checkpoint = None, None
         return self
 
     def set_fh(self, fh: int):
         self._fh = fh
+        self._checkpoint = None
         return self
 
     def set_frequency(self, frequency: str):
         self._frequency = frequency
+        self._checkpoint = None
         return self
 
+    def get_checkpoint(self) -> Optional[Checkpoint]:
+        if not self._settings.checkpoint or self._exp_id is None:
+            return None
+        if self._checkpoint is None:
+            settings = {
+                key: value
+                for key, value in vars(self._settings).items()
+                if key not in ("model_dir", "n_jobs", "checkpoint")
+            }
+            key = fingerprint(self._y, self._x, self._fh, self._frequency, settings)
+            directory = os.path.join(self._settings.model_dir, str(self._exp_id))
+            self._checkpoint = Checkpoint(directory, key)
+        return self._checkpoint
+
+    def get_limits(self) -> Limits:
+        """Trial limits of the settings; the ``time_budget`` clock starts with
+        the first stage that asks for them."""
+        time_budget = self._settings.time_budget
+        if time_budget is not None and self._deadline is None:
+            self._deadline = time.monotonic() + time_budget
+        return Limits(
+            self._settings.trial_timeout, self._settings.trial_memory_mb, self._deadline
+        )
+
+    def get_fold_store(self) -> FoldStore:
+        if self._fold_store is None:
+            self._fold_store = FoldStore(self._y, self._x)
+        return self._fold_store
+
     def extract_statistics(self):
         logger.info("Extracting Statistics ...")
+        self.get_limits()
+        checkpoint = self.get_checkpoint()
+        if checkpoint and checkpoint.is_done(SchudulerState.Extracting_Stat):
+            logger.info("Statistics restored from checkpoint")
+            self._statistics = checkpoint.load("statistics")
+            return self
         has_exogenous = True if self._x is not None else False
-        self._statistics = ExtractStats(
-            self._frequency, has_exogenous
-        ).extract_statistics(self._y)
+        y = aggregate(self._y)
+        if len(y) >= self._settings.streaming_stats_min_size:
+            extractor = StreamingExtractStats(self._frequency, has_exogenous)
+        else:
+            extractor = ExtractStats(self._frequency, has_exogenous)
+        if self._settings.stats_cache_size > 0:
+            cache = StatsCache(
+                os.path.join(self._settings.model_dir, ".stats_cache"),
+                self._settings.stats_cache_size,
+            )
+            self._statistics = cache.extract_statistics(extractor, y)
+        else:
+            self._statistics = extractor.extract_statistics(y)
+        if is_panel(self._y):
+            self._statistics = replace(
+                self._statistics,
+                is_strickly_positive=bool((self._y.to_numpy() > 0).all()),
+                n_series=n_series(self._y),
+            )
         logger.info(self._statistics)
+        if checkpoint:
+            checkpoint.save("statistics", self._statistics)
+            checkpoint.set_state(SchudulerState.Extracting_Stat)
         return self
 
     def compare_models(self):
         logger.info("Selecting Models from ...\n")
+        checkpoint = self.get_checkpoint()
+        if checkpoint and checkpoint.is_done(SchudulerState.Compare_Model):
+            logger.info("Model comparison restored from checkpoint")
+            self._result = checkpoint.load("compare_result")
+            return self
         self._result = (
             ModelComparator(**vars(self._settings))
             .set_y(self._y)
             .set_x(self._x)
             .set_fh(self._fh)
             .set_statistics(self._statistics)
+            .set_fold_store(self.get_fold_store())
+            .set_limits(self.get_limits())
             .compare(self._settings.filter)
         )
         print(self._result)
+        if checkpoint:
+            checkpoint.save("compare_result", self._result)
+            checkpoint.set_state(SchudulerState.Compare_Model)
         return self
 
+    def set_trial_db(self, trial_db: Optional[TrialDB]):
+        """Trial database used instead of ``model_dir/trials.sqlite``."""
+        self._trial_db = trial_db
+        return self
+
+    def get_trial_db(self) -> Optional[TrialDB]:
+        if not self._settings.trial_db:
+            return None
+        if self._trial_db is None:
+            self._trial_db = TrialDB(get_trial_db_path(self._settings.model_dir))
+        return self._trial_db
+
     def tune_hyperparameters(self):
         logger.info("Tunning Selected Models ...")
-        self._tuned_model, self._preictions, self._erros = (
+        checkpoint = self.get_checkpoint()
+        if checkpoint and checkpoint.is_done(SchudulerState.HyperParameter_Model):
+            logger.info("Tuned models restored from checkpoint")
+            (
+                self._tuned_models,
+                self._tuned_model,
+                self._preictions,
+                self._erros,
+            ) = checkpoint.load("tuned_models")
+            return self
+        tuner = (
             HyperParamsTuner(**vars(self._settings))
             .set_y(self._y)
             .set_x(self._x)
             .set_fh(self._fh)
             .set_statistics(self._statistics)
+            .set_fold_store(self.get_fold_store())
+            .set_checkpoint(checkpoint)
+            .set_limits(self.get_limits())
+            .set_trial_db(self.get_trial_db())
             .tune_model(self._result)
-            .get_predictions()
         )
+        self._tuned_models = tuner.tuned_models
+        self._tuned_model, self._preictions, self._erros = tuner.get_predictions()
+        if checkpoint:
+            checkpoint.save(
+                "tuned_models",
+                (self._tuned_models, self._tuned_model, self._preictions, self._erros),
+            )
+            checkpoint.set_state(SchudulerState.HyperParameter_Model)
         return self
 
     def finalize_model(self):
@@ -83,13 +203,91 @@ class Schuduler:
 
     def save_tuned_models(self):
         logger.info("Saving Selected Tuned Models ...")
-        for model_name, model in self._tuned_model:
-            model_name = f"{self._exp_id}_{model_name}.pkl"
-            model_path = os.path.join(self._settings.model_dir, model_name)
+        self.write_tuned_models()
+        checkpoint = self.get_checkpoint()
+        if checkpoint:
+            checkpoint.set_state(SchudulerState.Saving_Model)
+        return self
+
+    def write_tuned_models(self):
+        os.makedirs(self._settings.model_dir, exist_ok=True)
+        updater = self.get_updater()
+        for model_name, model, score in self._tuned_models:
+            model_path = get_model_path(
+                self._settings.model_dir, self._exp_id, model_name
+            )
             logger.info(f"Saving Model ID  {model_name} to Path {model_path}")
-            joblib.dump(model, model_path)
+            metadata = {
+                "model_name": model_name,
+                "score": float(score),
+                "n_updates": updater.n_updates.get(model_name, 0),
+                "refit_window": updater.get_window(model_name, model),
+            }
+            save_model(model, model_path, metadata)
+
+    def get_updater(self) -> ModelUpdater:
+        if self._updater is None:
+            self._updater = ModelUpdater(
+                self._settings.refit_interval, self._settings.refit_window
+            )
+        return self._updater
+
+    def load_tuned_models(self):
+        """Tuned models of the experiment saved by ``save_tuned_models``."""
+        updater = self.get_updater()
+        tuned_models = []
+        for exp_id, model_name in list_models(self._settings.model_dir):
+            if exp_id != str(self._exp_id):
+                continue
+            path = find_model_path(self._settings.model_dir, exp_id, model_name)
+            metadata = read_metadata(path)
+            updater.set_n_updates(model_name, metadata.get("n_updates", 0))
+            if "refit_window" in metadata:
+                updater.set_window(model_name, metadata["refit_window"])
+            score = metadata.get("score", np.nan)
+            tuned_models.append((model_name, load_model(path), score))
+        if not tuned_models:
+            raise FileNotFoundError(f"No tuned models saved for {self._exp_id}")
+        tuned_models.sort(key=lambda x: np.nan_to_num(x[2], nan=np.inf))
+        self._tuned_models = tuned_models
+        return self
+
+    def update_models(
+        self, new_y: pd.Series, new_x: Optional[pd.DataFrame] = None, save=False
+    ):
+        """Moves the tuned models to new observations without a new run, see
+        ``ModelUpdater``; the models are loaded from ``model_dir`` when this
+        scheduler did not tune them and saved back with ``save``."""
+        if not self._tuned_models:
+            self.load_tuned_models()
+        new_y = to_panel_frame(new_y)
+        updater = self.get_updater()
+        for model_name, model, _ in self._tuned_models:
+            updater.update(model_name, model, new_y, new_x)
+        if self._y is not None:
+            self.set_y(pd.concat([self._y, new_y]))
+        if self._x is not None and new_x is not None:
+            self.set_x(pd.concat([self._x, new_x]))
+        if save:
+            self.write_tuned_models()
+            self.invalidate_tuning()
+        return self
+
+    def invalidate_tuning(self):
+        """Rolls the experiment's checkpoint back before tuning: a rerun
+        restoring the tuned models would save them over the updated ones."""
+        if not self._settings.checkpoint or self._exp_id is None:
+            return self
+        directory = os.path.join(self._settings.model_dir, str(self._exp_id))
+        checkpoint = Checkpoint.open(directory)
+        if checkpoint is not None:
+            checkpoint.invalidate(SchudulerState.HyperParameter_Model, "tuned_")
+        self._checkpoint = None
         return self
 
+    def get_tuned_models(self) -> List[Tuple]:
+        return self._tuned_models
+
     def get_metrics(self) -> Dict:
         return self._erros
 
@@ -0,0 +1,491 @@
+"""Forecast service for the models saved by ``Schuduler.save_tuned_models``.
+
+Artifacts are loaded once into an LRU cache and concurrent requests for the
+same model are micro-batched into one predict.
+
+    python -m automl.serving --model-dir ../results --port 8080
+
+    POST /predict/<exp_id>/<model_name>  {"fh": [1, 2], "X": {"index": [...],
+                                          "columns": [...], "data": [[...]]}}
+    GET  /models    artifacts found in the model directory
+    GET  /metrics   p50/p99 latency, batch sizes and model cache counters
+"""
+
+import argparse
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sktime.datatypes import convert_to
+from sktime.forecasting.compose import ForecastingPipeline, TransformedTargetForecaster
+
+from automl.artifacts import (
+    find_model_path,
+    get_artifact_version,
+    list_models,
+    load_model,
+)
+from automl.models.ml_models.customized.reducer import LagReducer
+
+logger = logging.getLogger(__name__)
+
+
+class ModelNotFound(KeyError):
+    """No artifact saved for the requested experiment and model."""
+
+
+class ModelCache:
+    """LRU cache of loaded forecasters. An artifact is unpickled once while it
+    stays cached, concurrent misses on the same model wait for one load. Every
+    ``get`` checks the manifest of the cached artifact and reloads the model
+    if it was saved again since, e.g. by ``update_models(save=True)``."""
+
+    def __init__(self, model_dir: str, max_models: int = 8):
+        self.model_dir = model_dir
+        self.max_models = max(1, max_models)
+        self.hits, self.misses, self.evictions, self.reloads = 0, 0, 0, 0
+        self._models = OrderedDict()
+        self._loading = {}
+        self._lock = threading.Lock()
+
+    def get(self, exp_id: str, model_name: str):
+        key = (exp_id, model_name)
+        version = self.get_version(exp_id, model_name)
+        with self._lock:
+            cached = self._models.get(key)
+            if cached is not None and cached[1] == version:
+                self._models.move_to_end(key)
+                self.hits += 1
+                return cached[0]
+            if cached is not None:
+                del self._models[key]
+                self.reloads += 1
+                logger.info(f"Reloading {key}, its artifact changed")
+            loading = self._loading.get(key)
+            is_loader = loading is None
+            if is_loader:
+                loading = self._loading[key] = Future()
+                self.misses += 1
+        if not is_loader:
+            return loading.result()
+        try:
+            model = self.load(exp_id, model_name)
+        except BaseException as exc:
+            with self._lock:
+                del self._loading[key]
+            loading.set_exception(exc)
+            raise
+        with self._lock:
+            del self._loading[key]
+            self._models[key] = (model, version)
+            while len(self._models) > self.max_models:
+                evicted, _ = self._models.popitem(last=False)
+                self.evictions += 1
+                logger.info(f"Evicted {evicted} from the model cache")
+        loading.set_result(model)
+        return model
+
+    def get_version(self, exp_id: str, model_name: str):
+        path = find_model_path(self.model_dir, exp_id, model_name)
+        return None if path is None else get_artifact_version(path)
+
+    def load(self, exp_id: str, model_name: str):
+        path = find_model_path(self.model_dir, exp_id, model_name)
+        if path is None:
+            raise ModelNotFound(f"No model {model_name} saved for {exp_id}")
+        start = time.perf_counter()
+        model = load_model(path)
+        logger.info(f"Loaded {path} in {time.perf_counter() - start:.3f}s")
+        return model
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._models),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "reloads": self.reloads,
+            }
+
+
+class LatencyStats:
+    """Latencies of the last ``window`` requests per model."""
+
+    def __init__(self, window: int = 10_000):
+        self._latencies = defaultdict(lambda: deque(maxlen=window))
+        self._batch_sizes = defaultdict(lambda: deque(maxlen=window))
+        self._counts = defaultdict(int)
+        self._errors = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float, ok: bool = True):
+        with self._lock:
+            self._latencies[name].append(seconds)
+            self._counts[name] += 1
+            if not ok:
+                self._errors[name] += 1
+
+    def record_batch(self, name: str, size: int):
+        with self._lock:
+            self._batch_sizes[name].append(size)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            summary = {}
+            for name, latencies in self._latencies.items():
+                p50, p99 = np.percentile(np.fromiter(latencies, float), [50, 99])
+                batch_sizes = self._batch_sizes.get(name) or [0]
+                summary[name] = {
+                    "count": self._counts[name],
+                    "errors": self._errors[name],
+                    "p50_ms": 1000 * p50,
+                    "p99_ms": 1000 * p99,
+                    "mean_batch_size": float(np.mean(batch_sizes)),
+                }
+            return summary
+
+
+@dataclass
+class ForecastRequest:
+    steps: Optional[List[int]]
+    x: Optional[pd.DataFrame]
+    future: Future = field(default_factory=Future)
+
+
+def get_x_key(x: Optional[pd.DataFrame]):
+    if x is None:
+        return None
+    values = pd.util.hash_pandas_object(x, index=True).to_numpy()
+    return tuple(x.columns), values.tobytes()
+
+
+def select_steps(
+    y_pred: pd.DataFrame, fitted_steps: List[int], steps: Optional[List[int]]
+) -> pd.DataFrame:
+    """Rows of the requested relative steps from a prediction over the fitted
+    horizon, for every series of a panel."""
+    if steps is None:
+        return y_pred
+    missing = sorted(set(steps) - set(fitted_steps))
+    if missing:
+        raise ValueError(f"fh {missing} outside the fitted horizon {fitted_steps}")
+    time_index = y_pred.index.get_level_values(-1)
+    labels = time_index.unique()
+    wanted = labels[[fitted_steps.index(step) for step in steps]]
+    return y_pred[time_index.isin(wanted)]
+
+
+def predict_contexts(forecaster, fh, X_list: List[pd.DataFrame]) -> List:
+    """``forecaster.predict(fh, X)`` for every ``X`` of ``X_list``. The
+    transformer steps of the pipelines run per ``X``, the ``LagReducer`` at
+    their core forecasts all of them in one vectorized pass; other forecasters
+    predict each ``X`` in turn."""
+    if isinstance(forecaster, LagReducer):
+        return forecaster.predict_contexts(fh, X_list)
+    if not isinstance(forecaster, (ForecastingPipeline, TransformedTargetForecaster)):
+        return [forecaster.predict(fh=fh, X=X) for X in X_list]
+    forecaster.check_is_fitted()
+    fh = forecaster._check_fh(fh)
+    X_list = [forecaster._check_X(X=X) for X in X_list]
+    if isinstance(forecaster, ForecastingPipeline):
+        X_inner = [forecaster._transform(X=X) for X in X_list]
+        y_preds = predict_contexts(forecaster.forecaster_, fh, X_inner)
+    else:
+        y_preds = []
+        inner = predict_contexts(forecaster.forecaster_, fh, X_list)
+        for y_pred, X in zip(inner, X_list):
+            y_pred = forecaster._get_inverse_transform(
+                forecaster.transformers_pre_, y_pred, X
+            )
+            for _, transformer in forecaster.transformers_post_:
+                y_pred = transformer.transform(X=y_pred, y=X)
+            y_preds.append(y_pred)
+    return [
+        convert_to(
+            y_pred,
+            forecaster._y_mtype_last_seen,
+            store=forecaster._converter_store_y,
+            store_behaviour="freeze",
+        )
+        for y_pred in y_preds
+    ]
+
+
+class MicroBatcher:
+    """Serves the requests of each model from its own thread. The requests
+    arriving within ``max_delay`` seconds of the first one, up to
+    ``max_batch``, are answered together: one vectorized predict over the
+    fitted horizon for all the distinct ``X`` of the batch, sliced to the
+    steps each request asked for. If that predict fails, every ``X`` is
+    predicted on its own so a bad request fails alone.
+
+    Saved forecasters were fitted with their horizon, so they only predict
+    that horizon. Predicts of one model never run concurrently, sktime
+    forecasters keep state in ``predict``. A model's thread stops and its
+    queue is dropped after ``idle_timeout`` seconds without requests, the next
+    request starts a new one.
+    """
+
+    def __init__(
+        self,
+        cache: ModelCache,
+        stats: LatencyStats,
+        max_batch: int = 64,
+        max_delay: float = 0.002,
+        idle_timeout: float = 60.0,
+    ):
+        self.cache = cache
+        self.stats = stats
+        self.max_batch = max(1, max_batch)
+        self.max_delay = max_delay
+        self.idle_timeout = idle_timeout
+        self._queues = {}
+        self._lock = threading.Lock()
+
+    def submit(self, exp_id: str, model_name: str, request: ForecastRequest) -> Future:
+        key = (exp_id, model_name)
+        with self._lock:
+            requests = self._queues.get(key)
+            if requests is None:
+                requests = self._queues[key] = queue.SimpleQueue()
+                threading.Thread(
+                    target=self._serve,
+                    args=(key, requests),
+                    name=f"serve-{'/'.join(key)}",
+                    daemon=True,
+                ).start()
+            # put under the lock, an idle thread only exits on an empty queue
+            requests.put(request)
+        return request.future
+
+    def _serve(self, key: Tuple[str, str], requests: queue.SimpleQueue):
+        while True:
+            try:
+                batch = [requests.get(timeout=self.idle_timeout)]
+            except queue.Empty:
+                with self._lock:
+                    if requests.empty():
+                        del self._queues[key]
+                        return
+                continue
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(requests.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self.stats.record_batch("/".join(key), len(batch))
+            self._predict(key, batch)
+
+    def _predict(self, key: Tuple[str, str], batch: List[ForecastRequest]):
+        try:
+            model = self.cache.get(*key)
+        except Exception as exc:
+            for request in batch:
+                request.future.set_exception(exc)
+            return
+        fitted_steps = [int(step) for step in model.fh.to_relative(model.cutoff)]
+        groups = defaultdict(list)
+        for request in batch:
+            groups[get_x_key(request.x)].append(request)
+        groups = list(groups.values())
+        y_preds = None
+        if len(groups) > 1 and all(group[0].x is not None for group in groups):
+            try:
+                y_preds = predict_contexts(
+                    model, model.fh, [group[0].x for group in groups]
+                )
+            except Exception:
+                logger.debug("Vectorized predict failed, predicting each X")
+        for idx, group in enumerate(groups):
+            try:
+                if y_preds is None:
+                    y_pred = model.predict(fh=model.fh, X=group[0].x)
+                else:
+                    y_pred = y_preds[idx]
+            except Exception as exc:
+                for request in group:
+                    request.future.set_exception(exc)
+                continue
+            if isinstance(y_pred, pd.Series):
+                y_pred = y_pred.to_frame()
+            for request in group:
+                try:
+                    request.future.set_result(
+                        select_steps(y_pred, fitted_steps, request.steps)
+                    )
+                except Exception as exc:
+                    request.future.set_exception(exc)
+
+
+def parse_index(labels: List, cutoff: pd.Index) -> pd.Index:
+    """Index of a JSON ``X`` in the type of the model's training index, the
+    time level last for panels."""
+    if labels and isinstance(labels[0], list):
+        levels = list(zip(*labels))
+        time_index = parse_index(list(levels[-1]), cutoff)
+        return pd.MultiIndex.from_arrays([*levels[:-1], time_index])
+    if isinstance(cutoff, pd.PeriodIndex):
+        return pd.PeriodIndex(labels, freq=cutoff.freq)
+    if isinstance(cutoff, pd.DatetimeIndex):
+        return pd.DatetimeIndex(labels)
+    return pd.Index(labels)
+
+
+def to_json(y_pred: pd.DataFrame) -> Dict[str, Any]:
+    return {
+        "index": [str(label) for label in y_pred.index],
+        "columns": [str(column) for column in y_pred.columns],
+        "data": json.loads(y_pred.to_json(orient="values")),
+    }
+
+
+class ForecastService:
+    """Loads saved models into an LRU cache and micro-batches their
+    forecasts; ``predict`` can be used in process, ``serve`` exposes it over
+    HTTP."""
+
+    def __init__(
+        self,
+        model_dir: str,
+        max_models: int = 8,
+        max_batch: int = 64,
+        max_delay: float = 0.002,
+    ):
+        self.model_dir = model_dir
+        self.cache = ModelCache(model_dir, max_models)
+        self.stats = LatencyStats()
+        self.batcher = MicroBatcher(self.cache, self.stats, max_batch, max_delay)
+
+    def predict(
+        self,
+        exp_id: str,
+        model_name: str,
+        fh: Optional[List[int]] = None,
+        x: Optional[pd.DataFrame] = None,
+        timeout: Optional[float] = None,
+    ) -> pd.DataFrame:
+        steps = None if fh is None else [int(step) for step in np.atleast_1d(fh)]
+        if x is None and self.cache.get(exp_id, model_name)._X is not None:
+            raise ValueError(f"{model_name} was fitted with exogenous data, X needed")
+        request = ForecastRequest(steps, x)
+        start = time.perf_counter()
+        try:
+            y_pred = self.batcher.submit(exp_id, model_name, request).result(timeout)
+        except Exception:
+            self.stats.record(
+                f"{exp_id}/{model_name}", time.perf_counter() - start, False
+            )
+            raise
+        self.stats.record(f"{exp_id}/{model_name}", time.perf_counter() - start)
+        return y_pred
+
+    def predict_json(self, exp_id: str, model_name: str, payload: Dict) -> Dict:
+        x = None
+        if payload.get("X") is not None:
+            cutoff = self.cache.get(exp_id, model_name).cutoff
+            x = pd.DataFrame(
+                payload["X"]["data"],
+                index=parse_index(payload["X"]["index"], cutoff),
+                columns=payload["X"]["columns"],
+            )
+        y_pred = self.predict(exp_id, model_name, payload.get("fh"), x)
+        return {"model": model_name, "predictions": to_json(y_pred)}
+
+    def get_metrics(self) -> Dict:
+        return {"latency": self.stats.summary(), "cache": self.cache.get_stats()}
+
+    def get_models(self) -> List[Dict[str, str]]:
+        return [
+            {"exp_id": exp_id, "model_name": model_name}
+            for exp_id, model_name in list_models(self.model_dir)
+        ]
+
+    def serve(self, host: str = "127.0.0.1", port: int = 8080):
+        server = ThreadingHTTPServer((host, port), ForecastHandler)
+        server.daemon_threads = True
+        server.service = self
+        logger.info(f"Serving {self.model_dir} on http://{host}:{port}")
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+
+
+class ForecastHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        service = self.server.service
+        if self.path == "/metrics":
+            self.send_json(200, service.get_metrics())
+        elif self.path == "/models":
+            self.send_json(200, service.get_models())
+        elif self.path == "/health":
+            self.send_json(200, {"status": "ok"})
+        else:
+            self.send_json(404, {"error": f"Unknown path {self.path}"})
+
+    def do_POST(self):
+        parts = self.path.strip("/").split("/")
+        if len(parts) != 3 or parts[0] != "predict":
+            self.send_json(404, {"error": f"Unknown path {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            response = self.server.service.predict_json(parts[1], parts[2], payload)
+        except ModelNotFound as exc:
+            self.send_json(404, {"error": str(exc.args[0])})
+        except (ValueError, KeyError, TypeError) as exc:
+            self.send_json(400, {"error": str(exc)})
+        except Exception as exc:
+            logger.exception("Forecast failed")
+            self.send_json(500, {"error": str(exc)})
+        else:
+            self.send_json(200, response)
+
+    def send_json(self, status: int, body: Any):
+        content = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model-dir", default=os.path.abspath("../results"))
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--max-models", type=int, default=8)
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--max-delay", type=float, default=0.002)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    service = ForecastService(
+        args.model_dir, args.max_models, args.max_batch, args.max_delay
+    )
+    service.serve(args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
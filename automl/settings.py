@@ -21,6 +21,21 @@ class Settings:
     metric: str = "mae"
     random_search_iter: int = 15
     filter: Optional[Dict] = None
+    n_jobs: int = -1
+    elimination_rate: float = 0.0
+    stats_cache_size: int = 32
+    streaming_stats_min_size: int = 5_000_000
+    checkpoint: bool = True
+    search_algorithm: str = "random"
+    asha_rungs: int = 0
+    asha_eta: int = 3
+    trial_db: bool = True
+    warm_start: int = 3
+    time_budget: Optional[float] = None
+    trial_timeout: Optional[float] = None
+    trial_memory_mb: Optional[float] = None
+    refit_interval: int = 168
+    refit_window: Optional[int] = None
 
     def __repr__(self):
         fields = "\n\t".join(
@@ -0,0 +1,108 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from automl.stat.statistics import ExtractStats, SeriesStat
+
+logger = logging.getLogger(__name__)
+
+
+def to_builtin(value):
+    """JSON fallback for the numpy scalars ``ExtractStats`` leaves in the stat."""
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+class StatsCache:
+    """Disk-backed LRU cache of ``ExtractStats.extract_statistics`` results.
+
+    Entries are the ``SeriesStat.to_dict()`` of a series, stored as JSON under
+    a content hash of the series values, its index, the frequency, the
+    exogenous flag, the extractor class and its ``MAX_SP`` / ``NO_SP_2_USE`` /
+    ``SP_DETECTION_ALGO`` settings. A hit refreshes the entry's modification time
+    and the least recently used entries are evicted beyond ``max_entries``.
+    """
+
+    def __init__(self, directory: str, max_entries: int = 32):
+        self.directory = directory
+        self.max_entries = max_entries
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    @staticmethod
+    def get_key(extractor: ExtractStats, data: Union[np.ndarray, pd.Series]) -> str:
+        digest = hashlib.blake2b(digest_size=16)
+        values = np.ascontiguousarray(np.asarray(data, dtype=np.float64))
+        digest.update(values.tobytes())
+        if isinstance(data, pd.Series):
+            index = data.index
+            if isinstance(index, (pd.DatetimeIndex, pd.PeriodIndex)):
+                digest.update(np.ascontiguousarray(index.asi8).tobytes())
+            else:
+                digest.update(pd.util.hash_pandas_object(index).to_numpy().tobytes())
+            digest.update(str(getattr(index, "freqstr", None)).encode())
+        settings = (
+            type(extractor).__name__,
+            extractor._frequency,
+            extractor._has_exogenous_data,
+            extractor.MAX_SP,
+            extractor.NO_SP_2_USE,
+            extractor.SP_DETECTION_ALGO,
+        )
+        digest.update(repr(settings).encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[SeriesStat]:
+        path = self._path(key)
+        try:
+            with open(path, "r") as stat_file:
+                stat = SeriesStat(**json.load(stat_file))
+        except (OSError, ValueError, TypeError):
+            return None
+        os.utime(path)
+        return stat
+
+    def put(self, key: str, stat: SeriesStat) -> SeriesStat:
+        handle, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(handle, "w") as stat_file:
+            json.dump(stat.to_dict(), stat_file, default=to_builtin)
+        os.replace(tmp_path, self._path(key))
+        self.evict()
+        return stat
+
+    def evict(self):
+        entries = [
+            os.path.join(self.directory, name)
+            for name in os.listdir(self.directory)
+            if name.endswith(".json")
+        ]
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=os.path.getmtime)
+        for path in entries[: len(entries) - self.max_entries]:
+            logger.info(f"Evicting cached statistics {path}")
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def extract_statistics(
+        self, extractor: ExtractStats, data: Union[np.ndarray, pd.Series]
+    ) -> SeriesStat:
+        """``extractor.extract_statistics(data)`` served from the cache when
+        the same series was already analysed with the same settings."""
+        key = self.get_key(extractor, data)
+        stat = self.get(key)
+        if stat is not None:
+            logger.info(f"Statistics loaded from cache {key}")
+            return stat
+        return self.put(key, extractor.extract_statistics(data))
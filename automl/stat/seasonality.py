@@ -0,0 +1,85 @@
+import logging
+from typing import List, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from scipy.fft import irfft, next_fast_len, rfft
+from scipy.stats import norm
+
+logger = logging.getLogger(__name__)
+
+
+def difference(data: np.ndarray, d: int) -> np.ndarray:
+    """``d`` first differences, each padded with a leading zero as sktime
+    ``Differencer(na_handling="fill_zero")`` does."""
+    data_t = np.asarray(data, dtype=np.float64)
+    for _ in range(d):
+        data_t = np.concatenate([[0.0], np.diff(data_t)])
+    return data_t
+
+
+def acf_fft(data: np.ndarray, nlags: int) -> np.ndarray:
+    """Autocorrelation of lags ``0 .. nlags`` via one real FFT, O(n log n)."""
+    data_t = np.asarray(data, dtype=np.float64)
+    data_t = data_t - data_t.mean()
+    n_fft = next_fast_len(2 * len(data_t) - 1, real=True)
+    spectrum = rfft(data_t, n=n_fft)
+    acov = irfft(spectrum.real**2 + spectrum.imag**2, n=n_fft)[: nlags + 1]
+    return acov / acov[0]
+
+
+def acf_lower_bound(acf: np.ndarray, nobs: int, alpha: float = 0.05) -> np.ndarray:
+    """Lower Bartlett confidence bound of the ACF, as ``statsmodels.acf``."""
+    varacf = np.ones_like(acf) / nobs
+    varacf[0] = 0
+    varacf[1] = 1.0 / nobs
+    varacf[2:] *= 1 + 2 * np.cumsum(acf[1:-1] ** 2)
+    return acf - norm.ppf(1 - alpha / 2.0) * np.sqrt(varacf)
+
+
+def rank_significant_sps(acf: np.ndarray, nobs: int, alpha: float = 0.05) -> List[int]:
+    """Lags ``2 .. len(acf) - 1`` whose Bartlett lower bound is positive,
+    strongest first, as sktime ``SeasonalityACF``."""
+    lower = acf_lower_bound(acf, nobs, alpha)
+    candidate_sp = np.arange(2, len(acf))
+    lower_cand = lower[candidate_sp]
+    sorting = np.argsort(-lower_cand)
+    return candidate_sp[sorting][lower_cand[sorting] >= 0].tolist()
+
+
+class SeasonalityFFT:
+    """ACF seasonality test restricted to lags ``2 .. max_lag``.
+
+    Same decision rule as sktime ``SeasonalityACF``: a lag is significant when
+    the lower bound of its Bartlett interval is positive, and significant lags
+    are ranked by that bound. The Bartlett variance of a lag only depends on
+    the lower lags, so for every lag up to the cap the result is identical to
+    running ``SeasonalityACF`` with ``nlags=(nobs-1)/2`` and discarding the
+    longer lags afterwards, without computing them.
+    """
+
+    def __init__(self, max_lag: int, alpha: float = 0.05):
+        self.max_lag = max_lag
+        self.alpha = alpha
+
+    def fit(self, data: Union[np.ndarray, pd.Series]):
+        data_t = np.asarray(data, dtype=np.float64)
+        nobs = len(data_t)
+        nlags = max(0, min(self.max_lag, int((nobs - 1) / 2)))
+        self.acf_ = acf_fft(data_t, nlags)
+        self.sp_significant_ = rank_significant_sps(self.acf_, nobs, self.alpha)
+        self.sp_ = self.sp_significant_[0] if self.sp_significant_ else 1
+        self.nlags_ = nlags
+        return self
+
+    def get_fitted_params(self):
+        return {"sp": self.sp_, "sp_significant": self.sp_significant_}
+
+
+def detect_seasonality_fft(
+    data: Union[np.ndarray, pd.Series], d: int, max_lag: int
+) -> Tuple[int, List[int], int]:
+    """``(primary_sp, significant_sps, lags_used)`` of the ``d`` times
+    differenced series."""
+    sp_est = SeasonalityFFT(max_lag=max_lag).fit(difference(data, d))
+    return sp_est.sp_, sp_est.sp_significant_, sp_est.nlags_
@@ -4,13 +4,14 @@ from typing import Any, Dict, List, Union
 
 import numpy as np
 import pandas as pd
-from pmdarima.arima.utils import ndiffs, nsdiffs
 from sktime.param_est.seasonality import SeasonalityACF
 from sktime.transformations.series.difference import Differencer
 from sktime.utils.seasonality import \
     autocorrelation_seasonality_test as acf_sp_test
 from statsmodels.tsa.seasonal import seasonal_decompose
 
+from automl.stat.seasonality import detect_seasonality_fft
+
 logger = logging.getLogger(__name__)
 
 
@@ -28,6 +29,7 @@ class SeriesStat:
     lower_d: int
     uppercase_d: int
     has_exogenous_data: bool
+    n_series: int = 1
 
     def __repr__(self):
         fields = "\n\t".join(
@@ -45,7 +47,7 @@ class SeriesStat:
 class ExtractStats:
     MAX_SP: int = 60
     NO_SP_2_USE: int = 1
-    SP_DETECTION_ALGO: str = "AUTO"  # 'INDEX'
+    SP_DETECTION_ALGO: str = "FFT"  # 'AUTO', 'INDEX'
 
     def __init__(self, frequency: str, has_exogen_data: bool = False):
         self._frequency = frequency
@@ -62,14 +64,16 @@ class ExtractStats:
         self._has_exogenous_data = has_exogen_data
 
     def extract_statistics(self, data: Union[np.ndarray, pd.Series]) -> SeriesStat:
-        data_ = data.copy(deep=True)
         (
-            self.detect_is_strickly_positive(data_)
-            .detect_seasonality_degree(data_)
-            .detect_seasonality_type(data_)
-            .detect_lowr_d(data_)
-            .detect_upper_d(data_)
+            self.detect_is_strickly_positive(data)
+            .detect_seasonality_degree(data)
+            .detect_seasonality_type(data)
+            .detect_lowr_d(data)
+            .detect_upper_d(data)
         )
+        return self.get_series_stat()
+
+    def get_series_stat(self) -> SeriesStat:
         return SeriesStat(
             self._frequency,
             self._is_strickly_positive,
@@ -91,7 +95,9 @@ class ExtractStats:
         return self
 
     def detect_seasonality_periods(self, data: Union[np.ndarray, pd.Series]):
-        data_t = data.copy(deep=True)
+        from pmdarima.arima.utils import ndiffs
+
+        data_t = data
         # logger.info("detecting seasonality periods...")
         for i in np.arange(ndiffs(data_t)):
             # logger.info(f"Differencing: {i+1}")
@@ -115,15 +121,22 @@ class ExtractStats:
 
         return primary_sp, significant_sps, lags_to_use
 
+    def detect_seasonality_periods_fft(self, data: Union[np.ndarray, pd.Series]):
+        from pmdarima.arima.utils import ndiffs
+
+        return detect_seasonality_fft(data, ndiffs(data), self.MAX_SP)
+
     def detect_seasonality_degree(self, data: Union[np.ndarray, pd.Series]):
         # logger.info("detecting seasonality degree ...")
 
-        data_t = data.copy(deep=True)
         candidate_sps = None
         skip_autocorrelation_test = False
 
         if self.SP_DETECTION_ALGO == "AUTO":
-            _, candidate_sps, _ = self.detect_seasonality_periods(data_t)
+            _, candidate_sps, _ = self.detect_seasonality_periods(data)
+            skip_autocorrelation_test = True
+        elif self.SP_DETECTION_ALGO == "FFT":
+            _, candidate_sps, _ = self.detect_seasonality_periods_fft(data)
             skip_autocorrelation_test = True
         elif self.SP_DETECTION_ALGO == "INDEX":
             # candidate_sps = [data.index.freqstr]
@@ -136,9 +149,12 @@ class ExtractStats:
         if skip_autocorrelation_test:
             sp_test_results = [True for sp in candidate_sps]
         else:
-            data_tt = data.copy(deep=True)
-            sp_test_results = [acf_sp_test(data_tt, sp) for sp in candidate_sps]
+            sp_test_results = [acf_sp_test(data, sp) for sp in candidate_sps]
+        return self.set_seasonality_degree(candidate_sps, sp_test_results)
 
+    def set_seasonality_degree(
+        self, candidate_sps: List[int], sp_test_results: List[bool]
+    ):
         seasonality_present = any(sp_test_results)
 
         significant_sps = [
@@ -201,12 +217,16 @@ class ExtractStats:
         return self
 
     def detect_lowr_d(self, data: Union[np.ndarray, pd.Series]):
+        from pmdarima.arima.utils import ndiffs
+
         # logger.info("detecting lowercase_d ...")
         self._lowercase_d = ndiffs(data)
         # logger.info(f"lowercase_d ...{self._lowercase_d}")
         return self
 
     def detect_upper_d(self, data: Union[np.ndarray, pd.Series]):
+        from pmdarima.arima.utils import nsdiffs
+
         # recommended_uppercase_d = nsdiffs(data, m=self.primary_sp_2_use)
         # logger.info("detecting upper_d ...")
         if self._primary_sp > 1:
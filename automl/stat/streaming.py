@@ -0,0 +1,215 @@
+import logging
+from typing import Iterable, Iterator, List, Union
+
+import numpy as np
+import pandas as pd
+
+from automl.stat.seasonality import rank_significant_sps
+from automl.stat.statistics import ExtractStats, SeriesStat
+
+logger = logging.getLogger(__name__)
+
+KPSS_LEVEL_TABLE = np.array([0.739, 0.574, 0.463, 0.347])
+KPSS_LEVEL_PVALUES = np.array([0.01, 0.025, 0.05, 0.1])
+
+ChunkSource = Union[np.ndarray, pd.Series, Iterable[np.ndarray]]
+
+
+def iter_chunks(data: ChunkSource, chunk_size: int) -> Iterator[np.ndarray]:
+    """Float64 chunks of an array, a memory-mapped array, a series or any
+    iterable of array chunks. Only one chunk is materialized at a time."""
+    if isinstance(data, pd.Series):
+        data = data.to_numpy()
+    if isinstance(data, np.ndarray):
+        for start in range(0, len(data), chunk_size):
+            end = start + chunk_size
+            yield np.asarray(data[start:end], dtype=np.float64).ravel()
+    else:
+        for chunk in data:
+            yield np.asarray(chunk, dtype=np.float64).ravel()
+
+
+class DiffStream:
+    """First difference of a chunked series, carrying the last value between
+    chunks. With ``fill_zero`` the first value is kept as ``0`` as sktime
+    ``Differencer`` does, otherwise it is dropped as ``np.diff`` does."""
+
+    def __init__(self, fill_zero: bool = False):
+        self.fill_zero = fill_zero
+        self._last = None
+
+    def update(self, chunk: np.ndarray) -> np.ndarray:
+        if len(chunk) == 0:
+            return chunk
+        if self._last is None and not self.fill_zero:
+            diffed = np.diff(chunk)
+        else:
+            last = chunk[0] if self._last is None else self._last
+            diffed = np.diff(chunk, prepend=last)
+        self._last = chunk[-1]
+        return diffed
+
+
+class LagMoments:
+    """One-pass sufficient statistics of a series for the KPSS level test and
+    its autocorrelation up to ``max_lag``.
+
+    Values are shifted by the mean of the first chunk before accumulating, the
+    demeaned statistics being shift invariant, which keeps the running sums
+    of long series well conditioned. Memory is ``O(max_lag)``.
+    """
+
+    def __init__(self, max_lag: int):
+        self.max_lag = max_lag
+        self.n_obs = 0
+        self.shift = None
+        self.total = 0.0
+        self.sum_squares = 0.0
+        self.cum_total = 0.0
+        self.sum_cum_squares = 0.0
+        self.sum_t_cum = 0.0
+        self.lag_products = np.zeros(max_lag + 1)
+        self.head = np.empty(0)
+        self.tail = np.empty(0)
+        self.minimum, self.maximum = np.inf, -np.inf
+
+    def update(self, chunk: np.ndarray) -> "LagMoments":
+        if len(chunk) == 0:
+            return self
+        self.minimum = min(self.minimum, chunk.min())
+        self.maximum = max(self.maximum, chunk.max())
+        if self.shift is None:
+            self.shift = chunk.mean()
+        values = chunk - self.shift
+        cumsum = np.cumsum(values) + self.cum_total
+        steps = np.arange(self.n_obs + 1, self.n_obs + len(values) + 1, dtype=float)
+        self.sum_cum_squares += np.dot(cumsum, cumsum)
+        self.sum_t_cum += np.dot(steps, cumsum)
+        self.cum_total = cumsum[-1]
+        self.total += values.sum()
+        self.sum_squares += np.dot(values, values)
+
+        joined = np.concatenate([self.tail, values])
+        offset = len(self.tail)
+        for lag in range(1, self.max_lag + 1):
+            start = max(offset, lag)
+            lagged_start, lagged_end = start - lag, len(joined) - lag
+            if start < len(joined):
+                lagged = joined[lagged_start:lagged_end]
+                self.lag_products[lag] += np.dot(joined[start:], lagged)
+        if len(self.head) < self.max_lag:
+            self.head = np.concatenate([self.head, values[: self.max_lag]])
+            self.head = self.head[: self.max_lag]
+        start = -self.max_lag
+        self.tail = joined[start:] if self.max_lag else np.empty(0)
+        self.n_obs += len(values)
+        return self
+
+    def is_constant(self) -> bool:
+        return self.n_obs == 0 or self.minimum == self.maximum
+
+    def autocovariance(self, nlags: int) -> np.ndarray:
+        """Sums ``sum_t e_t e_{t-l}`` of the demeaned series, ``l = 0 .. nlags``."""
+        n_obs, mean = self.n_obs, self.total / self.n_obs
+        acov = np.empty(nlags + 1)
+        acov[0] = self.sum_squares - self.total * mean
+        for lag in range(1, nlags + 1):
+            first = self.head[:lag].sum()
+            start = len(self.tail) - lag
+            last = self.tail[start:].sum()
+            cross = mean * (2 * self.total - first - last)
+            acov[lag] = self.lag_products[lag] - cross + (n_obs - lag) * mean**2
+        return acov
+
+    def acf(self, nlags: int) -> np.ndarray:
+        acov = self.autocovariance(nlags)
+        return acov / acov[0]
+
+    def kpss_pvalue(self) -> float:
+        """p-value of pmdarima ``KPSSTest(null="level", lshort=True)``."""
+        n_obs, mean = self.n_obs, self.total / self.n_obs
+        n_lags = min(int(np.trunc(4 * (n_obs / 100) ** 0.25)), self.max_lag)
+        sum_t_squares = n_obs * (n_obs + 1) * (2 * n_obs + 1) / 6
+        cum_squares = (
+            self.sum_cum_squares - 2 * mean * self.sum_t_cum + mean**2 * sum_t_squares
+        )
+        eta = cum_squares / n_obs**2
+        acov = self.autocovariance(n_lags)
+        weights = 1 - np.arange(1, n_lags + 1) / (n_lags + 1)
+        s2 = (acov[0] + 2 * np.dot(weights, acov[1:])) / n_obs
+        stat = eta / s2
+        return float(np.interp(stat, KPSS_LEVEL_TABLE[::-1], KPSS_LEVEL_PVALUES[::-1]))
+
+
+class StreamingExtractStats(ExtractStats):
+    """``ExtractStats`` over a series read once, chunk by chunk.
+
+    Strict positivity, the differencing order ``lower_d`` (KPSS, ``max_d=2``)
+    and the ACF seasonal periods are computed from ``LagMoments`` of the
+    series and of its first and second differences, all accumulated in the
+    same pass, so memory stays bounded by ``CHUNK_SIZE`` whatever the length
+    of the series. The seasonality type and ``uppercase_d`` need the raw
+    values and are estimated on the last ``TAIL_SIZE`` observations only.
+    """
+
+    CHUNK_SIZE: int = 1_000_000
+    TAIL_SIZE: int = 100_000
+    MAX_D: int = 2
+    KPSS_ALPHA: float = 0.05
+    KPSS_MAX_LAG: int = 128
+
+    def get_kpss_max_lag(self, data: ChunkSource) -> int:
+        if isinstance(data, (np.ndarray, pd.Series)):
+            return int(np.trunc(4 * (len(data) / 100) ** 0.25))
+        return self.KPSS_MAX_LAG
+
+    def extract_statistics(self, data: ChunkSource) -> SeriesStat:
+        kpss_max_lag = self.get_kpss_max_lag(data)
+        moments = [LagMoments(max(self.MAX_SP, kpss_max_lag))]
+        moments += [LagMoments(kpss_max_lag) for _ in range(self.MAX_D)]
+        filled = [None] + [LagMoments(self.MAX_SP) for _ in range(self.MAX_D)]
+        diffs = [DiffStream() for _ in range(self.MAX_D)]
+        filled_diffs = [DiffStream(fill_zero=True) for _ in range(self.MAX_D)]
+        tail = np.empty(0)
+
+        for chunk in iter_chunks(data, self.CHUNK_SIZE):
+            moments[0].update(chunk)
+            diffed, filled_diffed = chunk, chunk
+            for order in range(1, self.MAX_D + 1):
+                diffed = diffs[order - 1].update(diffed)
+                filled_diffed = filled_diffs[order - 1].update(filled_diffed)
+                moments[order].update(diffed)
+                filled[order].update(filled_diffed)
+            start = -self.TAIL_SIZE
+            tail = np.concatenate([tail, chunk])[start:]
+        filled[0] = moments[0]
+
+        self._is_strickly_positive = bool(moments[0].minimum > 0)
+        self._lowercase_d = self.kpss_ndiffs(moments)
+        self.detect_seasonality_acf(filled[self._lowercase_d])
+        tail = pd.Series(tail)
+        self.detect_seasonality_type(tail).detect_upper_d(tail)
+        logger.info(
+            f"Streamed statistics of {moments[0].n_obs} observations, "
+            f"tail of {len(tail)} used for seasonality type and D"
+        )
+        return self.get_series_stat()
+
+    def kpss_ndiffs(self, moments: List[LagMoments]) -> int:
+        """Same walk as pmdarima ``ndiffs(test="kpss")`` on precomputed moments."""
+        if moments[0].is_constant():
+            return 0
+        d = 0
+        while d < self.MAX_D and moments[d].kpss_pvalue() < self.KPSS_ALPHA:
+            d += 1
+            if moments[d].is_constant():
+                return d
+        return d
+
+    def detect_seasonality_acf(self, moments: LagMoments):
+        nlags = max(0, min(self.MAX_SP, int((moments.n_obs - 1) / 2)))
+        candidate_sps = rank_significant_sps(moments.acf(nlags), moments.n_obs)
+        candidate_sps = [sp for sp in candidate_sps if sp <= self.MAX_SP]
+        return self.set_seasonality_degree(
+            candidate_sps, [True for sp in candidate_sps]
+        )
@@ -0,0 +1,127 @@
+"""Load time and memory of a saved tuned model: joblib pickle vs artifact.
+
+Fits a tree ensemble pipeline the way the tuner does, saves it as a plain
+joblib pickle and as an artifact directory, then loads each in fresh
+interpreters (imports excluded from the timing, minimum over ``--repeat``).
+"private" is the growth of the process's Private_Dirty memory, the part of
+the model that cannot be shared with other processes serving it.
+
+    python -m benchmarks.artifacts --model RandomForest --n-estimators 300
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+
+import joblib
+import numpy as np
+
+from automl.artifacts import save_model
+from automl.model_db import ModelQuery
+from automl.stat.statistics import SeriesStat
+from benchmarks.reduction import get_synthetic_data
+
+warnings.filterwarnings("ignore")
+
+LOAD_CODE = """
+import json, time, warnings
+warnings.filterwarnings("ignore")
+import numpy as np
+import pandas as pd
+import sktime.forecasting.compose
+from automl.artifacts import load_model
+
+def private_dirty():
+    with open("/proc/self/smaps_rollup") as smaps:
+        for line in smaps:
+            if line.startswith("Private_Dirty:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+before = private_dirty()
+start = time.perf_counter()
+model = load_model({path!r})
+load_time = time.perf_counter() - start
+loaded = private_dirty()
+y_pred = model.predict(fh=model.fh, X=pd.read_pickle({x_path!r}))
+predicted = private_dirty()
+np.save({pred_path!r}, np.asarray(y_pred, dtype=float))
+print(json.dumps([load_time, loaded - before, predicted - before]))
+"""
+
+
+def get_size(path: str) -> int:
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, names in os.walk(path)
+        for name in names
+    )
+
+
+def measure_load(path: str, x_path: str, pred_path: str, repeat: int):
+    code = LOAD_CODE.format(path=path, x_path=x_path, pred_path=pred_path)
+    runs = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        runs.append(json.loads(output.stdout.strip().splitlines()[-1]))
+    return min(runs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n-obs", type=int, default=5_000)
+    parser.add_argument("--model", default="RandomForest")
+    parser.add_argument("--n-estimators", type=int, default=300)
+    parser.add_argument("--fh", type=int, default=24)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    y, x = get_synthetic_data(args.n_obs + args.fh)
+    n_train = args.n_obs
+    y_train, x_train, x_test = y[:n_train], x[:n_train], x[n_train:]
+    stat = SeriesStat(
+        "H", True, False, True, "additive", 24, [24], [24], [24], 0, 0, True
+    )
+    model = ModelQuery.get_model_object_by_ID(stat, args.model)
+    forecaster = model.forecaster
+    n_estimators = "forecaster__reducer__estimator__n_estimators"
+    if n_estimators in forecaster.get_params():
+        forecaster.set_params(**{n_estimators: args.n_estimators})
+    start = time.perf_counter()
+    forecaster.fit(y_train, X=x_train, fh=np.arange(1, args.fh + 1))
+    elapsed = time.perf_counter() - start
+    print(f"{args.model} x{args.n_estimators} fitted in {elapsed:.1f}s")
+    expected = np.asarray(forecaster.predict(X=x_test), dtype=float)
+
+    with tempfile.TemporaryDirectory() as directory:
+        x_path = os.path.join(directory, "x_test.pkl")
+        x_test.to_pickle(x_path)
+        pickle_path = os.path.join(directory, "model.pkl")
+        artifact_path = os.path.join(directory, "model")
+        joblib.dump(forecaster, pickle_path)
+        save_model(forecaster, artifact_path)
+        for name, path in (("joblib", pickle_path), ("artifact", artifact_path)):
+            pred_path = os.path.join(directory, f"{name}_pred.npy")
+            load_time, loaded, predicted = measure_load(
+                path, x_path, pred_path, args.repeat
+            )
+            diff = np.abs(np.load(pred_path) - expected).max()
+            print(
+                f"{name:<9} {get_size(path) / 2**20:8.1f}MB on disk, "
+                f"load {1000 * load_time:8.1f}ms, private {loaded:7.1f}MB "
+                f"after load, {predicted:7.1f}MB after predict, "
+                f"max diff {diff:.1e}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Runtime and peak memory of the ``src.sanity`` preprocessing chain.
+
+Runs the chain ``run_automl`` applies (format the datetime column, index by
+it, backfill the gaps, resample hourly) on a frame shaped like the household
+electricity dataset, once as eager ``DataFrame.pipe`` calls and once deferred
+with ``LazyFrame`` and run under copy-on-write. Every case runs in a
+fresh interpreter reading the same pickled frame; "peak" is the growth of
+the maximum resident set size over the loaded frame, the minimum over
+``--repeat`` runs is reported.
+
+    python -m benchmarks.preprocessing --n-rows 2075259 --repeat 3
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = [
+    "Global_active_power",
+    "Global_reactive_power",
+    "Voltage",
+    "Global_intensity",
+    "Sub_metering_1",
+    "Sub_metering_2",
+    "Sub_metering_3",
+]
+
+RUN_CODE = """
+import json, resource, time
+import pandas as pd
+from src.sanity import (LazyFrame, format_datetime, interpolate_column,
+                        resample_data, set_index)
+
+def peak_rss():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+source = pd.read_pickle({path!r})
+before = peak_rss()
+start = time.perf_counter()
+if {lazy!r}:
+    dataframe = (
+        LazyFrame(source)
+        .pipe(format_datetime, col="Date_Time", format={format!r})
+        .pipe(set_index, col="Date_Time")
+        .pipe(interpolate_column)
+        .pipe(resample_data, freq="H")
+        .collect()
+    )
+else:
+    dataframe = (
+        source.pipe(format_datetime, col="Date_Time", format={format!r})
+        .pipe(set_index, col="Date_Time")
+        .pipe(interpolate_column)
+        .pipe(resample_data, freq="H")
+    )
+elapsed = time.perf_counter() - start
+dataframe.to_pickle({result_path!r})
+print(json.dumps([elapsed, peak_rss() - before]))
+"""
+
+
+def get_household_data(n_rows: int, missing: float = 0.01) -> pd.DataFrame:
+    """Minute readings with a string datetime column and ``missing`` gaps."""
+    rng = np.random.default_rng(80)
+    index = pd.date_range("2006-12-16 17:24", periods=n_rows, freq="min")
+    dataframe = pd.DataFrame(
+        rng.gamma(2.0, 1.0, size=(n_rows, len(COLUMNS))), columns=COLUMNS
+    )
+    dataframe = dataframe.mask(rng.random(dataframe.shape) < missing)
+    dataframe.insert(0, "Date_Time", index.strftime("%Y-%m-%d %H:%M:%S"))
+    return dataframe
+
+
+def measure(path: str, lazy: bool, format: str, result_path: str, repeat: int):
+    code = RUN_CODE.format(path=path, lazy=lazy, format=format, result_path=result_path)
+    runs = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        runs.append(json.loads(output.stdout.strip().splitlines()[-1]))
+    return min(runs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n-rows", type=int, default=2_075_259)
+    parser.add_argument("--format", default="%Y-%m-%d %H:%M:%S")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "household.pkl")
+        source = get_household_data(args.n_rows)
+        source.to_pickle(path)
+        size = source.memory_usage(deep=True).sum() / 2**20
+        print(f"{args.n_rows} rows, {size:.1f}MB in memory")
+        results = {}
+        for name, lazy in (("eager", False), ("lazy", True)):
+            result_path = os.path.join(directory, f"{name}.pkl")
+            elapsed, peak = measure(path, lazy, args.format, result_path, args.repeat)
+            results[name] = pd.read_pickle(result_path)
+            print(f"{name:<6} {elapsed:8.3f}s, peak {peak:8.1f}MB")
+        pd.testing.assert_frame_equal(results["eager"], results["lazy"])
+        print("results identical")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Fit/predict timing of the sktime recursive reducer against LagReducer.
+
+Runs on the traffic dataset used by ``run_automl.py``; ``--synthetic`` swaps
+in a generated hourly series of the same shape when the dataset is not
+available offline.
+
+    python -m benchmarks.reduction --window-length 24 --repeat 3
+"""
+
+import argparse
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+from sktime.forecasting.compose import make_reduction
+
+from automl.models.ml_models.customized.reducer import LagReducer
+
+warnings.filterwarnings("ignore")
+
+
+def get_synthetic_data(n_obs: int = 48_204):
+    index = pd.date_range("2012-10-02 09:00", periods=n_obs, freq="H")
+    rng = np.random.default_rng(80)
+    hours = np.arange(n_obs)
+    y = pd.Series(
+        3000 + 2000 * np.sin(2 * np.pi * hours / 24) + rng.normal(0, 300, n_obs),
+        index=index,
+        name="traffic_volume",
+    )
+    x = pd.DataFrame(
+        {
+            "temp": 280 + 10 * np.sin(2 * np.pi * hours / 8760),
+            "rain_1h": rng.exponential(0.1, n_obs),
+            "snow_1h": np.zeros(n_obs),
+            "clouds_all": rng.integers(0, 100, n_obs).astype(float),
+        },
+        index=index,
+    )
+    return y, x
+
+
+def time_forecaster(forecaster, y, x, fh, repeat):
+    n_test = len(fh)
+    y_train, x_train, x_test = y.iloc[:-n_test], x.iloc[:-n_test], x.iloc[-n_test:]
+    fit_times, predict_times = [], []
+    for _ in range(repeat):
+        forecaster = forecaster.clone()
+        start = time.perf_counter()
+        forecaster.fit(y_train, X=x_train, fh=fh)
+        fit_times.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        y_pred = forecaster.predict(fh=fh, X=x_test)
+        predict_times.append(time.perf_counter() - start)
+    return min(fit_times), min(predict_times), np.asarray(y_pred).ravel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--window-length", type=int, default=24)
+    parser.add_argument("--fh", type=int, default=15)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--synthetic", action="store_true")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        y, x = get_synthetic_data()
+    else:
+        from run_automl import get_traffiC_data
+
+        y, x = get_traffiC_data()
+    fh = np.arange(1, args.fh + 1)
+    print(f"y shape {y.shape}, x shape {x.shape}, window_length {args.window_length}")
+
+    forecasters = {
+        "sktime make_reduction": make_reduction(
+            LinearRegression(),
+            window_length=args.window_length,
+            strategy="recursive",
+            pooling="global",
+        ),
+        "LagReducer": LagReducer(LinearRegression(), window_length=args.window_length),
+    }
+    results = {
+        name: time_forecaster(forecaster, y, x, fh, args.repeat)
+        for name, forecaster in forecasters.items()
+    }
+    baseline_fit, baseline_predict, baseline_pred = results["sktime make_reduction"]
+    for name, (fit_time, predict_time, y_pred) in results.items():
+        print(
+            f"{name:<24} fit {fit_time:8.4f}s ({baseline_fit / fit_time:5.1f}x) "
+            f"predict {predict_time:8.4f}s ({baseline_predict / predict_time:5.1f}x) "
+            f"max abs diff {np.abs(y_pred - baseline_pred).max():.2e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Throughput of the CV grid under the previous thread defaults and under the
+``ResourceManager`` budget.
+
+The previous defaults started one worker per CPU and let every estimator use
+all CPUs (``n_jobs=-1``) with unbounded BLAS/OpenMP pools. The managed budget
+gives each of the ``n_workers`` workers ``available_cpus() // n_workers``
+threads. Both runs score the same tree ensembles on the same folds.
+
+    python -m benchmarks.resources --models 6 --folds 5 --repeat 2
+"""
+
+import argparse
+import time
+import warnings
+
+import numpy as np
+from joblib import cpu_count
+from sklearn.ensemble import ExtraTreesRegressor, RandomForestRegressor
+from sktime.forecasting.model_selection import ExpandingWindowSplitter
+from sktime.performance_metrics.forecasting import MeanAbsoluteError
+
+from automl.lifecycle.evaluator import GridEvaluator
+from automl.lifecycle.fold_store import FoldStore
+from automl.models.ml_models.customized.reducer import LagReducer
+from automl.resources import available_cpus, get_cgroup_cpu_quota
+from benchmarks.reduction import get_synthetic_data
+
+warnings.filterwarnings("ignore")
+
+
+class DefaultsEvaluator(GridEvaluator):
+    """Budget of the previous defaults, every layer sized to all CPUs."""
+
+    def get_budget(self, n_tasks: int):
+        return max(1, min(cpu_count(), n_tasks)), cpu_count()
+
+
+def get_forecasters(n_models: int, window_length: int):
+    estimators = [ExtraTreesRegressor, RandomForestRegressor]
+    return [
+        LagReducer(
+            estimators[idx % 2](n_estimators=50, n_jobs=-1, random_state=idx),
+            window_length=window_length,
+        )
+        for idx in range(n_models)
+    ]
+
+
+def time_grid(evaluator, forecasters, store, fh, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = evaluator.evaluate(forecasters, store, "bench", fh)
+        times.append(time.perf_counter() - start)
+    scores = [result["test_MeanAbsoluteError"].mean() for result in results]
+    return min(times), scores
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n-obs", type=int, default=2_000)
+    parser.add_argument("--models", type=int, default=6)
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--window-length", type=int, default=24)
+    parser.add_argument("--fh", type=int, default=15)
+    parser.add_argument("--repeat", type=int, default=2)
+    args = parser.parse_args()
+
+    y, _ = get_synthetic_data(args.n_obs)
+    fh = np.arange(1, args.fh + 1)
+    initial_window = args.n_obs - args.folds * args.fh
+    cv = ExpandingWindowSplitter(fh, initial_window=initial_window, step_length=args.fh)
+    store = FoldStore(y).add_split("bench", cv)
+    forecasters = get_forecasters(args.models, args.window_length)
+    n_tasks = args.models * store.get_n_splits("bench")
+    print(
+        f"cpu_count {cpu_count()}, cgroup quota {get_cgroup_cpu_quota()}, "
+        f"available {available_cpus()}, {n_tasks} tasks"
+    )
+
+    scoring = [MeanAbsoluteError()]
+    evaluators = {
+        "previous defaults": DefaultsEvaluator(scoring),
+        "ResourceManager": GridEvaluator(scoring),
+    }
+    results = {}
+    for name, evaluator in evaluators.items():
+        n_workers, n_threads = evaluator.get_budget(n_tasks)
+        elapsed, scores = time_grid(evaluator, forecasters, store, fh, args.repeat)
+        results[name] = (elapsed, scores)
+        print(
+            f"{name:<18} {n_workers} workers x {n_threads} threads "
+            f"{elapsed:8.3f}s {n_tasks / elapsed:7.2f} tasks/s"
+        )
+    baseline, baseline_scores = results["previous defaults"]
+    managed, managed_scores = results["ResourceManager"]
+    score_diff = np.abs(np.subtract(baseline_scores, managed_scores)).max()
+    print(f"speedup {baseline / managed:.2f}x, max score diff {score_diff:.2e}")
+
+
+if __name__ == "__main__":
+    main()
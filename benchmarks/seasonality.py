@@ -0,0 +1,64 @@
+"""Timing of the seasonality period detection of ``ExtractStats``.
+
+Compares the ``SeasonalityACF`` path (``nlags=(nobs-1)/2``) with the capped
+FFT detector on synthetic hourly series with daily and weekly cycles.
+
+    python -m benchmarks.seasonality --sizes 10000 100000 1000000
+"""
+
+import argparse
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from automl.stat.statistics import ExtractStats
+
+warnings.filterwarnings("ignore")
+
+
+def get_synthetic_series(n_obs: int) -> pd.Series:
+    rng = np.random.default_rng(80)
+    hours = np.arange(n_obs)
+    daily = 10 * np.sin(2 * np.pi * hours / 24)
+    weekly = 5 * np.sin(2 * np.pi * hours / 168)
+    values = 100 + daily + weekly + rng.normal(0, 2, n_obs)
+    index = pd.date_range("2000-01-01", periods=n_obs, freq="H")
+    return pd.Series(values, index=index, name="y")
+
+
+def time_detector(detector, y, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _, significant_sps, lags = detector(y)
+        times.append(time.perf_counter() - start)
+    return min(times), significant_sps, lags
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    extractor = ExtractStats("H")
+    for n_obs in args.sizes:
+        y = get_synthetic_series(n_obs)
+        acf_time, acf_sps, acf_lags = time_detector(
+            extractor.detect_seasonality_periods, y, args.repeat
+        )
+        fft_time, fft_sps, fft_lags = time_detector(
+            extractor.detect_seasonality_periods_fft, y, args.repeat
+        )
+        acf_sps = [sp for sp in acf_sps if sp <= extractor.MAX_SP]
+        print(
+            f"n={n_obs:<9} SeasonalityACF {acf_time:8.4f}s ({acf_lags} lags) "
+            f"FFT {fft_time:8.4f}s ({fft_lags} lags) "
+            f"speedup {acf_time / fft_time:6.1f}x same sps {acf_sps == fft_sps}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Startup cost of ``import automl.schuduler`` and of loading the models.
+
+Every measurement runs in a fresh interpreter, the minimum over ``--repeat``
+runs is reported. "eager models" additionally imports every model module the
+way the registry did before it became lazy; "one model" instantiates a single
+model through ``ModelQuery`` as a ``filter={"ModelId": ...}`` run does. The
+packages taking the most self import time are listed from
+``python -X importtime``.
+
+    python -m benchmarks.startup --repeat 5 --model LightGBM --top 10
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+from collections import Counter
+
+IMPORT_SCHEDULER = "import automl.schuduler"
+
+LOAD_ALL_MODELS = """
+from automl.model_db import ModelQuery
+for spec in ModelQuery.get_model_specs():
+    spec.load()
+"""
+
+LOAD_ONE_MODEL = """
+from automl.model_db import ModelQuery
+from automl.stat.statistics import SeriesStat
+stat = SeriesStat(
+    "D", True, False, True, "additive", 7, [7], [7], [7], 1, 0, False
+)
+models = ModelQuery.select_model_object(stat, {{"ModelId": "{model}"}})
+assert len([model.forecaster for model in models]) == 1
+"""
+
+COUNT_MODEL_MODULES = """
+import sys
+import automl.schuduler
+print(sum(name.startswith("automl.models.ml_models.") for name in sys.modules))
+"""
+
+
+def time_code(code: str, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        timed = (
+            "import time\n_start = time.perf_counter()\n"
+            f"{code}\nprint(time.perf_counter() - _start)"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", timed], capture_output=True, text=True, check=True
+        )
+        times.append(float(output.stdout.split()[-1]))
+    return min(times)
+
+
+def get_slowest_packages(code: str, top: int):
+    """Self import time summed per top level package, from ``-X importtime``."""
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    pattern = re.compile(r"import time:\s+(\d+) \|\s+\d+ \|\s+(\S+)")
+    totals = Counter()
+    for line in output.stderr.splitlines():
+        match = pattern.match(line)
+        if match:
+            totals[match.group(2).split(".")[0]] += int(match.group(1)) / 1e6
+    return totals.most_common(top)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--model", default="LightGBM")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    count = subprocess.run(
+        [sys.executable, "-c", COUNT_MODEL_MODULES],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    print(f"model modules imported by {IMPORT_SCHEDULER}: {count.stdout.strip()}")
+    load_one_model = LOAD_ONE_MODEL.format(model=args.model)
+    cases = {
+        IMPORT_SCHEDULER: IMPORT_SCHEDULER,
+        "+ eager models": IMPORT_SCHEDULER + LOAD_ALL_MODELS,
+        f"+ one model ({args.model})": IMPORT_SCHEDULER + load_one_model,
+    }
+    for name, code in cases.items():
+        print(f"{name:<30} {time_code(code, args.repeat):8.3f}s")
+    print(f"slowest packages of {IMPORT_SCHEDULER}:")
+    for package, seconds in get_slowest_packages(IMPORT_SCHEDULER, args.top):
+        print(f"  {seconds:8.3f}s {package}")
+
+
+if __name__ == "__main__":
+    main()
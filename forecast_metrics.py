@@ -0,0 +1,70 @@
+"""Forecast accuracy metrics computed in one vectorized pass over NumPy
+arrays, with no pandas or package dependency so both ``automl`` and ``src``
+score through them.
+
+``score`` takes the forecasts of several models stacked into a
+``(n_models, n_series, n_steps)`` array and reduces every metric from the
+same residuals, per series, then averages them over the series.
+"""
+
+from typing import Dict, Iterable, Optional, Sequence
+
+import numpy as np
+
+EPS = np.finfo(np.float64).eps
+METRICS = ("mae", "mse", "rmse", "mape", "smape", "mase", "r2")
+
+
+def naive_scale(series: Iterable[np.ndarray], sp: int = 1) -> np.ndarray:
+    """Mean absolute error of the seasonal naive in-sample forecast of every
+    training series, the denominator of MASE."""
+    scales = []
+    for values in series:
+        values = np.asarray(values, dtype=np.float64)
+        scales.append(np.abs(values[sp:] - values[:-sp]).mean())
+    return np.maximum(np.asarray(scales), EPS)
+
+
+def score(
+    y_true: np.ndarray,
+    y_pred: np.ndarray,
+    scale: Optional[np.ndarray] = None,
+    metrics: Sequence[str] = METRICS,
+) -> Dict[str, np.ndarray]:
+    """Scores of every model of ``y_pred`` (``(n_models, n_series, n_steps)``
+    or ``(n_models, n_steps)``) against ``y_true`` (``(n_series, n_steps)`` or
+    ``(n_steps,)``). MASE is ``NaN`` without the per series ``scale``."""
+    unknown = set(metrics) - set(METRICS)
+    if unknown:
+        raise ValueError(f"Unknown metrics {sorted(unknown)}, expected {METRICS}")
+    y_true = np.asarray(y_true, dtype=np.float64)
+    y_pred = np.asarray(y_pred, dtype=np.float64)
+    if y_true.ndim == 1:
+        y_true = y_true[np.newaxis]
+    if y_pred.ndim == 2:
+        y_pred = y_pred[:, np.newaxis]
+    errors = y_true - y_pred
+    abs_errors = np.abs(errors)
+    abs_true = np.abs(y_true)
+    mae = abs_errors.mean(axis=-1)
+    mse = np.square(errors).mean(axis=-1)
+    per_series = {"mae": mae, "mse": mse, "rmse": np.sqrt(mse)}
+    if "mape" in metrics:
+        per_series["mape"] = (abs_errors / np.maximum(abs_true, EPS)).mean(axis=-1)
+    if "smape" in metrics:
+        denominator = np.maximum(abs_true + np.abs(y_pred), EPS)
+        per_series["smape"] = (2 * abs_errors / denominator).mean(axis=-1)
+    if "mase" in metrics:
+        if scale is None:
+            per_series["mase"] = np.full_like(mae, np.nan)
+        else:
+            per_series["mase"] = mae / np.asarray(scale, dtype=np.float64)
+    if "r2" in metrics:
+        centered = y_true - y_true.mean(axis=-1, keepdims=True)
+        total = np.square(centered).sum(axis=-1)
+        residual = mse * y_true.shape[-1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r2 = 1 - residual / total
+        # a constant target scores 1 when predicted exactly, like sklearn
+        per_series["r2"] = np.where(total > 0, r2, (residual == 0).astype(float))
+    return {name: per_series[name].mean(axis=-1) for name in metrics}
@@ -4,8 +4,8 @@ import warnings
 
 from automl.schuduler import Schuduler
 from src.load_datasets import load_air_polution_data, load_traffic_data
-from src.sanity import (format_datetime, interpolate_column, resample_data,
-                        select_column, set_index)
+from src.sanity import (LazyFrame, format_datetime, interpolate_column,
+                        resample_data, select_column, set_index)
 
 logging.basicConfig(level=logging.INFO)
 
@@ -16,11 +16,12 @@ warnings.filterwarnings("ignore")
 
 def get_air_polution_data():
     dataframe = (
-        load_air_polution_data()
+        LazyFrame(load_air_polution_data)
         .pipe(format_datetime, col="Date_Time")
         .pipe(set_index, col="Date_Time")
         .pipe(interpolate_column, cols="pollution")
         .pipe(resample_data, freq="H")
+        .collect()
     )
     null_count = dataframe.isna().sum().sum()
     logger.info(f"NULL Count {null_count}")
@@ -30,7 +31,7 @@ def get_air_polution_data():
 
 def get_traffiC_data():
     dataframe = (
-        load_traffic_data()
+        LazyFrame(load_traffic_data)
         .pipe(
             select_column,
             cols=[
@@ -46,6 +47,7 @@ def get_traffiC_data():
         .pipe(set_index, col="date_time")
         .pipe(resample_data, freq="H")
         .pipe(interpolate_column)
+        .collect()
     )
     null_count = dataframe.isna().sum().sum()
     print(dataframe.head())
@@ -1,29 +1,42 @@
+import logging
 from typing import List
 
 import numpy as np
-from sklearn.metrics import (mean_absolute_error,
-                             mean_absolute_percentage_error,
-                             mean_squared_error, r2_score)
 
-__EPSILON = 1e-10
+from forecast_metrics import METRICS, naive_scale, score
 
+logger = logging.getLogger(__name__)
 
-__METRICS = {
-    "mae": mean_absolute_error,
-    "rmse": lambda r, p: mean_squared_error(r, p, squared=False),
-    "mape": mean_absolute_percentage_error,
-    "r2": r2_score,
-}
 __default_matrics = ("mae", "rmse", "mape", "r2")
 
 
-def evaluate(actual: np.ndarray, predicted: np.ndarray, metrics: List[str] = None):
-    results = {}
+def evaluate(
+    actual: np.ndarray,
+    predicted: np.ndarray,
+    metrics: List[str] = None,
+    train: np.ndarray = None,
+):
+    """Metrics computed in one pass. ``predicted`` holds a forecast, as a
+    vector or an ``(n, 1)`` column, or one forecast per row of a
+    ``(n_forecasts, n)`` array, scored into arrays. MASE needs the ``train``
+    series."""
     metrics = __default_matrics if metrics is None else metrics
+    predicted = np.asarray(predicted, dtype=np.float64)
+    if predicted.ndim == 2 and predicted.shape[1] == 1:
+        predicted = predicted.ravel()
+    scale = None if train is None else naive_scale([np.ravel(train)])
+    known = [name for name in metrics if name in METRICS]
+    try:
+        scores = score(np.ravel(actual), np.atleast_2d(predicted), scale, known)
+    except Exception as err:
+        scores = {}
+        logger.warning(f"Unable to compute metrics {known}: {err}")
+    results = {}
     for name in metrics:
-        try:
-            results[name] = __METRICS[name](actual, predicted)
-        except Exception as err:
+        if name not in scores:
             results[name] = np.nan
-            print(f"Unable to compute metric {name}: {err}")
+            if name not in known:
+                logger.warning(f"Unable to compute metric {name}: unknown metric")
+        else:
+            results[name] = scores[name] if predicted.ndim > 1 else scores[name][0]
     return results
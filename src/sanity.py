@@ -1,11 +1,18 @@
+import copy
 import logging
-from typing import List, Union
+from typing import Callable, List, Union
 
 import pandas as pd
 
 logger = logging.getLogger(__name__)
 
 
+def get_copy(dataframe: pd.DataFrame) -> pd.DataFrame:
+    """Deep copy of ``dataframe``, a lazy one when copy-on-write is enabled:
+    its columns are only copied once they are modified."""
+    return dataframe.copy(deep=not pd.options.mode.copy_on_write)
+
+
 def load_data(csv_path: str) -> pd.DataFrame:
     dataframe = pd.read_csv(csv_path)
     logger.info(f"DF Shape {dataframe.shape}")
@@ -13,7 +20,7 @@ def load_data(csv_path: str) -> pd.DataFrame:
 
 
 def select_column(dataframe: pd.DataFrame, cols: Union[List[str], str]) -> pd.DataFrame:
-    dataframe_ = dataframe.copy(deep=True)
+    dataframe_ = get_copy(dataframe)
     if isinstance(cols, list) is False:
         cols = [cols]
     dataframe_ = dataframe_[cols]
@@ -24,14 +31,14 @@ def select_column(dataframe: pd.DataFrame, cols: Union[List[str], str]) -> pd.Da
 def format_datetime(
     dataframe: pd.DataFrame, col: str, format: str = "mixed"
 ) -> pd.DataFrame:
-    dataframe_ = dataframe.copy(deep=True)
+    dataframe_ = get_copy(dataframe)
     dataframe_[col] = pd.to_datetime(dataframe[col], format=format)
     logger.info(f"DF Shape {dataframe_.shape}")
     return dataframe_
 
 
 def create_index(dataframe: pd.DataFrame, col: str, format: str = None) -> pd.DataFrame:
-    dataframe_ = dataframe.copy(deep=True)
+    dataframe_ = get_copy(dataframe)
     dataframe_["Index"] = pd.to_datetime(dataframe_.pop(col), format=format)
     dataframe_.set_index(keys="Index", inplace=True)
     logger.info(f"DF Shape {dataframe_.shape}")
@@ -39,7 +46,7 @@ def create_index(dataframe: pd.DataFrame, col: str, format: str = None) -> pd.Da
 
 
 def set_index(dataframe: pd.DataFrame, col: str) -> pd.DataFrame:
-    dataframe_ = dataframe.copy(deep=True)
+    dataframe_ = get_copy(dataframe)
     dataframe_.set_index(keys=col, drop=True, inplace=True)
     dataframe_.sort_index(ascending=True)
     logger.info(f"DF Shape {dataframe_.shape}")
@@ -47,14 +54,14 @@ def set_index(dataframe: pd.DataFrame, col: str) -> pd.DataFrame:
 
 
 def resample_data(dataframe: pd.DataFrame, freq: str = "D") -> pd.DataFrame:
-    dataframe_ = dataframe.copy(deep=True)
+    dataframe_ = get_copy(dataframe)
     dataframe_ = dataframe_.resample(freq).mean(numeric_only=True)
     logger.info(f"DF Shape {dataframe_.shape}")
     return dataframe_
 
 
 def replace_null(dataframe: pd.DataFrame, method: str = "backfill") -> pd.DataFrame:
-    dataframe_ = dataframe.copy(deep=True)
+    dataframe_ = get_copy(dataframe)
     if dataframe_.isna().sum().sum() == 0:
         logger.info("No Null Value Found")
         return dataframe_
@@ -64,14 +71,14 @@ def replace_null(dataframe: pd.DataFrame, method: str = "backfill") -> pd.DataFr
 
 
 def drop_indicies(dataframe: pd.DataFrame) -> pd.DataFrame:
-    dataframe_ = dataframe.copy(deep=True)
+    dataframe_ = get_copy(dataframe)
     dataframe_.reset_index(drop=True, inplace=True)
     logger.info(f"DF Shape {dataframe_.shape}")
     return dataframe_
 
 
 def interpolate_column(dataframe: pd.DataFrame, cols: str = None) -> pd.DataFrame:
-    dataframe_ = dataframe.copy(deep=True)
+    dataframe_ = get_copy(dataframe)
     if dataframe.isna().sum().sum() == 0:
         return dataframe_
     cols = dataframe_.columns.to_list() if cols is None else cols
@@ -86,7 +93,7 @@ def interpolate_column(dataframe: pd.DataFrame, cols: str = None) -> pd.DataFram
 
 def fill_missing_dates(dataframe: pd.DataFrame, freq: str = "D") -> pd.DataFrame:
     # Data has to be indexed , and freq is original data freq
-    dataframe_ = dataframe.copy(deep=True)
+    dataframe_ = get_copy(dataframe)
     dataframe_ = dataframe.resample(freq).sum()
     logger.info(f"DF Shape {dataframe_.shape}")
     return dataframe_
@@ -95,7 +102,7 @@ def fill_missing_dates(dataframe: pd.DataFrame, freq: str = "D") -> pd.DataFrame
 def cast_datetime_column(dataframe: pd.DataFrame):
     from pandas.errors import ParserError
 
-    dataframe_ = dataframe.copy(deep=True)
+    dataframe_ = get_copy(dataframe)
     for c in dataframe_.columns[dataframe_.dtypes == "object"]:
         try:
             dataframe_[c] = pd.to_datetime(
@@ -112,7 +119,7 @@ def cast_datetime_column(dataframe: pd.DataFrame):
 
 
 def put_target_columns_to_end(dataframe: pd.DataFrame, col: str) -> pd.DataFrame:
-    dataframe_ = dataframe.copy(deep=True)
+    dataframe_ = get_copy(dataframe)
     other_cols = set(dataframe_.columns.tolist()) - set([col])
     rearranged_col = list(other_cols) + [col]
     dataframe_ = dataframe_[rearranged_col]
@@ -121,7 +128,7 @@ def put_target_columns_to_end(dataframe: pd.DataFrame, col: str) -> pd.DataFrame
 
 
 def remove_space_from_columns_name(dataframe: pd.DataFrame) -> pd.DataFrame:
-    dataframe_ = dataframe.copy(deep=True)
+    dataframe_ = get_copy(dataframe)
     new_columns = {col: str(col).strip() for col in dataframe_.columns.tolist()}
     dataframe_.rename(columns=new_columns, inplace=True)
     logger.info(f"DF Shape {dataframe.shape}")
@@ -129,7 +136,48 @@ def remove_space_from_columns_name(dataframe: pd.DataFrame) -> pd.DataFrame:
 
 
 def rename_column(dataframe: pd.DataFrame, col: str, new_column: str) -> pd.DataFrame:
-    dataframe_ = dataframe.copy(deep=True)
+    dataframe_ = get_copy(dataframe)
     dataframe_.rename(columns={col: new_column}, inplace=True)
     logger.info(f"DF Shape {dataframe.shape}")
     return dataframe_
+
+
+class LazyFrame:
+    """Deferred execution of preprocessing steps under copy-on-write.
+
+    ``LazyFrame(load_data, csv_path).pipe(select_column, cols=...)`` records
+    the same chain as ``DataFrame.pipe`` without running it. ``pipe`` returns
+    a new ``LazyFrame``, so a chain can be branched without the branches
+    seeing each other's steps. ``collect`` loads the data and runs every step
+    with copy-on-write enabled, so the steps share the unmodified columns
+    instead of copying the whole frame each, and the result is materialized
+    once.
+    """
+
+    def __init__(self, source: Union[pd.DataFrame, Callable], *args, **kwargs):
+        self.source = source
+        self.source_args = (args, kwargs)
+        self.steps = ()
+
+    def pipe(self, func: Callable, *args, **kwargs) -> "LazyFrame":
+        lazy_frame = copy.copy(self)
+        lazy_frame.steps = self.steps + ((func, args, kwargs),)
+        return lazy_frame
+
+    def get_plan(self) -> List[str]:
+        return [func.__name__ for func, _, _ in self.steps]
+
+    def collect(self) -> pd.DataFrame:
+        logger.info(f"Running {' -> '.join(self.get_plan())}")
+        with pd.option_context("mode.copy_on_write", True):
+            if isinstance(self.source, pd.DataFrame):
+                dataframe = self.source.copy(deep=False)
+            else:
+                args, kwargs = self.source_args
+                dataframe = self.source(*args, **kwargs)
+            for func, args, kwargs in self.steps:
+                dataframe = func(dataframe, *args, **kwargs)
+        if isinstance(self.source, pd.DataFrame):
+            # the result may still share unmodified columns with the source
+            dataframe = dataframe.copy(deep=True)
+        return dataframe
@@ -0,0 +1,44 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def quiet_warnings():
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        yield
+
+
+@pytest.fixture
+def hourly_data():
+    """Daily seasonal hourly series with two exogenous columns."""
+    rng = np.random.default_rng(80)
+    n_obs = 300
+    time_idx = np.arange(n_obs)
+    index = pd.date_range("2020-01-01", periods=n_obs, freq="h")
+    y = pd.Series(
+        50 + 10 * np.sin(2 * np.pi * time_idx / 24) + rng.normal(0, 1, n_obs),
+        index=index,
+        name="y",
+    )
+    x = pd.DataFrame(
+        {"a": rng.normal(size=n_obs), "b": np.cos(2 * np.pi * time_idx / 24)},
+        index=index,
+    )
+    return y, x
+
+
+@pytest.fixture
+def settings(tmp_path):
+    """Fast ``Schuduler`` settings comparing and tuning two linear models."""
+    return {
+        "model_dir": str(tmp_path),
+        "model_select_count": 2,
+        "cv_split": 2,
+        "random_search_iter": 2,
+        "n_jobs": 1,
+        "filter": {"ModelId": ["Ridge", "Lasso"]},
+    }
@@ -0,0 +1,105 @@
+import os
+import threading
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+
+from automl.artifacts import (
+    find_model_path,
+    get_model_path,
+    is_artifact,
+    list_models,
+    load_model,
+    read_manifest,
+    read_metadata,
+    save_model,
+)
+from automl.models.ml_models.customized.reducer import LagReducer
+
+FH = [1, 2, 3]
+
+
+@pytest.fixture
+def model():
+    rng = np.random.default_rng(80)
+    index = pd.period_range("2020-01-01", periods=200, freq="H")
+    y = pd.Series(rng.normal(size=200).cumsum(), index=index, name="y")
+    estimator = RandomForestRegressor(n_estimators=5, random_state=80)
+    return LagReducer(estimator, window_length=12).fit(y, fh=FH)
+
+
+@pytest.mark.parametrize("mmap_mode", ["c", "r", None])
+def test_round_trip_predicts_the_same(tmp_path, model, mmap_mode):
+    path = get_model_path(str(tmp_path), "exp", "RandomForest")
+    save_model(model, path, {"score": 1.5})
+    loaded = load_model(path, mmap_mode=mmap_mode)
+    pd.testing.assert_series_equal(loaded.predict(FH), model.predict(FH))
+    assert read_metadata(path) == {"score": 1.5}
+
+
+def test_large_arrays_are_stored_apart(tmp_path, model):
+    path = str(tmp_path / "exp_RandomForest")
+    save_model(model, path)
+    manifest = read_manifest(path)
+    assert manifest["arrays"]
+    for entry in manifest["arrays"]:
+        assert entry["nbytes"] >= 4096
+        assert os.path.isfile(os.path.join(path, entry["file"]))
+
+
+def test_save_replaces_previous_artifact(tmp_path, model):
+    path = str(tmp_path / "exp_RandomForest")
+    for n_updates in range(3):
+        save_model(model, path, {"n_updates": n_updates})
+    assert read_metadata(path) == {"n_updates": 2}
+    assert os.path.islink(path)
+    assert list_models(str(tmp_path)) == [("exp", "RandomForest")]
+    # the current version and the previous one
+    assert len(os.listdir(tmp_path)) == 3
+
+
+def test_unversioned_artifact_is_replaced(tmp_path, model):
+    path = str(tmp_path / "exp_RandomForest")
+    save_model(model, path, {"n_updates": 0})
+    os.rename(os.path.realpath(path), str(tmp_path / "unversioned"))
+    os.remove(path)
+    os.rename(str(tmp_path / "unversioned"), path)
+    save_model(model, path, {"n_updates": 1})
+    assert os.path.islink(path)
+    assert read_metadata(path) == {"n_updates": 1}
+
+
+def test_loads_never_see_a_missing_artifact(tmp_path, model):
+    path = str(tmp_path / "exp_RandomForest")
+    save_model(model, path)
+    expected = model.predict(FH)
+    stop = threading.Event()
+
+    def save_repeatedly():
+        while not stop.is_set():
+            save_model(model, path)
+
+    saver = threading.Thread(target=save_repeatedly)
+    saver.start()
+    try:
+        for _ in range(50):
+            assert find_model_path(str(tmp_path), "exp", "RandomForest") == path
+            pd.testing.assert_series_equal(load_model(path).predict(FH), expected)
+    finally:
+        stop.set()
+        saver.join()
+
+
+def test_legacy_pickles_still_load(tmp_path, model):
+    joblib.dump(model, tmp_path / "old_Ridge.pkl")
+    save_model(model, get_model_path(str(tmp_path), "new", "RandomForest"))
+    assert list_models(str(tmp_path)) == [("new", "RandomForest"), ("old", "Ridge")]
+    legacy_path = find_model_path(str(tmp_path), "old", "Ridge")
+    assert not is_artifact(legacy_path)
+    assert read_metadata(legacy_path) == {}
+    pd.testing.assert_series_equal(
+        load_model(legacy_path).predict(FH), model.predict(FH)
+    )
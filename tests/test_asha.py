@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import randint
+from sklearn.ensemble import RandomForestRegressor
+from sktime.forecasting.model_selection import ExpandingWindowSplitter
+
+from automl.lifecycle.asha import (
+    ASHATuner,
+    SuccessiveHalving,
+    evaluate_trial,
+    set_fidelity,
+)
+from automl.lifecycle.evaluator import get_cv_score
+from automl.lifecycle.fold_store import FoldStore
+from automl.lifecycle.search import RandomSearcher
+from automl.models.ml_models.customized.reducer import LagReducer
+
+FH = np.arange(1, 7)
+
+
+class ForestPipeline:
+    hyper_parameters = {"window_length": randint(4, 16)}
+
+    @property
+    def forecaster(self):
+        estimator = RandomForestRegressor(n_estimators=9, random_state=80)
+        return LagReducer(estimator, window_length=8)
+
+
+@pytest.fixture
+def store():
+    rng = np.random.default_rng(80)
+    index = pd.period_range("2020-01-01", periods=200, freq="H")
+    values = 10 * np.sin(np.arange(200) * 2 * np.pi / 12) + rng.normal(0, 1, 200)
+    y = pd.Series(values, index=index, name="y")
+    cv = ExpandingWindowSplitter(FH, initial_window=170, step_length=6)
+    return FoldStore(y).add_split("tune", cv)
+
+
+def test_promotes_top_share_of_a_rung():
+    halving = SuccessiveHalving(n_rungs=2, eta=3)
+    assert [halving.get_fraction(rung) for rung in range(3)] == [1 / 9, 1 / 3, 1]
+    for trial_id, score in enumerate([3.0, 1.0, np.inf]):
+        halving.report(trial_id, 0, score)
+    assert halving.get_promotion() == (1, 1)
+    assert halving.get_promotion() is None
+    halving.report(1, 1, 0.5)
+    assert halving.get_best() == (1, 1, 0.5)
+
+
+def test_fidelity_scales_ensemble_and_window(store):
+    forecaster = set_fidelity(ForestPipeline().forecaster, 1 / 3)
+    assert forecaster.get_params()["estimator__n_estimators"] == 3
+    eval_data = evaluate_trial(
+        ForestPipeline().forecaster, store, "tune", FH, ["mae"], 1, 1 / 3, 80
+    )
+    assert eval_data["len_train_window"].tolist() == [80] * 5
+    eval_data = evaluate_trial(
+        ForestPipeline().forecaster, store, "tune", FH, ["mae"], 1, 1 / 3, 10
+    )
+    assert eval_data["len_train_window"].tolist() == [57, 59, 61, 63, 65]
+
+
+def test_returns_full_fidelity_score(store):
+    pipeline = ForestPipeline()
+    searcher = RandomSearcher(pipeline.hyper_parameters, 9)
+    fidelities = []
+    tuner = ASHATuner(["mae"], n_rungs=2, eta=3)
+    best_params, score = tuner.tune(
+        pipeline,
+        searcher,
+        store,
+        "tune",
+        FH,
+        budget=2,
+        callback=lambda params, fraction, _: fidelities.append(fraction),
+    )
+    assert fidelities.count(1 / 9) == 9
+    assert fidelities[-1] == 1.0
+    forecaster = pipeline.forecaster.set_params(**best_params)
+    eval_data = evaluate_trial(forecaster, store, "tune", FH, ["mae"], 1)
+    assert score == pytest.approx(get_cv_score(eval_data, "test_mae"))
@@ -0,0 +1,81 @@
+import os
+import signal
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+import automl.batch
+from automl.batch import BatchRunner, iter_panel
+
+
+def get_series(seed: int, n_obs: int = 240):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2020-01-01", periods=n_obs, freq="h")
+    time_idx = np.arange(n_obs)
+    y = pd.Series(
+        50 + 10 * np.sin(2 * np.pi * time_idx / 24) + rng.normal(0, 1, n_obs),
+        index=index,
+        name="y",
+    )
+    x = pd.DataFrame(
+        {"a": rng.normal(size=n_obs), "b": np.cos(2 * np.pi * time_idx / 24)},
+        index=index,
+    )
+    return y, x
+
+
+def test_iter_panel_splits_by_series():
+    y, x = get_series(80, 10)
+    panel_y = pd.concat({"a": y, "b": y + 1})
+    panel_x = pd.concat({"a": x, "b": x})
+    items = list(iter_panel(panel_y, panel_x))
+    assert [series_id for series_id, _, _ in items] == ["a", "b"]
+    pd.testing.assert_series_equal(items[1][1], y + 1)
+    pd.testing.assert_frame_equal(items[1][2], x)
+
+
+def test_series_trials_are_merged_into_shared_database(tmp_path):
+    settings = {
+        "model_dir": str(tmp_path),
+        "model_select_count": 1,
+        "cv_split": 2,
+        "random_search_iter": 2,
+        "filter": {"ModelId": ["Ridge"]},
+    }
+    data = {f"s{seed}": get_series(seed) for seed in range(3)}
+    result = (
+        BatchRunner(settings, max_workers=3).set_fh(12).set_frequency("H").run(data)
+    )
+    assert (result["status"] == "done").all(), result.get("error")
+    with sqlite3.connect(tmp_path / "trials.sqlite") as conn:
+        query = "SELECT COUNT(DISTINCT series_key) FROM trials"
+        assert conn.execute(query).fetchone()[0] == 3
+    assert os.listdir(tmp_path / ".trials") == []
+
+
+def test_killed_series_fails_alone(tmp_path, monkeypatch):
+    settings = {
+        "model_dir": str(tmp_path),
+        "model_select_count": 1,
+        "cv_split": 2,
+        "random_search_iter": 1,
+        "filter": {"ModelId": ["Ridge"]},
+    }
+    run_series = automl.batch.run_series
+
+    def crashing_run_series(settings, exp_id, *args):
+        if exp_id.endswith("_s1"):
+            os.kill(os.getpid(), signal.SIGKILL)
+        return run_series(settings, exp_id, *args)
+
+    monkeypatch.setattr(automl.batch, "run_series", crashing_run_series)
+    data = {f"s{seed}": get_series(seed) for seed in range(4)}
+    result = (
+        BatchRunner(settings, max_workers=2).set_fh(12).set_frequency("H").run(data)
+    )
+    status = dict(zip(result["series_id"], result["status"]))
+    assert status == {"s0": "done", "s1": "failed", "s2": "done", "s3": "done"}
+    error = result.set_index("series_id").loc["s1", "error"]
+    assert "WorkerDied" in error
+    assert os.listdir(tmp_path / ".trials") == []
@@ -0,0 +1,34 @@
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+
+from automl.models.ml_models.customized.reducer import design_matrix, recursive_predict
+
+
+def predict_one(estimator, window: np.ndarray, n_steps: int, X_future=None):
+    """Recursion of a single context, one row per ``predict`` call."""
+    history, window_length = list(window), len(window)
+    y_pred = []
+    for step in range(n_steps):
+        row = np.array(history[-window_length:][::-1])
+        if X_future is not None:
+            row = np.concatenate([row, X_future[step]])
+        value = estimator.predict(row.reshape(1, -1))[0]
+        history.append(value)
+        y_pred.append(value)
+    return np.array(y_pred)
+
+
+def test_batched_recursion_matches_one_context_at_a_time():
+    rng = np.random.default_rng(80)
+    y = rng.normal(size=300).cumsum()
+    X = rng.normal(size=(300, 2))
+    features, targets = design_matrix(y, 8, X)
+    estimator = RandomForestRegressor(n_estimators=10, random_state=80)
+    estimator.fit(features, targets.ravel())
+    windows = np.lib.stride_tricks.sliding_window_view(y, 8)[[0, 50, 100, 150]]
+    X_future = rng.normal(size=(4, 5, 2))
+    y_pred = recursive_predict(estimator, windows, 5, X_future)
+    assert y_pred.shape == (4, 5)
+    for context in range(4):
+        expected = predict_one(estimator, windows[context], 5, X_future[context])
+        np.testing.assert_allclose(y_pred[context], expected)
@@ -0,0 +1,98 @@
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from automl.checkpoint import Checkpoint, fingerprint
+from automl.lifecycle.compare_model import ModelComparator
+from automl.lifecycle.hyperparams_tuner import HyperParamsTuner
+from automl.schuduler import Schuduler
+from automl.settings import SchudulerState
+
+FH = 12
+
+
+def get_schuduler(settings, y, x):
+    return (
+        Schuduler(settings)
+        .set_exp_id("exp")
+        .set_y(y)
+        .set_x(x)
+        .set_fh(FH)
+        .set_frequency("H")
+    )
+
+
+def fail(*args, **kwargs):
+    raise AssertionError("stage recomputed instead of restored")
+
+
+def test_fingerprint_follows_content():
+    y = pd.Series([1.0, 2.0, 3.0])
+    assert fingerprint(y, {"a": 1}) == fingerprint(y.copy(), {"a": 1})
+    assert fingerprint(y, {"a": 1}) != fingerprint(y + 1, {"a": 1})
+    assert fingerprint(y, {"a": 1}) != fingerprint(y, {"a": 2})
+
+
+def test_state_is_monotonic_and_keyed(tmp_path):
+    directory = str(tmp_path / "exp")
+    checkpoint = Checkpoint(directory, "key").save("stat", {"sp": 24})
+    checkpoint.set_state(SchudulerState.Compare_Model)
+    checkpoint.set_state(SchudulerState.Extracting_Stat)
+    assert Checkpoint(directory, "key").get_state() == SchudulerState.Compare_Model
+    assert Checkpoint(directory, "key").load("stat") == {"sp": 24}
+    assert Checkpoint.open(directory).key == "key"
+    changed = Checkpoint(directory, "other")
+    assert changed.get_state() == SchudulerState.SetUP
+    assert not changed.exists("stat")
+    assert Checkpoint.open(str(tmp_path / "missing")) is None
+
+
+def test_invalidate_rolls_back_and_removes_outputs(tmp_path):
+    checkpoint = Checkpoint(str(tmp_path), "key")
+    checkpoint.save("compare_result", 1).save("tuned_Ridge", 2).save("tuned_models", 3)
+    checkpoint.set_state(SchudulerState.Saving_Model)
+    checkpoint.invalidate(SchudulerState.HyperParameter_Model, "tuned_")
+    assert checkpoint.get_state() == SchudulerState.Compare_Model
+    assert checkpoint.exists("compare_result")
+    assert not checkpoint.exists("tuned_Ridge")
+    assert not checkpoint.exists("tuned_models")
+
+
+def test_rerun_resumes_from_checkpoint(settings, hourly_data, monkeypatch):
+    y, x = hourly_data
+    app = get_schuduler(settings, y, x).extract_statistics().compare_models()
+    app.tune_hyperparameters().save_tuned_models()
+    state_path = os.path.join(settings["model_dir"], "exp", "state.json")
+    with open(state_path) as state_file:
+        assert json.load(state_file)["state"] == SchudulerState.Saving_Model
+    monkeypatch.setattr(ModelComparator, "compare", fail)
+    monkeypatch.setattr(HyperParamsTuner, "tune_model", fail)
+    resumed = get_schuduler(settings, y, x).extract_statistics().compare_models()
+    resumed.tune_hyperparameters()
+    pd.testing.assert_frame_equal(resumed._result, app._result)
+    assert [name for name, _, _ in resumed.get_tuned_models()] == [
+        name for name, _, _ in app.get_tuned_models()
+    ]
+
+
+def test_changed_inputs_recompute(settings, hourly_data, monkeypatch):
+    y, x = hourly_data
+    get_schuduler(settings, y, x).extract_statistics().compare_models()
+    monkeypatch.setattr(ModelComparator, "compare", fail)
+    with pytest.raises(AssertionError, match="recomputed"):
+        get_schuduler(settings, y + 1, x).extract_statistics().compare_models()
+
+
+def test_update_invalidates_tuning(settings, hourly_data):
+    y, x = hourly_data
+    train_y, train_x = y.iloc[:-24], x.iloc[:-24]
+    app = get_schuduler(settings, train_y, train_x).extract_statistics()
+    app.compare_models().tune_hyperparameters().save_tuned_models()
+    Schuduler(settings).set_exp_id("exp").update_models(
+        y.iloc[-24:], x.iloc[-24:], save=True
+    )
+    checkpoint = Checkpoint.open(os.path.join(settings["model_dir"], "exp"))
+    assert checkpoint.get_state() == SchudulerState.Compare_Model
+    assert not checkpoint.exists("tuned_models")
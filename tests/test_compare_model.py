@@ -0,0 +1,57 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+from sktime.forecasting.naive import NaiveForecaster
+
+from automl.lifecycle.compare_model import ModelComparator
+from automl.lifecycle.evaluator import GridEvaluator
+
+STRATEGIES = ["drift", "last", "mean"]
+
+
+@pytest.fixture
+def y():
+    rng = np.random.default_rng(80)
+    index = pd.period_range("2020-01-01", periods=120, freq="H")
+    values = 0.5 * np.arange(120) + rng.normal(0, 0.5, 120)
+    return pd.Series(values, index=index, name="y")
+
+
+def get_comparator(y, elimination_rate: float) -> ModelComparator:
+    return (
+        ModelComparator(1, 4, "mae", n_jobs=1, elimination_rate=elimination_rate)
+        .set_y(y)
+        .set_fh(6)
+    )
+
+
+def get_models():
+    return [
+        SimpleNamespace(name=strategy, forecaster=NaiveForecaster(strategy=strategy))
+        for strategy in STRATEGIES
+    ]
+
+
+def test_race_keeps_best_models_with_full_grid_scores(y):
+    comparator = get_comparator(y, elimination_rate=0.5)
+    store = comparator.get_fold_store("compare", len(y))
+    evaluator = GridEvaluator(["mae"], n_jobs=1)
+    survivors, eval_list = comparator.race(evaluator, get_models(), store)
+    assert [model.name for model in survivors] == ["drift"]
+    full = evaluator.evaluate(
+        [NaiveForecaster(strategy="drift")], store, "compare", comparator.fh
+    )
+    columns = ["fold", "test_mae", "len_train_window"]
+    pd.testing.assert_frame_equal(eval_list[0][columns], full[0][columns])
+
+
+def test_race_never_drops_below_select_count(y):
+    comparator = get_comparator(y, elimination_rate=0.9)
+    comparator.model_select_count = 2
+    store = comparator.get_fold_store("compare", len(y))
+    evaluator = GridEvaluator(["mae"], n_jobs=1)
+    survivors, eval_list = comparator.race(evaluator, get_models(), store)
+    assert [model.name for model in survivors] == ["drift", "last"]
+    assert [len(eval_data) for eval_data in eval_list] == [4, 4]
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+from sktime.forecasting.base import ForecastingHorizon
+from sktime.forecasting.model_evaluation import evaluate
+from sktime.forecasting.model_selection import ExpandingWindowSplitter
+from sktime.forecasting.naive import NaiveForecaster
+from sktime.performance_metrics.forecasting import MeanAbsoluteError
+
+from automl.lifecycle.evaluator import GridEvaluator
+from automl.lifecycle.fold_store import FoldStore
+from automl.models.ml_models.customized.reducer import LagReducer
+
+FH = ForecastingHorizon([1, 2, 3, 4])
+
+
+@pytest.fixture
+def y():
+    rng = np.random.default_rng(80)
+    index = pd.period_range("2020-01-01", periods=96, freq="H")
+    values = 10 + np.sin(np.arange(96) / 4) + rng.normal(0, 0.1, 96)
+    return pd.Series(values, index=index, name="y")
+
+
+@pytest.fixture
+def cv():
+    return ExpandingWindowSplitter(FH, initial_window=60, step_length=4)
+
+
+def get_forecasters():
+    return [
+        NaiveForecaster(strategy="last"),
+        LagReducer(LinearRegression(), window_length=8),
+    ]
+
+
+def test_scores_match_sktime_refit(y, cv):
+    store = FoldStore(y).add_split("cmp", cv)
+    eval_list = GridEvaluator(["mae"], n_jobs=1).evaluate(
+        get_forecasters(), store, "cmp", FH
+    )
+    for forecaster, eval_data in zip(get_forecasters(), eval_list):
+        expected = evaluate(
+            forecaster, cv, y, strategy="refit", scoring=MeanAbsoluteError()
+        )
+        np.testing.assert_allclose(
+            eval_data["test_mae"], expected["test_MeanAbsoluteError"], rtol=1e-12
+        )
+
+
+def test_parallel_grid_matches_serial(y, cv):
+    store = FoldStore(y).add_split("cmp", cv)
+    serial = GridEvaluator(["mae", "rmse"], n_jobs=1).evaluate(
+        get_forecasters(), store, "cmp", FH
+    )
+    parallel = GridEvaluator(["mae", "rmse"], n_jobs=2, backend="threading").evaluate(
+        get_forecasters(), store, "cmp", FH
+    )
+    for expected, eval_data in zip(serial, parallel):
+        assert eval_data["fold"].tolist() == list(range(cv.get_n_splits(y)))
+        pd.testing.assert_frame_equal(
+            eval_data[["fold", "test_mae", "test_rmse"]],
+            expected[["fold", "test_mae", "test_rmse"]],
+        )
@@ -0,0 +1,89 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.preprocessing import MinMaxScaler
+from sktime.forecasting.model_selection import ExpandingWindowSplitter
+from sktime.transformations.series.adapt import TabularToSeriesAdaptor
+from sktime.transformations.series.impute import Imputer
+
+from automl.lifecycle.fold_store import FoldStore
+
+FH = [1, 2, 3, 4, 5]
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(80)
+    index = pd.date_range("2020-01-01", periods=80, freq="H")
+    y = pd.Series(rng.normal(size=80).cumsum(), index=index, name="y")
+    x = pd.DataFrame(
+        rng.gamma(2.0, 1.0, size=(80, 3)), index=index, columns=list("abc")
+    )
+    x = x.mask(rng.random(x.shape) < 0.1)
+    x.iloc[0, 0] = np.nan
+    return y, x
+
+
+@pytest.fixture
+def cv():
+    return ExpandingWindowSplitter(FH, initial_window=50, step_length=5)
+
+
+def pipeline_transform(x_train, x_test, scaled: bool):
+    """Exogenous steps of the model pipelines: fit on train, applied to test."""
+    transformer = Imputer(method="ffill", random_state=80)
+    if scaled:
+        transformer = transformer * TabularToSeriesAdaptor(MinMaxScaler())
+    return transformer.fit_transform(x_train), transformer.transform(x_test)
+
+
+@pytest.mark.parametrize("scaled", [False, True])
+def test_folds_match_pipeline_steps(data, cv, scaled):
+    y, x = data
+    store = FoldStore(y, x).add_split("cmp", cv)
+    for fold_idx, (train, test) in enumerate(cv.split(y)):
+        y_train, y_test, x_train, x_test = store.get_fold("cmp", fold_idx, scaled)
+        pd.testing.assert_series_equal(y_train, y.iloc[train])
+        pd.testing.assert_series_equal(y_test, y.iloc[test])
+        expected_train, expected_test = pipeline_transform(
+            x.iloc[train], x.iloc[test], scaled
+        )
+        pd.testing.assert_frame_equal(x_train, expected_train, check_freq=False)
+        pd.testing.assert_frame_equal(x_test, expected_test, check_freq=False)
+
+
+def test_panel_is_scaled_per_series(data, cv):
+    y, x = data
+    panel_y = pd.concat({"a": y, "b": 2 * y}).to_frame()
+    panel_x = pd.concat({"a": x, "b": 10 * x})
+    store = FoldStore(panel_y, panel_x).add_split("cmp", cv)
+    train, test = list(cv.split(y))[1]
+    _, _, x_train, x_test = store.get_fold("cmp", 1, scaled=True)
+    for key in ("a", "b"):
+        expected_train, expected_test = pipeline_transform(
+            panel_x.loc[key].iloc[train], panel_x.loc[key].iloc[test], scaled=True
+        )
+        np.testing.assert_allclose(x_train.loc[key], expected_train)
+        np.testing.assert_allclose(x_test.loc[key], expected_test)
+
+
+def test_window_keeps_last_observations(data, cv):
+    y, x = data
+    store = FoldStore(y, x).add_split("cmp", cv)
+    y_train, _, x_train, _ = store.get_fold("cmp", 1, window=20)
+    full_y, _, full_x, _ = store.get_fold("cmp", 1)
+    pd.testing.assert_series_equal(y_train, full_y.iloc[-20:])
+    pd.testing.assert_frame_equal(x_train, full_x.iloc[-20:])
+
+
+def test_store_pickles_without_arrays(data, cv):
+    y, x = data
+    store = FoldStore(y, x).add_split("cmp", cv)
+    store.get_fold("cmp", 0)
+    copy = pickle.loads(pickle.dumps(store))
+    assert copy._arrays == {}
+    pd.testing.assert_series_equal(
+        copy.get_fold("cmp", 0)[0], store.get_fold("cmp", 0)[0]
+    )
@@ -0,0 +1,122 @@
+import logging
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+from sktime.forecasting.naive import NaiveForecaster
+
+from automl.lifecycle.compare_model import ModelComparator
+from automl.lifecycle.evaluator import get_cv_score, is_complete
+from automl.limits import KillableExecutor, Limits, TrialMemoryError, TrialTimeout
+from automl.model_db import ModelQuery
+from automl.schuduler import Schuduler
+
+
+def add(left, right):
+    return left + right
+
+
+def fail():
+    raise ValueError("bad trial")
+
+
+def allocate(n_mb: int):
+    block = np.ones(n_mb * 2**20, dtype=np.uint8)
+    time.sleep(5)
+    return int(block.sum())
+
+
+class SlowOnLongWindows(NaiveForecaster):
+    """Naive forecaster hanging when fit on more than ``max_fast`` points."""
+
+    def __init__(self, strategy="last", max_fast=100):
+        self.max_fast = max_fast
+        super().__init__(strategy=strategy)
+
+    def _fit(self, y, X=None, fh=None):
+        if len(y) > self.max_fast:
+            time.sleep(30)
+        return super()._fit(y, X=X, fh=fh)
+
+
+def test_executor_returns_results_and_errors():
+    with KillableExecutor(2) as executor:
+        futures = [executor.submit(add, idx, 1) for idx in range(4)]
+        failed = executor.submit(fail)
+        assert [future.result() for future in futures] == [1, 2, 3, 4]
+        with pytest.raises(ValueError, match="bad trial"):
+            failed.result()
+
+
+def test_executor_kills_slow_and_large_tasks():
+    with KillableExecutor(2, timeout=0.5, memory_mb=50) as executor:
+        slow = executor.submit(time.sleep, 30)
+        large = executor.submit(allocate, 200)
+        start = time.monotonic()
+        with pytest.raises(TrialTimeout):
+            slow.result()
+        with pytest.raises(TrialMemoryError):
+            large.result()
+        assert time.monotonic() - start < 10
+
+
+def test_executor_deadline_fails_queued_tasks():
+    deadline = time.monotonic() + 0.5
+    with KillableExecutor(1, deadline=deadline) as executor:
+        running = executor.submit(time.sleep, 30)
+        queued = executor.submit(add, 1, 1)
+        for future in (running, queued):
+            with pytest.raises(TrialTimeout):
+                future.result()
+
+
+def test_partial_trial_scores_inf():
+    eval_data = pd.DataFrame({"test_mae": [1.0, np.nan, 2.0]})
+    assert get_cv_score(eval_data, "test_mae") == np.inf
+    assert not is_complete(eval_data, "test_mae")
+    assert get_cv_score(eval_data.dropna(), "test_mae") == 1.5
+
+
+def test_model_with_killed_fold_ranks_last(hourly_data, monkeypatch):
+    y, _ = hourly_data
+    forecasters = {
+        "Slow": SlowOnLongWindows(max_fast=270),
+        "Drift": NaiveForecaster(strategy="drift"),
+        "Mean": NaiveForecaster(strategy="mean"),
+    }
+    models = [
+        SimpleNamespace(identifier=SimpleNamespace(name=name), forecaster=forecaster)
+        for name, forecaster in forecasters.items()
+    ]
+    monkeypatch.setattr(ModelQuery, "select_model_object", lambda *args: models)
+    result = (
+        ModelComparator(1, 3, "mae", n_jobs=1)
+        .set_y(y)
+        .set_fh(12)
+        .set_limits(Limits(trial_timeout=2))
+        .compare()
+    )
+    assert result["model_name"].tolist()[-1] == "Slow"
+    assert np.isnan(result["mae"].iloc[-1])
+
+
+def test_expired_budget_refits_first_model_untuned(settings, hourly_data, caplog):
+    caplog.set_level(logging.WARNING)
+    y, x = hourly_data
+    app = (
+        Schuduler({**settings, "time_budget": 0.01, "checkpoint": False})
+        .set_exp_id("budget")
+        .set_y(y)
+        .set_x(x)
+        .set_fh(12)
+        .set_frequency("H")
+        .extract_statistics()
+    )
+    time.sleep(0.05)
+    app.compare_models().tune_hyperparameters()
+    tuned_models = app.get_tuned_models()
+    assert len(tuned_models) == 1
+    assert tuned_models[0][2] == np.inf
+    assert "refitting its compare stage configuration untuned" in caplog.text
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import Ridge
+from sklearn.model_selection import ParameterSampler
+from sktime.forecasting.compose import make_reduction
+
+from automl.model_db import ModelQuery
+from automl.models.ml_models.customized.reducer import LagReducer, design_matrix
+from automl.stat.statistics import SeriesStat
+
+STAT = SeriesStat("H", True, False, True, "additive", 12, [12], [12], [12], 0, 0, True)
+FH = np.arange(1, 7)
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(80)
+    index = pd.date_range("2020-01-01", periods=150, freq="H")
+    time_idx = np.arange(150)
+    y = pd.Series(
+        20 + 5 * np.sin(2 * np.pi * time_idx / 12) + rng.normal(0, 0.5, 150),
+        index=index,
+        name="y",
+    )
+    x = pd.DataFrame(rng.normal(size=(150, 2)), index=index, columns=["a", "b"])
+    return y, x
+
+
+def test_design_matrix_rows():
+    y = np.arange(10, dtype=np.float64)
+    X = 100 + np.arange(10, dtype=np.float64).reshape(-1, 1)
+    features, targets = design_matrix(y, 3, X, horizons=[1, 2])
+    assert features.shape == (6, 5)
+    np.testing.assert_array_equal(features[0], [2, 1, 0, 103, 104])
+    np.testing.assert_array_equal(targets[0], [3, 4])
+    np.testing.assert_array_equal(targets[-1], [8, 9])
+
+
+def test_pipeline_matches_make_reduction(data):
+    y, x = data
+    forecaster = ModelQuery.get_model_object_by_ID(STAT, "Ridge").forecaster
+    assert isinstance(forecaster.get_params()["forecaster__reducer"], LagReducer)
+    expected = forecaster.clone().set_params(
+        forecaster__reducer=make_reduction(
+            Ridge(), window_length=12, strategy="recursive", pooling="global"
+        )
+    )
+    y_train, x_train, x_test = y.iloc[:-6], x.iloc[:-6], x.iloc[-6:]
+    y_pred = forecaster.fit(y_train, X=x_train, fh=FH).predict(FH, X=x_test)
+    expected.fit(y_train, X=x_train, fh=FH)
+    np.testing.assert_allclose(y_pred, expected.predict(FH, X=x_test), rtol=1e-10)
+
+
+def test_search_space_applies_to_pipeline(data):
+    y, x = data
+    model = ModelQuery.get_model_object_by_ID(STAT, "Ridge")
+    for params in ParameterSampler(model.hyper_parameters, 5, random_state=80):
+        forecaster = model.forecaster.set_params(**params)
+        forecaster.fit(y.iloc[:-6], X=x.iloc[:-6], fh=FH)
+        assert forecaster.predict(FH, X=x.iloc[-6:]).notna().all()
@@ -0,0 +1,75 @@
+import subprocess
+import sys
+
+import pytest
+
+from automl.model_db import ModelQuery
+from automl.models.basemodel import ModelID
+
+MODEL_MODULES = """
+import sys
+{code}
+print(" ".join(
+    sorted(
+        name.rsplit(".", 1)[-1]
+        for name in sys.modules
+        if name.startswith("automl.models.ml_models.")
+        and name.count(".") == 3
+    )
+))
+"""
+
+
+def get_model_modules(code: str) -> set:
+    """Model modules imported by ``code`` in a fresh interpreter."""
+    output = subprocess.run(
+        [sys.executable, "-c", MODEL_MODULES.format(code=code)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(output.stdout.split()) - {"customized"}
+
+
+def test_importing_the_scheduler_imports_no_model():
+    assert get_model_modules("import automl.schuduler") == set()
+
+
+def test_listing_and_selecting_models_imports_no_model():
+    code = (
+        "from automl.model_db import ModelQuery\n"
+        "from automl.stat.statistics import SeriesStat\n"
+        "stat = SeriesStat('H', True, False, True, 'additive', 24, [24], [24], "
+        "[24], 0, 0, True)\n"
+        "ModelQuery.get_model_specs()\n"
+        "ModelQuery.select_model_object(stat, {'ModelType': [3, 4]})"
+    )
+    assert get_model_modules(code) == set()
+
+
+def test_creating_a_model_imports_only_its_module():
+    code = (
+        "from automl.model_db import ModelQuery\n"
+        "from automl.stat.statistics import SeriesStat\n"
+        "stat = SeriesStat('H', True, False, True, 'additive', 24, [24], [24], "
+        "[24], 0, 0, True)\n"
+        "ModelQuery.get_model_object_by_ID(stat, 'Ridge').forecaster"
+    )
+    assert get_model_modules(code) == {"ridge_model"}
+
+
+def test_every_model_id_is_registered():
+    names = [spec.name for spec in ModelQuery.get_model_specs()]
+    assert len(names) == len(set(names))
+    assert {model_id.name for model_id in ModelID} <= set(names)
+
+
+@pytest.mark.parametrize(
+    "spec", ModelQuery.get_model_specs(), ids=lambda spec: spec.name
+)
+def test_spec_metadata_matches_its_class(spec):
+    model = spec.load()
+    assert model.__name__ == spec.class_name
+    assert model.identifier == spec.identifier
+    assert model.mtype == spec.mtype
+    assert model.description == spec.description
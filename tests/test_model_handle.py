@@ -0,0 +1,108 @@
+import pickle
+
+import pytest
+
+from automl.model_db import ModelHandle, ModelQuery, ModelSpec
+from automl.models.basemodel import FitCost, ModelType
+from automl.stat.statistics import SeriesStat
+
+STAT = SeriesStat("H", True, False, True, "additive", 24, [24], [24], [24], 0, 0, True)
+
+
+@pytest.fixture
+def created(monkeypatch):
+    """Names of the models constructed from their spec."""
+    names = []
+    create = ModelSpec.create
+
+    def counting_create(spec, stat):
+        names.append(spec.name)
+        return create(spec, stat)
+
+    monkeypatch.setattr(ModelSpec, "create", counting_create)
+    return names
+
+
+def scan(condition):
+    """Names of the registered specs matching ``condition``, by a linear scan."""
+    return [spec.name for spec in ModelQuery.get_model_specs() if condition(spec)]
+
+
+def test_filters_construct_no_model(created):
+    handles = [
+        *ModelQuery.filter_by_model_id(STAT),
+        *ModelQuery.filter_by_model_type(STAT, [ModelType.TREE_BASED_MODEL]),
+        *ModelQuery.filter_by_fit_cost(STAT, FitCost.HIGH),
+        *ModelQuery.select_model_object(STAT, {"ModelType": 6, "MaxFitCost": 3}),
+    ]
+    assert all(isinstance(handle, ModelHandle) for handle in handles)
+    metadata = [(handle.name, handle.mtype, handle.fit_cost) for handle in handles]
+    assert len(metadata) > 0
+    assert created == []
+
+
+def test_handle_constructs_its_model_once(created):
+    (handle,) = ModelQuery.filter_by_model_id(STAT, "Ridge")
+    assert handle._model is None
+    forecaster = handle.forecaster
+    assert "forecaster__reducer__estimator__alpha" in handle.hyper_parameters
+    assert type(handle.get_model()).__name__ == "RidgeModel"
+    assert forecaster.get_params()["forecaster__reducer__estimator"] is not None
+    assert created == ["Ridge"]
+
+
+def test_handle_pickles_unconstructed():
+    (handle,) = ModelQuery.filter_by_model_id(STAT, "Lasso")
+    restored = pickle.loads(pickle.dumps(handle))
+    assert restored._model is None
+    assert restored.spec == handle.spec
+    assert type(restored.get_model()).__name__ == "LassoModel"
+
+
+@pytest.mark.parametrize("max_fit_cost", [FitCost.LOW, 2, "HIGH"])
+def test_filter_by_fit_cost_matches_a_scan(max_fit_cost):
+    cost = FitCost[max_fit_cost] if isinstance(max_fit_cost, str) else max_fit_cost
+    handles = ModelQuery.filter_by_fit_cost(STAT, max_fit_cost)
+    assert [handle.name for handle in handles] == scan(
+        lambda spec: spec.fit_cost <= cost
+    )
+
+
+def test_cheap_filter_excludes_expensive_models():
+    names = [handle.name for handle in ModelQuery.filter_by_fit_cost(STAT, "LOW")]
+    assert "Ridge" in names
+    assert not {"RandomForest", "XGBoost", "CatBoost", "HuberRegressor"} & set(names)
+
+
+@pytest.mark.parametrize(
+    "model_type",
+    [ModelType.LINEAR_MODEL, [ModelType.BOOSTING_MODEL, ModelType.LINEAR_MODEL]],
+)
+def test_filter_by_model_type_matches_a_scan(model_type):
+    model_types = model_type if isinstance(model_type, list) else [model_type]
+    handles = ModelQuery.filter_by_model_type(STAT, model_type)
+    assert [handle.name for handle in handles] == scan(
+        lambda spec: spec.mtype in model_types
+    )
+
+
+def test_select_model_object_combines_filters():
+    handles = ModelQuery.select_model_object(
+        STAT, {"ModelType": ModelType.TREE_BASED_MODEL, "MaxFitCost": "MEDIUM"}
+    )
+    assert [handle.name for handle in handles] == ["DecisionTree", "DecisionTreeCCD"]
+    handles = ModelQuery.select_model_object(
+        STAT, {"ModelId": ["XGBoost", "Lasso", "Unknown"], "MaxFitCost": "LOW"}
+    )
+    assert [handle.name for handle in handles] == ["Lasso"]
+    assert [handle.name for handle in ModelQuery.select_model_object(STAT, {})] == (
+        scan(lambda spec: True)
+    )
+
+
+def test_invalid_filters_raise():
+    with pytest.raises(ValueError):
+        ModelQuery.filter_by_model_id(STAT, 3.5)
+    with pytest.raises(ValueError):
+        ModelQuery.filter_by_model_type(STAT, "LINEAR_MODEL")
+    assert ModelQuery.get_model_object_by_ID(STAT, "Unknown") is None
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from automl.lifecycle.panel import (
+    aggregate,
+    n_series,
+    n_timepoints,
+    split_last,
+    to_panel_frame,
+)
+from automl.schuduler import Schuduler
+
+FH = 12
+
+
+@pytest.fixture
+def panel(hourly_data):
+    y, x = hourly_data
+    panel_y = pd.concat({"a": y, "b": 2 * y + 5, "c": y + 20}, names=["id", "time"])
+    panel_x = pd.concat({"a": x, "b": x, "c": -x}, names=["id", "time"])
+    return panel_y, panel_x
+
+
+def test_panel_helpers(panel):
+    panel_y, _ = panel
+    assert n_series(panel_y) == 3
+    assert n_timepoints(panel_y) == 300
+    assert list(to_panel_frame(panel_y).columns) == ["y"]
+    expected = (panel_y.loc["a"] + panel_y.loc["b"] + panel_y.loc["c"]) / 3
+    pd.testing.assert_series_equal(aggregate(panel_y), expected, check_names=False)
+    train, test = split_last(panel_y, FH)
+    assert test.groupby(level=0).size().tolist() == [FH, FH, FH]
+    assert (
+        train.index.get_level_values(-1).max() < test.index.get_level_values(-1).min()
+    )
+
+
+def test_lifecycle_fits_one_pooled_model(settings, panel):
+    panel_y, panel_x = panel
+    app = (
+        Schuduler(settings)
+        .set_exp_id("panel")
+        .set_y(panel_y)
+        .set_x(panel_x)
+        .set_fh(FH)
+        .set_frequency("H")
+        .extract_statistics()
+        .compare_models()
+        .tune_hyperparameters()
+    )
+    assert app._statistics.n_series == 3
+    _, model, _ = app.get_tuned_models()[0]
+    _, test_x = split_last(panel_x, FH)
+    y_pred = model.predict(fh=np.arange(1, FH + 1), X=test_x)
+    assert y_pred.index.get_level_values(0).unique().tolist() == ["a", "b", "c"]
+    assert y_pred.groupby(level=0).size().tolist() == [FH, FH, FH]
+    means = y_pred.groupby(level=0).mean().iloc[:, 0]
+    assert means["a"] < means["c"] < means["b"]
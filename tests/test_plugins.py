@@ -0,0 +1,149 @@
+import logging
+from enum import IntEnum, unique
+from types import SimpleNamespace
+
+import pytest
+from sklearn.linear_model import LinearRegression
+
+import automl.model_db
+from automl.model_db import ModelQuery, ModelSpec, register_model
+from automl.models.basemodel import BaseModel, FitCost, ModelType
+from automl.models.ml_model import MLPipelineSimple
+from automl.schuduler import Schuduler
+from automl.stat.statistics import SeriesStat
+
+STAT = SeriesStat("H", True, False, True, "additive", 24, [24], [24], [24], 0, 0, True)
+
+
+@unique
+class PluginID(IntEnum):
+    FastRegressor = 101
+    MissingRegressor = 102
+    EntryPointRegressor = 103
+
+
+class FastRegressorModel(MLPipelineSimple, BaseModel):
+    _identifier = PluginID.FastRegressor
+    _description = "Fast in-house regressor"
+    _mtype = ModelType.LINEAR_MODEL
+    _fit_cost = FitCost.LOW
+
+    def get_regressors(self):
+        return LinearRegression()
+
+    @property
+    def hyper_parameters(self):
+        return {"forecaster__reducer__window_length": [24, 36]}
+
+
+MISSING_SPEC = ModelSpec(
+    PluginID.MissingRegressor,
+    ModelType.LINEAR_MODEL,
+    "missing_plugin_package.models",
+    "MissingRegressorModel",
+    "Regressor of an uninstalled package",
+)
+
+
+@pytest.fixture(autouse=True)
+def registry(monkeypatch):
+    """Registrations of a test never leak into the shared registry."""
+    monkeypatch.setattr(ModelQuery, "_model_list", list(ModelQuery._model_list))
+    monkeypatch.setattr(ModelQuery, "_index", None)
+    monkeypatch.setattr(ModelQuery, "_plugins_loaded", True)
+
+
+def test_decorated_class_is_registered_and_selectable(hourly_data):
+    y, x = hourly_data
+    assert register_model(FastRegressorModel) is FastRegressorModel
+    handles = ModelQuery.filter_by_model_id(STAT, ["Ridge", "FastRegressor"])
+    assert [handle.name for handle in handles] == ["Ridge", "FastRegressor"]
+    spec = ModelQuery.get_spec("FastRegressor")
+    assert spec.fit_cost == FitCost.LOW
+    assert spec.module == __name__
+    forecaster = handles[1].forecaster.fit(y[:-12], X=x[:-12], fh=range(1, 13))
+    assert len(forecaster.predict(X=x[-12:])) == 12
+
+
+def test_spec_registration_defers_the_import():
+    register_model(MISSING_SPEC)
+    handles = ModelQuery.filter_by_model_type(STAT, ModelType.LINEAR_MODEL)
+    assert handles[-1].name == "MissingRegressor"
+    with pytest.raises(ModuleNotFoundError):
+        handles[-1].forecaster
+
+
+def test_plugins_keep_registration_order_in_every_index():
+    register_model(FastRegressorModel)
+    names = [spec.name for spec in ModelQuery.find_specs(max_fit_cost="LOW")]
+    assert names[-1] == "FastRegressor"
+    names = [spec.name for spec in ModelQuery.find_specs()]
+    assert names.index("FastRegressor") == len(names) - 1
+
+
+def test_duplicate_name_is_rejected():
+    register_model(FastRegressorModel)
+    register_model(FastRegressorModel)
+    specs = ModelQuery.find_specs(["FastRegressor"])
+    assert len(specs) == 1
+    with pytest.raises(ValueError, match="already registered"):
+        register_model(
+            ModelSpec(
+                PluginID.FastRegressor,
+                ModelType.TREE_BASED_MODEL,
+                "other_package.models",
+                "FastRegressorModel",
+                "Another regressor of the same name",
+            )
+        )
+
+
+def test_entry_points_are_loaded_once(monkeypatch, caplog):
+    entry_point_spec = ModelSpec(
+        PluginID.EntryPointRegressor,
+        ModelType.LINEAR_MODEL,
+        __name__,
+        "FastRegressorModel",
+        "Regressor of an entry point",
+    )
+
+    def broken():
+        raise ImportError("plugin dependency missing")
+
+    calls = []
+
+    def entry_points(group):
+        calls.append(group)
+        return [
+            SimpleNamespace(name="FastRegressor", load=lambda: FastRegressorModel),
+            SimpleNamespace(name="EntryPoint", load=lambda: entry_point_spec),
+            SimpleNamespace(name="Broken", load=broken),
+        ]
+
+    monkeypatch.setattr(automl.model_db, "entry_points", entry_points)
+    monkeypatch.setattr(ModelQuery, "_plugins_loaded", False)
+    with caplog.at_level(logging.WARNING, logger="automl.model_db"):
+        names = [spec.name for spec in ModelQuery.get_model_specs()]
+        ModelQuery.find_specs()
+    assert calls == ["automl.models"]
+    assert names[-2:] == ["FastRegressor", "EntryPointRegressor"]
+    assert "Skipping model plugin Broken" in caplog.text
+
+
+def test_plugin_model_runs_through_the_scheduler(hourly_data, settings):
+    y, x = hourly_data
+    register_model(FastRegressorModel)
+    settings["filter"] = {"ModelId": ["FastRegressor", "Ridge"]}
+    app = (
+        Schuduler(settings)
+        .set_exp_id("plugin")
+        .set_y(y)
+        .set_x(x)
+        .set_fh(12)
+        .set_frequency("H")
+        .extract_statistics()
+        .compare_models()
+        .tune_hyperparameters()
+    )
+    tuned = [model_name for model_name, _, _ in app.get_tuned_models()]
+    assert sorted(tuned) == ["FastRegressor", "Ridge"]
@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+from sktime.forecasting.compose import make_reduction
+
+from automl.models.ml_models.customized.reducer import LagReducer
+
+WINDOW_LENGTH = 6
+FH = [1, 2, 3, 4]
+N_TEST = len(FH)
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(80)
+    index = pd.period_range("2020-01-01", periods=120, freq="H")
+    y = pd.Series(
+        np.sin(np.arange(120) / 5) + rng.normal(0, 0.1, 120), index=index, name="y"
+    )
+    X = pd.DataFrame(rng.normal(size=(120, 2)), index=index, columns=["a", "b"])
+    return y, X
+
+
+def fit_predict(forecaster, y, X=None):
+    X_train = None if X is None else X.iloc[:-N_TEST]
+    X_test = None if X is None else X.iloc[-N_TEST:]
+    forecaster.fit(y.iloc[:-N_TEST], X=X_train, fh=FH)
+    return forecaster.predict(FH, X=X_test)
+
+
+def direct_reference(y: np.ndarray, window_length: int, max_horizon: int):
+    """One regression per horizon on the origins whose whole horizon is
+    observed, lags most recent first."""
+    y_pred = []
+    origins = range(window_length, len(y) - max_horizon + 1)
+    starts = [t - window_length for t in origins]
+    features = np.array([y[start:t][::-1] for start, t in zip(starts, origins)])
+    last = y[-window_length:][::-1].reshape(1, -1)
+    for horizon in range(1, max_horizon + 1):
+        targets = np.array([y[t + horizon - 1] for t in origins])
+        estimator = LinearRegression().fit(features, targets)
+        y_pred.append(estimator.predict(last)[0])
+    return np.array(y_pred)
+
+
+@pytest.mark.parametrize(
+    "strategy, exogenous",
+    [("recursive", False), ("recursive", True), ("multioutput", False)],
+)
+def test_matches_make_reduction(data, strategy, exogenous):
+    y, X = data
+    X = X if exogenous else None
+    expected = make_reduction(
+        LinearRegression(),
+        window_length=WINDOW_LENGTH,
+        strategy=strategy,
+        pooling="global",
+    )
+    reducer = LagReducer(LinearRegression(), WINDOW_LENGTH, strategy=strategy)
+    y_pred = fit_predict(reducer, y, X)
+    np.testing.assert_allclose(y_pred, fit_predict(expected, y, X), atol=1e-10)
+    pd.testing.assert_index_equal(y_pred.index, y.index[-N_TEST:])
+
+
+def test_direct_matches_reference(data):
+    y, _ = data
+    reducer = LagReducer(LinearRegression(), WINDOW_LENGTH, strategy="direct")
+    y_pred = fit_predict(reducer, y)
+    expected = direct_reference(y.iloc[:-N_TEST].to_numpy(), WINDOW_LENGTH, 4)
+    np.testing.assert_allclose(y_pred, expected, atol=1e-10)
+
+
+def test_direct_predicts_requested_steps_only(data):
+    y, _ = data
+    reducer = LagReducer(LinearRegression(), WINDOW_LENGTH, strategy="direct")
+    y_pred = reducer.fit(y.iloc[:-4], fh=[2, 4]).predict([2, 4])
+    expected = direct_reference(y.iloc[:-4].to_numpy(), WINDOW_LENGTH, 4)
+    np.testing.assert_allclose(y_pred, expected[[1, 3]], atol=1e-10)
+
+
+@pytest.mark.parametrize("strategy", ["recursive", "direct", "multioutput"])
+def test_panel_is_pooled(data, strategy):
+    y, X = data
+    panel_y = pd.concat({"first": y, "second": y}).to_frame()
+    panel_X = pd.concat({"first": X, "second": X})
+    reducer = LagReducer(LinearRegression(), WINDOW_LENGTH, strategy=strategy)
+    single = fit_predict(reducer.clone(), y, X)
+    panel_train_y = panel_y.groupby(level=0).head(len(y) - N_TEST)
+    panel_train_X = panel_X.groupby(level=0).head(len(y) - N_TEST)
+    panel_test_X = panel_X.groupby(level=0).tail(N_TEST)
+    reducer.fit(panel_train_y, X=panel_train_X, fh=FH)
+    y_pred = reducer.predict(FH, X=panel_test_X)
+    for key in ("first", "second"):
+        np.testing.assert_allclose(y_pred.loc[key].iloc[:, 0], single, atol=1e-10)
+
+
+def test_instance_features_separate_instances(data):
+    y, _ = data
+    panel_y = pd.concat({"first": y, "second": 2 * y + 1}).to_frame()
+    train_y = panel_y.groupby(level=0).head(len(y) - N_TEST)
+    reducer = LagReducer(LinearRegression(), WINDOW_LENGTH, instance_features=True)
+    reducer.fit(train_y, fh=FH)
+    assert reducer.instances_ == ["first", "second"]
+    y_pred = reducer.predict(FH)
+    assert y_pred.index.get_level_values(0).unique().tolist() == reducer.instances_
+
+
+def test_unknown_strategy():
+    with pytest.raises(ValueError):
+        LagReducer(LinearRegression(), strategy="dirrec")
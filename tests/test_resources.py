@@ -0,0 +1,44 @@
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+
+from automl import resources
+from automl.lifecycle.evaluator import set_thread_budget
+from automl.models.ml_models.customized.reducer import LagReducer
+from automl.resources import ResourceManager, available_cpus, set_cpu_limit
+
+
+@pytest.mark.parametrize(
+    "n_jobs, n_tasks, expected",
+    [
+        (-1, 100, (16, 1)),
+        (-1, 4, (4, 4)),
+        (4, 100, (4, 4)),
+        (-4, 100, (13, 1)),
+        (1, 100, (1, 16)),
+        (64, 100, (16, 1)),
+        (None, 100, (1, 16)),
+    ],
+)
+def test_workers_times_threads_fit_the_cpus(n_jobs, n_tasks, expected):
+    budget = ResourceManager(n_jobs, n_cpus=16).get_budget(n_tasks)
+    assert (budget.n_workers, budget.n_threads) == expected
+    assert budget.n_workers * budget.n_threads <= 16
+
+
+def test_cpu_limit_and_cgroup_quota(monkeypatch):
+    monkeypatch.setattr(resources, "get_affinity_cpus", lambda: 16)
+    monkeypatch.setattr(resources, "get_cgroup_cpu_quota", lambda: 6.5)
+    assert available_cpus() == 6
+    set_cpu_limit(2)
+    try:
+        assert available_cpus() == 2
+    finally:
+        set_cpu_limit(None)
+    assert ResourceManager(n_cpus=16).split(3) == 5
+
+
+def test_thread_budget_reaches_nested_estimators():
+    forecaster = LagReducer(RandomForestRegressor(n_jobs=-1))
+    set_thread_budget(forecaster, 2)
+    assert forecaster.get_params()["estimator__n_jobs"] == 2
+    assert forecaster.get_params()["n_jobs"] == 1
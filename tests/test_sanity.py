@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.sanity import (
+    LazyFrame,
+    format_datetime,
+    get_copy,
+    interpolate_column,
+    load_data,
+    resample_data,
+    select_column,
+    set_index,
+)
+
+COLUMNS = ["Global_active_power", "Voltage", "Sub_metering_1"]
+FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+@pytest.fixture
+def household():
+    """Minute readings with a string datetime column and a few gaps."""
+    rng = np.random.default_rng(80)
+    n_rows = 600
+    index = pd.date_range("2006-12-16 17:24", periods=n_rows, freq="min")
+    dataframe = pd.DataFrame(
+        rng.gamma(2.0, 1.0, size=(n_rows, len(COLUMNS))), columns=COLUMNS
+    )
+    dataframe = dataframe.mask(rng.random(dataframe.shape) < 0.05)
+    dataframe.insert(0, "Date_Time", index.strftime(FORMAT))
+    return dataframe
+
+
+def plan(frame):
+    """The preprocessing chain of the household benchmark."""
+    return (
+        frame.pipe(select_column, cols=["Date_Time", *COLUMNS[:2]])
+        .pipe(format_datetime, col="Date_Time", format=FORMAT)
+        .pipe(set_index, col="Date_Time")
+        .pipe(interpolate_column)
+        .pipe(resample_data, freq="H")
+    )
+
+
+def test_collect_equals_the_eager_chain(household):
+    original = household.copy(deep=True)
+    eager = plan(household)
+    lazy = plan(LazyFrame(household)).collect()
+    pd.testing.assert_frame_equal(lazy, eager)
+    pd.testing.assert_frame_equal(household, original)
+    assert not pd.options.mode.copy_on_write
+
+
+def test_collect_shares_no_memory_with_the_source(household):
+    dataframe = LazyFrame(household).pipe(select_column, cols=COLUMNS).collect()
+    for col in COLUMNS:
+        assert not np.shares_memory(dataframe[col].to_numpy(), household[col].values)
+    before = household[COLUMNS[0]].copy()
+    dataframe[COLUMNS[0]] = -1.0
+    pd.testing.assert_series_equal(household[COLUMNS[0]], before)
+
+
+def test_steps_run_only_on_collect(tmp_path, household):
+    path = str(tmp_path / "household.csv")
+    household.to_csv(path, index=False)
+    loads = []
+
+    def counting_load(csv_path):
+        loads.append(csv_path)
+        return load_data(csv_path)
+
+    lazy = plan(LazyFrame(counting_load, path))
+    assert loads == []
+    assert lazy.get_plan() == [
+        "select_column",
+        "format_datetime",
+        "set_index",
+        "interpolate_column",
+        "resample_data",
+    ]
+    pd.testing.assert_frame_equal(lazy.collect(), plan(household))
+    assert loads == [path]
+
+
+def test_pipe_returns_a_new_frame(household):
+    lazy = LazyFrame(household).pipe(select_column, cols=["Date_Time", *COLUMNS])
+    formatted = lazy.pipe(format_datetime, col="Date_Time", format=FORMAT)
+    indexed = formatted.pipe(set_index, col="Date_Time")
+    interpolated = formatted.pipe(set_index, col="Date_Time").pipe(interpolate_column)
+    assert lazy.get_plan() == ["select_column"]
+    assert formatted.get_plan() == ["select_column", "format_datetime"]
+    assert indexed.get_plan() == ["select_column", "format_datetime", "set_index"]
+    assert interpolated.get_plan()[-1] == "interpolate_column"
+    assert lazy.collect()["Date_Time"].dtype == object
+    assert indexed.collect().isna().any().any()
+    assert not interpolated.collect().isna().any().any()
+
+
+@pytest.mark.parametrize("copy_on_write", [False, True])
+def test_get_copy_isolates_the_source(household, copy_on_write):
+    with pd.option_context("mode.copy_on_write", copy_on_write):
+        copied = get_copy(household)
+        copied.loc[0, "Voltage"] = -1.0
+        copied["Date_Time"] = "changed"
+        assert household.loc[0, "Voltage"] != -1.0
+        assert (household["Date_Time"] != "changed").all()
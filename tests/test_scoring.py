@@ -0,0 +1,124 @@
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.metrics import r2_score
+from sktime.performance_metrics.forecasting import (
+    mean_absolute_error,
+    mean_absolute_percentage_error,
+    mean_absolute_scaled_error,
+    mean_squared_error,
+)
+
+from automl.lifecycle.scoring import METRICS, get_scores, score, score_forecasts
+from src.evaluation import evaluate
+
+N_TRAIN, N_TEST = 96, 12
+
+
+@pytest.fixture
+def forecasts(hourly_data):
+    """Training and test targets with three forecasts of the test target."""
+    y, _ = hourly_data
+    y_train, y_test = y.iloc[:N_TRAIN], y.iloc[N_TRAIN:].head(N_TEST)
+    rng = np.random.default_rng(80)
+    y_preds = [y_test + rng.normal(0, scale, N_TEST) for scale in (0.5, 1.0, 3.0)]
+    return y_train, y_test, y_preds
+
+
+def reference(y_test, y_pred, y_train, sp=1):
+    """Scores of the sktime and sklearn metrics."""
+    return {
+        "mae": mean_absolute_error(y_test, y_pred),
+        "mse": mean_squared_error(y_test, y_pred),
+        "rmse": mean_squared_error(y_test, y_pred, square_root=True),
+        "mape": mean_absolute_percentage_error(y_test, y_pred, symmetric=False),
+        "smape": mean_absolute_percentage_error(y_test, y_pred, symmetric=True),
+        "mase": mean_absolute_scaled_error(y_test, y_pred, y_train=y_train, sp=sp),
+        "r2": r2_score(y_test, y_pred),
+    }
+
+
+@pytest.mark.parametrize("sp", [1, 24])
+def test_scores_match_reference_metrics(forecasts, sp):
+    y_train, y_test, y_preds = forecasts
+    scores = score_forecasts(y_test, y_preds, y_train, sp=sp)
+    assert set(scores) == set(METRICS)
+    for idx, y_pred in enumerate(y_preds):
+        expected = reference(y_test, y_pred, y_train, sp)
+        for name in METRICS:
+            assert scores[name][idx] == pytest.approx(expected[name]), name
+
+
+def test_stacked_scores_equal_single_scores(forecasts):
+    y_train, y_test, y_preds = forecasts
+    scores = score_forecasts(y_test, y_preds, y_train, ["rmse", "mase"])
+    for idx, y_pred in enumerate(y_preds):
+        single = get_scores(y_test, y_pred, y_train, ["rmse", "mase"])
+        assert single == {name: values[idx] for name, values in scores.items()}
+
+
+def test_panel_scores_average_the_series(forecasts):
+    y_train, y_test, y_preds = forecasts
+    y_train_b, y_test_b, y_pred_b = 2 * y_train, 2 * y_test + 1, y_preds[2] * 2
+
+    def stack(first, second):
+        return pd.concat({"a": first, "b": second}, names=["series", "time"])
+
+    panel_test, panel_pred = stack(y_test, y_test_b), stack(y_preds[0], y_pred_b)
+    scores = get_scores(panel_test, panel_pred, stack(y_train, y_train_b))
+    test_frame, pred_frame = panel_test.to_frame(), panel_pred.to_frame()
+    assert scores["mae"] == pytest.approx(mean_absolute_error(test_frame, pred_frame))
+    assert scores["mape"] == pytest.approx(
+        mean_absolute_percentage_error(test_frame, pred_frame, symmetric=False)
+    )
+    # sktime pools the rows of the panel, the RMSE of the pooled errors is higher
+    assert scores["rmse"] < mean_squared_error(test_frame, pred_frame, square_root=True)
+    first = get_scores(y_test, y_preds[0], y_train)
+    second = get_scores(y_test_b, y_pred_b, y_train_b)
+    for name in METRICS:
+        assert scores[name] == pytest.approx((first[name] + second[name]) / 2), name
+
+
+def test_edge_cases():
+    y_true = np.full(4, 5.0)
+    scores = score(y_true, np.stack([y_true, y_true + 1]), metrics=["r2", "mase"])
+    np.testing.assert_array_equal(scores["r2"], [1.0, 0.0])
+    assert np.isnan(scores["mase"]).all()
+    scores = score(np.zeros(3), np.ones((1, 3)), metrics=["mape", "smape"])
+    assert np.isfinite(scores["mape"]).all() and scores["smape"][0] == 2.0
+    with pytest.raises(ValueError, match="Unknown metrics"):
+        score(y_true, y_true[np.newaxis], metrics=["mad"])
+
+
+def test_evaluate_matches_sklearn_metrics(forecasts):
+    y_train, y_test, y_preds = forecasts
+    actual, train = y_test.to_numpy(), y_train.to_numpy()
+    predicted = np.stack([y_pred.to_numpy() for y_pred in y_preds])
+    results = evaluate(actual, predicted[0], ["mae", "r2", "mase", "mad"], train)
+    expected = reference(y_test, y_preds[0], y_train)
+    assert results["mae"] == pytest.approx(expected["mae"])
+    assert results["r2"] == pytest.approx(expected["r2"])
+    assert results["mase"] == pytest.approx(expected["mase"])
+    assert np.isnan(results["mad"])
+    column = evaluate(actual, predicted[0].reshape(-1, 1), ["mae", "r2"])
+    assert column["mae"] == pytest.approx(expected["mae"])
+    assert column["r2"] == pytest.approx(expected["r2"])
+    results = evaluate(actual.reshape(-1, 1), predicted)
+    assert set(results) == {"mae", "rmse", "mape", "r2"}
+    assert results["rmse"] == pytest.approx(
+        [reference(y_test, y_pred, y_train)["rmse"] for y_pred in y_preds]
+    )
+
+
+def test_evaluate_does_not_import_automl():
+    code = (
+        "import sys, src.evaluation; "
+        "print(any(name.startswith('automl') for name in sys.modules))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert output.stdout.strip() == "False"
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+from scipy.stats import loguniform, randint, uniform
+from sklearn.model_selection import ParameterSampler
+
+from automl.lifecycle.search import RandomSearcher, TPESearcher, get_searcher
+
+SPACE = {
+    "window_length": randint(12, 48),
+    "alpha": loguniform(1e-3, 1e2),
+    "ratio": uniform(0, 1),
+    "strategy": ["recursive", "direct", "multioutput"],
+}
+
+
+def objective(params) -> float:
+    """Minimum at ``window_length=24``, ``alpha=1``, ``ratio=0.3``, direct."""
+    window = abs(params["window_length"] - 24) / 24
+    alpha = abs(np.log10(params["alpha"]))
+    ratio = abs(params["ratio"] - 0.3)
+    return window + alpha + ratio + float(params["strategy"] != "direct")
+
+
+def run(searcher, batch_size: int = 1) -> float:
+    while not searcher.is_done():
+        candidates = searcher.ask(searcher.get_batch_size(batch_size))
+        searcher.tell(candidates, [objective(params) for params in candidates])
+    return searcher.get_best()[1]
+
+
+def test_random_search_is_parameter_sampler():
+    searcher = RandomSearcher(SPACE, 10)
+    expected = list(ParameterSampler(SPACE, n_iter=10, random_state=80))
+    assert searcher.ask(4) + searcher.ask(10) == expected
+    assert searcher.ask(1) == []
+
+
+def test_tpe_candidates_stay_in_space():
+    searcher = TPESearcher(SPACE, 30)
+    run(searcher)
+    assert len(searcher.trials) == 30
+    assert all(searcher.is_valid(params) for params, _ in searcher.trials)
+
+
+def test_tpe_beats_random_search_on_average():
+    tpe = [run(TPESearcher(SPACE, 40, random_state=seed)) for seed in range(5)]
+    random = [run(RandomSearcher(SPACE, 40, random_state=seed)) for seed in range(5)]
+    assert np.mean(tpe) < np.mean(random)
+
+
+def test_best_ignores_failed_trials():
+    searcher = RandomSearcher(SPACE, 3)
+    candidates = searcher.ask(3)
+    searcher.tell(candidates, [np.inf, 2.0, np.nan])
+    assert searcher.get_best() == (candidates[1], 2.0)
+    empty = RandomSearcher(SPACE, 2)
+    empty.tell(empty.ask(2), [np.inf, np.inf])
+    assert empty.get_best() == ({}, np.inf)
+
+
+def test_unknown_algorithm():
+    assert isinstance(get_searcher("tpe", SPACE, 5), TPESearcher)
+    with pytest.raises(ValueError):
+        get_searcher("grid", SPACE, 5)
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+from statsmodels.tsa.stattools import acf
+
+from automl.stat.seasonality import SeasonalityFFT, acf_fft, difference
+from automl.stat.statistics import ExtractStats
+
+
+def get_series(kind: str, n_obs: int = 480) -> pd.Series:
+    rng = np.random.default_rng(80)
+    time_idx = np.arange(n_obs)
+    noise = rng.normal(0, 1, n_obs)
+    values = {
+        "daily": 10 * np.sin(2 * np.pi * time_idx / 24) + noise,
+        "weekly": 5 * np.sin(2 * np.pi * time_idx / 7) + 0.05 * time_idx + noise,
+        "trend": np.cumsum(noise) + 100,
+        "noise": noise + 50,
+    }[kind]
+    index = pd.date_range("2020-01-01", periods=n_obs, freq="H")
+    return pd.Series(values, index=index, name="y")
+
+
+class ExtractStatsACF(ExtractStats):
+    SP_DETECTION_ALGO = "AUTO"
+
+
+def test_acf_matches_statsmodels():
+    y = get_series("weekly").to_numpy()
+    np.testing.assert_allclose(acf_fft(y, 60), acf(y, nlags=60, fft=False))
+
+
+def test_difference_pads_with_zero():
+    np.testing.assert_array_equal(difference([1.0, 3.0, 6.0], 1), [0.0, 2.0, 3.0])
+    np.testing.assert_array_equal(difference([1.0, 3.0, 6.0], 2), [0.0, 2.0, 1.0])
+
+
+def test_lag_cap_is_respected():
+    sp_est = SeasonalityFFT(max_lag=30).fit(get_series("daily"))
+    assert sp_est.nlags_ == 30
+    assert 24 in sp_est.sp_significant_
+    assert max(sp_est.sp_significant_) <= 30
+
+
+@pytest.mark.parametrize("kind", ["daily", "weekly", "trend", "noise"])
+def test_matches_sktime_seasonality_acf(kind):
+    y = get_series(kind)
+    extractor = ExtractStats("H")
+    _, expected, _ = extractor.detect_seasonality_periods(y)
+    _, significant, _ = extractor.detect_seasonality_periods_fft(y)
+    assert significant == [sp for sp in expected if sp <= extractor.MAX_SP]
+    stat = ExtractStats("H").extract_statistics(y)
+    assert stat == ExtractStatsACF("H").extract_statistics(y)
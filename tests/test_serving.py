@@ -0,0 +1,252 @@
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer
+
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from automl.artifacts import get_model_path, save_model
+from automl.model_db import ModelQuery
+from automl.models.ml_models.customized.reducer import LagReducer
+from automl.serving import (
+    ForecastHandler,
+    ForecastRequest,
+    ForecastService,
+    LatencyStats,
+    MicroBatcher,
+    ModelCache,
+    ModelNotFound,
+    predict_contexts,
+)
+from automl.stat.statistics import SeriesStat
+
+STAT = SeriesStat("H", True, False, True, "additive", 24, [24], [24], [24], 0, 0, True)
+FH = [1, 2, 3]
+
+
+@pytest.fixture
+def model_dir(tmp_path, hourly_data):
+    """Model directory holding a univariate and an exogenous model of "exp"."""
+    y, x = hourly_data
+    train_y, train_x = y[:-3], x[:-3]
+    univariate = LagReducer(LinearRegression(), window_length=24).fit(train_y, fh=FH)
+    exogenous = LagReducer(LinearRegression(), window_length=24)
+    exogenous.fit(train_y, X=train_x, fh=FH)
+    save_model(univariate, get_model_path(str(tmp_path), "exp", "Linear"))
+    save_model(exogenous, get_model_path(str(tmp_path), "exp", "LinearX"))
+    return str(tmp_path)
+
+
+@pytest.fixture
+def future_x(hourly_data):
+    _, x = hourly_data
+    return x[-3:]
+
+
+@pytest.fixture
+def server(model_dir):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ForecastHandler)
+    server.daemon_threads = True
+    server.service = ForecastService(model_dir)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def request(url: str, payload=None):
+    data = None if payload is None else json.dumps(payload).encode()
+    try:
+        with urllib.request.urlopen(url, data=data, timeout=30) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as exc:
+        return exc.code, json.loads(exc.read())
+
+
+class CountingCache(ModelCache):
+    def __init__(self, model_dir: str, max_models: int = 8, delay: float = 0.0):
+        super().__init__(model_dir, max_models)
+        self.delay = delay
+        self.loads = []
+
+    def load(self, exp_id: str, model_name: str):
+        self.loads.append(model_name)
+        time.sleep(self.delay)
+        return super().load(exp_id, model_name)
+
+
+def test_cache_loads_each_model_once(model_dir):
+    cache = CountingCache(model_dir, delay=0.2)
+    with ThreadPoolExecutor(8) as executor:
+        models = list(executor.map(lambda _: cache.get("exp", "Linear"), range(8)))
+    assert cache.loads == ["Linear"]
+    assert all(model is models[0] for model in models)
+    assert cache.get_stats() == {
+        "size": 1,
+        "hits": 0,
+        "misses": 1,
+        "evictions": 0,
+        "reloads": 0,
+    }
+    cache.get("exp", "Linear")
+    assert cache.get_stats()["hits"] == 1
+
+
+def test_cache_evicts_least_recently_used(model_dir):
+    cache = CountingCache(model_dir, max_models=1)
+    cache.get("exp", "Linear")
+    cache.get("exp", "LinearX")
+    cache.get("exp", "Linear")
+    assert cache.loads == ["Linear", "LinearX", "Linear"]
+    assert cache.get_stats()["evictions"] == 2
+
+
+def test_cache_reloads_a_saved_again_artifact(model_dir, hourly_data):
+    y, _ = hourly_data
+    cache = CountingCache(model_dir)
+    model = cache.get("exp", "Linear")
+    assert cache.get("exp", "Linear") is model
+    refit = LagReducer(LinearRegression(), window_length=24).fit(y, fh=FH)
+    save_model(refit, get_model_path(model_dir, "exp", "Linear"))
+    reloaded = cache.get("exp", "Linear")
+    assert reloaded is not model
+    assert reloaded.cutoff[0] == y.index[-1]
+    assert cache.loads == ["Linear", "Linear"]
+    assert cache.get_stats()["reloads"] == 1
+    assert cache.get("exp", "Linear") is reloaded
+
+
+def test_missing_model_raises(model_dir):
+    cache = ModelCache(model_dir)
+    with pytest.raises(ModelNotFound):
+        cache.get("exp", "Unknown")
+    with pytest.raises(ModelNotFound):
+        ForecastService(model_dir).predict("other", "Linear")
+
+
+def test_predictions_match_the_model(model_dir, future_x):
+    service = ForecastService(model_dir)
+    model = service.cache.get("exp", "LinearX")
+    expected = model.predict(fh=FH, X=future_x)
+    y_pred = service.predict("exp", "LinearX", x=future_x)
+    pd.testing.assert_series_equal(y_pred.iloc[:, 0], expected, check_names=False)
+    y_pred = service.predict("exp", "LinearX", fh=[3, 1], x=future_x)
+    pd.testing.assert_series_equal(
+        y_pred.iloc[:, 0], expected.iloc[[0, 2]], check_names=False
+    )
+
+
+def test_invalid_requests_raise(model_dir, future_x):
+    service = ForecastService(model_dir)
+    with pytest.raises(ValueError, match="outside the fitted horizon"):
+        service.predict("exp", "Linear", fh=[4])
+    with pytest.raises(ValueError, match="X needed"):
+        service.predict("exp", "LinearX")
+    assert service.get_metrics()["latency"]["exp/Linear"]["errors"] == 1
+
+
+def test_concurrent_requests_are_micro_batched(model_dir, future_x):
+    cache = ModelCache(model_dir)
+    stats = LatencyStats()
+    batcher = MicroBatcher(cache, stats, max_batch=64, max_delay=0.5)
+    model = cache.get("exp", "LinearX")
+    expected = [model.predict(fh=FH, X=future_x), model.predict(fh=FH, X=future_x + 1)]
+    passes = []
+    predict = model.predict_contexts
+
+    def counting_predict(fh, X_list):
+        passes.append(len(X_list))
+        return predict(fh, X_list)
+
+    model.predict_contexts = counting_predict
+    futures = [
+        batcher.submit("exp", "LinearX", ForecastRequest([step], future_x))
+        for step in [1, 2, 3, 1, 2, 3]
+    ]
+    futures.append(
+        batcher.submit("exp", "LinearX", ForecastRequest(None, future_x + 1))
+    )
+    results = [future.result(timeout=30) for future in futures]
+    assert list(stats._batch_sizes["exp/LinearX"]) == [7]
+    assert passes == [2]
+    assert [float(result.iloc[0, 0]) for result in results[:3]] == pytest.approx(
+        expected[0].tolist()
+    )
+    pd.testing.assert_series_equal(results[-1].iloc[:, 0], expected[1])
+
+
+def test_idle_serve_threads_stop(model_dir):
+    batcher = MicroBatcher(ModelCache(model_dir), LatencyStats(), idle_timeout=0.1)
+    running = set(threading.enumerate())
+
+    def serve_threads():
+        return [
+            thread
+            for thread in threading.enumerate()
+            if thread.name == "serve-exp/Linear" and thread not in running
+        ]
+
+    for _ in range(2):
+        future = batcher.submit("exp", "Linear", ForecastRequest(None, None))
+        assert len(future.result(timeout=30)) == 3
+        assert len(serve_threads()) == 1
+        deadline = time.monotonic() + 10
+        while serve_threads() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert serve_threads() == []
+        assert batcher._queues == {}
+
+
+def test_bad_x_fails_alone(model_dir, future_x):
+    cache = ModelCache(model_dir)
+    batcher = MicroBatcher(cache, LatencyStats(), max_delay=0.5)
+    futures = [
+        batcher.submit("exp", "LinearX", ForecastRequest(None, x))
+        for x in [future_x, future_x.shift(freq="D")]
+    ]
+    assert len(futures[0].result(timeout=30)) == 3
+    with pytest.raises(KeyError):
+        futures[1].result(timeout=30)
+
+
+def test_pipeline_contexts_equal_single_predicts(hourly_data):
+    y, x = hourly_data
+    train_y, train_x = y[:-3], x[:-3]
+    pipeline = ModelQuery.get_model_object_by_ID(STAT, "RidgeCCD").forecaster
+    pipeline.fit(train_y, X=train_x, fh=FH)
+    X_list = [x[-3:], x[-3:] * 2, x[-3:] - 1]
+    y_preds = predict_contexts(pipeline, pipeline.fh, X_list)
+    for y_pred, X in zip(y_preds, X_list):
+        pd.testing.assert_series_equal(y_pred, pipeline.predict(X=X))
+
+
+def test_http_endpoints(server, future_x):
+    status, models = request(f"{server}/models")
+    assert status == 200
+    assert sorted(entry["model_name"] for entry in models) == ["Linear", "LinearX"]
+    payload = {
+        "fh": [1, 2],
+        "X": {
+            "index": [str(label) for label in future_x.index],
+            "columns": list(future_x.columns),
+            "data": future_x.to_numpy().tolist(),
+        },
+    }
+    status, body = request(f"{server}/predict/exp/LinearX", payload)
+    assert status == 200
+    assert len(body["predictions"]["data"]) == 2
+    assert request(f"{server}/predict/exp/Unknown", {})[0] == 404
+    assert request(f"{server}/predict/exp/Linear", {"fh": [9]})[0] == 400
+    assert request(f"{server}/unknown")[0] == 404
+    status, metrics = request(f"{server}/metrics")
+    assert metrics["latency"]["exp/LinearX"]["count"] == 1
+    assert {"p50_ms", "p99_ms", "mean_batch_size"} <= set(
+        metrics["latency"]["exp/LinearX"]
+    )
+    assert metrics["cache"]["size"] == 2
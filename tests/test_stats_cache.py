@@ -0,0 +1,58 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from automl.stat.cache import StatsCache
+from automl.stat.statistics import ExtractStats, SeriesStat
+
+STAT = SeriesStat("H", True, False, True, "additive", 24, [24], [24], [24], 0, 0, True)
+
+
+class CountingExtractor(ExtractStats):
+    def __init__(self, frequency="H", has_exogenous_data=True):
+        super().__init__(frequency, has_exogenous_data)
+        self.n_calls = 0
+
+    def extract_statistics(self, data):
+        self.n_calls += 1
+        return STAT
+
+
+@pytest.fixture
+def y():
+    index = pd.date_range("2020-01-01", periods=100, freq="H")
+    return pd.Series(np.arange(100, dtype=np.float64), index=index)
+
+
+def test_hit_skips_extraction(tmp_path, y):
+    cache = StatsCache(str(tmp_path))
+    extractor = CountingExtractor()
+    assert cache.extract_statistics(extractor, y) == STAT
+    assert cache.extract_statistics(extractor, y.copy()) == STAT
+    assert extractor.n_calls == 1
+
+
+def test_key_covers_values_index_and_settings(y):
+    key = StatsCache.get_key(CountingExtractor(), y)
+    shifted = y.copy()
+    shifted.index = shifted.index + pd.Timedelta("1H")
+    other_sp = CountingExtractor()
+    other_sp.MAX_SP = 12
+    assert StatsCache.get_key(CountingExtractor(), y.copy()) == key
+    assert StatsCache.get_key(CountingExtractor(), y + 1) != key
+    assert StatsCache.get_key(CountingExtractor(), shifted) != key
+    assert StatsCache.get_key(CountingExtractor("D"), y) != key
+    assert StatsCache.get_key(CountingExtractor("H", False), y) != key
+    assert StatsCache.get_key(other_sp, y) != key
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = StatsCache(str(tmp_path), max_entries=2)
+    for age, key in enumerate(["first", "second"]):
+        cache.put(key, STAT)
+        os.utime(cache._path(key), (age, age))
+    assert cache.get("first") == STAT
+    cache.put("third", STAT)
+    assert sorted(os.listdir(tmp_path)) == ["first.json", "third.json"]
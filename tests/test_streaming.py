@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pmdarima.arima import KPSSTest
+
+from automl.stat.seasonality import acf_fft
+from automl.stat.statistics import ExtractStats
+from automl.stat.streaming import LagMoments, StreamingExtractStats, iter_chunks
+
+
+class SmallChunks(StreamingExtractStats):
+    CHUNK_SIZE = 97
+    TAIL_SIZE = 10_000
+
+
+def get_series(kind: str, n_obs: int = 1000) -> pd.Series:
+    rng = np.random.default_rng(80)
+    time_idx = np.arange(n_obs)
+    noise = rng.normal(0, 1, n_obs)
+    values = {
+        "daily": 20 + 10 * np.sin(2 * np.pi * time_idx / 24) + noise,
+        "trend": np.cumsum(noise) + 100,
+        "double": np.cumsum(np.cumsum(noise)),
+        "noise": noise,
+    }[kind]
+    index = pd.date_range("2020-01-01", periods=n_obs, freq="H")
+    return pd.Series(values, index=index, name="y")
+
+
+def test_moments_match_full_series():
+    y = get_series("daily").to_numpy()
+    moments = LagMoments(30)
+    for chunk in iter_chunks(y, 97):
+        moments.update(chunk)
+    np.testing.assert_allclose(moments.acf(30), acf_fft(y, 30), atol=1e-10)
+    expected = KPSSTest(null="level", lshort=True).should_diff(y)[0]
+    assert moments.kpss_pvalue() == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("kind", ["daily", "trend", "double", "noise"])
+def test_matches_extract_stats(kind):
+    y = get_series(kind)
+    expected = ExtractStats("H").extract_statistics(y)
+    assert SmallChunks("H").extract_statistics(y) == expected
+    chunks = iter(np.array_split(y.to_numpy(), 4))
+    assert SmallChunks("H").extract_statistics(chunks) == expected
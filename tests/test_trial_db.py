@@ -0,0 +1,101 @@
+import logging
+import os
+import sqlite3
+from contextlib import closing
+
+import pytest
+from scipy.stats import uniform
+
+from automl.lifecycle.search import RandomSearcher
+from automl.lifecycle.trial_db import TrialDB
+from automl.schuduler import Schuduler
+from automl.stat.statistics import SeriesStat
+
+STAT = SeriesStat("H", True, False, True, "additive", 24, [24], [24], [24], 0, 0, True)
+
+
+def get_trials(*alphas):
+    return [
+        {"params": {"alpha": alpha}, "fold_scores": [alpha, alpha], "fit_time": 0.1}
+        for alpha in alphas
+    ]
+
+
+@pytest.fixture
+def shared(tmp_path):
+    return TrialDB(str(tmp_path / "trials.sqlite"))
+
+
+def test_merge_copies_every_trial(tmp_path, shared):
+    series_db = TrialDB(str(tmp_path / ".trials" / "a.sqlite"))
+    series_db.record("a", "Ridge", "mae", STAT, get_trials(1.0, 2.0))
+    assert shared.merge(series_db.path) == 2
+    assert shared.merge(str(tmp_path / "missing.sqlite")) == 0
+    configs = shared.get_warm_start("b", "Ridge", "mae", STAT, 5)
+    assert configs == [{"alpha": 1.0}, {"alpha": 2.0}]
+
+
+def test_warm_start_reads_shared_database(tmp_path, shared):
+    shared.record("a", "Ridge", "mae", STAT, get_trials(3.0))
+    series_db = TrialDB(str(tmp_path / "b.sqlite"), read_paths=[shared.path])
+    series_db.record("c", "Ridge", "mae", STAT, get_trials(4.0))
+    configs = series_db.get_warm_start("b", "Ridge", "mae", STAT, 5)
+    assert sorted(config["alpha"] for config in configs) == [3.0, 4.0]
+    assert shared.get_warm_start("b", "Ridge", "mae", STAT, 5) == [{"alpha": 3.0}]
+
+
+def test_warm_start_ranks_within_each_series(shared):
+    shared.record("a", "Ridge", "mae", STAT, get_trials(1.0, 2.0, 3.0))
+    shared.record("b", "Ridge", "mae", STAT, get_trials(300.0, 100.0))
+    configs = shared.get_warm_start("new", "Ridge", "mae", STAT, 2)
+    assert sorted(config["alpha"] for config in configs) == [1.0, 100.0]
+
+
+def test_warm_start_only_uses_comparable_trials(shared):
+    other_sp = SeriesStat(
+        "H", True, False, True, "additive", 12, [12], [12], [12], 0, 0, True
+    )
+    shared.record("same", "Ridge", "mae", STAT, get_trials(1.0))
+    shared.record("a", "Lasso", "mae", STAT, get_trials(2.0))
+    shared.record("a", "Ridge", "rmse", STAT, get_trials(3.0))
+    shared.record("a", "Ridge", "mae", other_sp, get_trials(4.0))
+    low_fidelity = [{**trial, "fidelity": 1 / 3} for trial in get_trials(5.0)]
+    shared.record("a", "Ridge", "mae", STAT, low_fidelity)
+    partial = [{**get_trials(6.0)[0], "fold_scores": [6.0, float("nan")]}]
+    shared.record("a", "Ridge", "mae", STAT, partial)
+    assert shared.get_warm_start("same", "Ridge", "mae", STAT, 5) == []
+    shared.record("a", "Ridge", "mae", STAT, get_trials(7.0))
+    assert shared.get_warm_start("same", "Ridge", "mae", STAT, 5) == [{"alpha": 7.0}]
+
+
+def test_searcher_evaluates_warm_start_first():
+    searcher = RandomSearcher({"alpha": uniform(0, 10)}, 4)
+    searcher.warm_start([{"alpha": 3.0}, {"alpha": 30.0}, {"beta": 1.0}])
+    candidates = searcher.ask(4)
+    assert candidates[0] == {"alpha": 3.0}
+    assert {"alpha": 30.0} not in candidates
+    assert len(candidates) == 4
+
+
+def test_tuning_records_and_warm_starts(settings, hourly_data, caplog):
+    caplog.set_level(logging.INFO)
+    y, x = hourly_data
+    for exp_id, offset in (("first", 0.0), ("second", 1.0)):
+        (
+            Schuduler(settings)
+            .set_exp_id(exp_id)
+            .set_y(y + offset)
+            .set_x(x)
+            .set_fh(12)
+            .set_frequency("H")
+            .extract_statistics()
+            .compare_models()
+            .tune_hyperparameters()
+        )
+    path = os.path.join(settings["model_dir"], "trials.sqlite")
+    with closing(sqlite3.connect(path)) as conn:
+        rows = conn.execute(
+            "SELECT COUNT(DISTINCT series_key), COUNT(DISTINCT model_name) FROM trials"
+        ).fetchone()
+    assert rows == (2, 2)
+    assert "Warm starting" in caplog.text
@@ -0,0 +1,108 @@
+import numpy as np
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from automl.artifacts import find_model_path, load_model, read_metadata
+from automl.lifecycle.panel import n_timepoints
+from automl.lifecycle.updater import ModelUpdater
+from automl.model_db import ModelQuery
+from automl.models.ml_models.customized.reducer import LagReducer
+from automl.schuduler import Schuduler
+from automl.stat.statistics import SeriesStat
+
+STAT = SeriesStat("H", True, False, True, "additive", 24, [24], [24], [24], 0, 0, True)
+N_TRAIN = 200
+FH = [1, 2, 3]
+
+
+@pytest.fixture
+def pipeline(hourly_data):
+    """Ridge CCD pipeline fit on the first ``N_TRAIN`` observations."""
+    y, x = hourly_data
+    forecaster = ModelQuery.get_model_object_by_ID(STAT, "RidgeCCD").forecaster
+    return forecaster.fit(y[:N_TRAIN], X=x[:N_TRAIN], fh=FH)
+
+
+def tick(updater, model, hourly_data, position: int) -> bool:
+    y, x = hourly_data
+    step = slice(position, position + 1)
+    return updater.update("RidgeCCD", model, y[step], x[step])
+
+
+def test_update_moves_the_lag_window_without_refit(hourly_data):
+    y, _ = hourly_data
+    model = LagReducer(LinearRegression(), window_length=24).fit(y[:-5], fh=FH)
+    estimator = model.estimator_
+    coef = estimator.coef_.copy()
+    assert not ModelUpdater(refit_interval=10).update("Linear", model, y[-5:-4])
+    assert model.estimator_ is estimator
+    np.testing.assert_array_equal(model.estimator_.coef_, coef)
+    assert model.cutoff[0] == y.index[-5]
+    lags = y[:-4].to_numpy()[::-1][:24].reshape(1, -1)
+    assert model.predict().iloc[0] == pytest.approx(estimator.predict(lags)[0])
+
+
+def test_refit_every_interval(pipeline, hourly_data):
+    updater = ModelUpdater(refit_interval=3)
+    refits = [
+        tick(updater, pipeline, hourly_data, position)
+        for position in range(N_TRAIN, N_TRAIN + 6)
+    ]
+    assert refits == [False, False, True, False, False, True]
+    assert updater.n_updates["RidgeCCD"] == 0
+    assert pipeline.cutoff[0] == hourly_data[0].index[N_TRAIN + 5]
+
+
+def test_history_stays_bounded(pipeline, hourly_data):
+    updater = ModelUpdater(refit_interval=10)
+    lengths = []
+    for position in range(N_TRAIN, N_TRAIN + 40):
+        refit = tick(updater, pipeline, hourly_data, position)
+        lengths.append(n_timepoints(pipeline._y))
+        if refit:
+            assert lengths[-1] == N_TRAIN
+    assert updater.get_window("RidgeCCD", pipeline) == N_TRAIN
+    assert max(lengths) <= N_TRAIN + 10
+    future_x = hourly_data[1].iloc[-60:-57]
+    assert len(pipeline.predict(X=future_x)) == 3
+
+
+def test_explicit_refit_window(pipeline, hourly_data):
+    updater = ModelUpdater(refit_interval=2, refit_window=100)
+    tick(updater, pipeline, hourly_data, N_TRAIN)
+    assert tick(updater, pipeline, hourly_data, N_TRAIN + 1)
+    assert n_timepoints(pipeline._y) == 100
+
+
+def test_update_metadata_round_trips(settings, hourly_data):
+    y, x = hourly_data
+    settings["refit_interval"] = 6
+    train_y, train_x = y[:-24], x[:-24]
+    (
+        Schuduler(settings)
+        .set_exp_id("exp")
+        .set_y(train_y)
+        .set_x(train_x)
+        .set_fh(12)
+        .set_frequency("H")
+        .extract_statistics()
+        .compare_models()
+        .tune_hyperparameters()
+        .save_tuned_models()
+    )
+    window = len(train_y) - 12
+    new = slice(-24, -20)
+    app = Schuduler(settings).set_exp_id("exp").update_models(y[new], x[new], True)
+    model_names = [model_name for model_name, _, _ in app.get_tuned_models()]
+    for model_name in model_names:
+        path = find_model_path(settings["model_dir"], "exp", model_name)
+        metadata = read_metadata(path)
+        assert metadata["n_updates"] == 4
+        assert metadata["refit_window"] == window
+        assert load_model(path).cutoff[0] == y.index[-21]
+    new = slice(-20, -16)
+    Schuduler(settings).set_exp_id("exp").update_models(y[new], x[new], True)
+    for model_name in model_names:
+        path = find_model_path(settings["model_dir"], "exp", model_name)
+        assert read_metadata(path)["n_updates"] == 0
+        assert n_timepoints(load_model(path)._y) == window